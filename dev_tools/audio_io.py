@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Small audio helpers shared by the dev tools: container sniffing, header probing, decoding to NumPy and PCM WAV writing.
+
+Many files under data/recordings carry a `.wav` name but hold MP3 data (the TTS API ignored the requested format),
+so nothing here trusts the extension. RIFF/WAVE PCM and MP3 headers are parsed in pure Python; decoding anything
+other than PCM WAV needs an `ffmpeg` binary on PATH and raises AudioDecodeError when it is missing.
+"""
+import io, os, shutil, struct, subprocess, wave
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+
+AUDIO_EXTS = {".wav", ".mp3", ".ogg", ".opus", ".m4a", ".flac", ".webm"}
+
+
+class AudioDecodeError(RuntimeError):
+    pass
+
+
+def have_ffmpeg() -> bool:
+    return shutil.which("ffmpeg") is not None
+
+# ---------- container sniffing ----------
+
+def sniff_container(head: bytes) -> str:
+    """Identify the real container from the first bytes of a file."""
+    if len(head) >= 12 and head[:4] in (b"RIFF", b"RIFX") and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:3] == b"ID3" or (len(head) >= 2 and head[0] == 0xFF and (head[1] & 0xE0) == 0xE0):
+        return "mp3"
+    if head[:4] == b"OggS":
+        return "ogg"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if len(head) >= 8 and head[4:8] == b"ftyp":
+        return "mp4"
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
+    return "unknown"
+
+EXT_FOR_CONTAINER = {"wav": ".wav", "mp3": ".mp3", "ogg": ".ogg", "flac": ".flac", "mp4": ".m4a", "webm": ".webm"}
+
+# ---------- header probing ----------
+
+WAV_CODECS = {1: "pcm", 3: "float", 6: "alaw", 7: "mulaw", 0xFFFE: "extensible"}
+
+def _probe_wav(data: bytes) -> Dict:
+    info = {"container": "wav", "codec": "unknown"}
+    pos, byte_rate, data_len = 12, 0, None
+    while pos + 8 <= len(data):
+        cid, size = data[pos:pos + 4], struct.unpack("<I", data[pos + 4:pos + 8])[0]
+        body = data[pos + 8:pos + 8 + size]
+        if cid == b"fmt " and len(body) >= 16:
+            tag, ch, sr, byte_rate, align, bits = struct.unpack("<HHIIHH", body[:16])
+            if tag == 0xFFFE and len(body) >= 26:
+                tag = struct.unpack("<H", body[24:26])[0]  # sub-format GUID starts with the real tag
+            info.update(codec=WAV_CODECS.get(tag, f"0x{tag:04x}"), channels=ch, sample_rate=sr, bits=bits)
+        elif cid == b"data":
+            data_len = min(size, len(data) - pos - 8)
+            info["truncated"] = size > len(data) - pos - 8
+            break
+        pos += 8 + size + (size & 1)
+    if data_len is not None and byte_rate:
+        info["duration"] = data_len / byte_rate
+        info["bitrate"] = byte_rate * 8
+    return info
+
+# MPEG audio frame header tables (version 1 / 2 / 2.5, layer III)
+_MP3_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_RATES = {1: [44100, 48000, 32000], 2: [22050, 24000, 16000], 25: [11025, 12000, 8000]}
+
+def _mp3_frame(data: bytes, pos: int):
+    """Parse a layer III frame header at `pos` → (frame_len, samples, sample_rate, bitrate_kbps, channels) or None."""
+    if pos + 4 > len(data) or data[pos] != 0xFF or (data[pos + 1] & 0xE0) != 0xE0:
+        return None
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    ver = {3: 1, 2: 2, 0: 25}.get((b1 >> 3) & 3)
+    if ver is None or ((b1 >> 1) & 3) != 1:  # reserved version / not layer III
+        return None
+    bi, si = b2 >> 4, (b2 >> 2) & 3
+    if bi in (0, 15) or si == 3:
+        return None
+    kbps = _MP3_BITRATES[1 if ver == 1 else 2][bi]
+    sr = _MP3_RATES[ver][si]
+    samples = 1152 if ver == 1 else 576
+    length = (samples // 8) * kbps * 1000 // sr + ((b2 >> 1) & 1)
+    return length, samples, sr, kbps, 1 if (b3 >> 6) == 3 else 2
+
+def _probe_mp3(data: bytes) -> Dict:
+    info = {"container": "mp3", "codec": "mp3"}
+    pos = 0
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        pos = 10 + size
+    frames = samples = 0
+    kbits = 0
+    # find first frame (allow some junk after the tag)
+    limit = min(len(data), pos + 4096)
+    while pos < limit and _mp3_frame(data, pos) is None:
+        pos += 1
+    while True:
+        fr = _mp3_frame(data, pos)
+        if fr is None:
+            break
+        length, n, sr, kbps, ch = fr
+        if frames == 0:
+            info.update(sample_rate=sr, channels=ch)
+        frames += 1; samples += n; kbits += kbps
+        pos += length
+    if frames:
+        info["duration"] = samples / info["sample_rate"]
+        info["bitrate"] = kbits * 1000 // frames
+        info["frames"] = frames
+        info["truncated"] = pos > len(data)
+    return info
+
+def probe(path) -> Dict:
+    """Container/codec/sample rate/channels/duration/bitrate from headers only (no decoding)."""
+    path = Path(path)
+    data = path.read_bytes()
+    kind = sniff_container(data[:16])
+    if kind == "wav":
+        info = _probe_wav(data)
+    elif kind == "mp3":
+        info = _probe_mp3(data)
+    else:
+        info = {"container": kind, "codec": "unknown"}
+    info["size"] = len(data)
+    return info
+
+# ---------- decoding / encoding ----------
+
+def _read_wav_pcm(path: Path) -> Tuple[np.ndarray, int]:
+    with wave.open(str(path), "rb") as w:
+        ch, width, sr, n = w.getnchannels(), w.getsampwidth(), w.getframerate(), w.getnframes()
+        raw = w.readframes(n)
+    if width == 1:
+        x = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        x = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        x = ((b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)) << 8 >> 8).astype(np.float32) / 8388608.0
+    elif width == 4:
+        x = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise AudioDecodeError(f"{path}: unsupported sample width {width}")
+    if ch > 1:
+        x = x[: len(x) - len(x) % ch].reshape(-1, ch).mean(axis=1)
+    return x, sr
+
+def _read_ffmpeg(path: Path, sr: int | None) -> Tuple[np.ndarray, int]:
+    if not have_ffmpeg():
+        raise AudioDecodeError(f"{path.name}: decoding {sniff_container(path.read_bytes()[:16])} needs ffmpeg on PATH")
+    rate = sr or probe(path).get("sample_rate") or 48000
+    cmd = ["ffmpeg", "-v", "error", "-nostdin", "-i", str(path), "-f", "f32le", "-ac", "1", "-ar", str(rate), "-"]
+    p = subprocess.run(cmd, capture_output=True)
+    if p.returncode != 0:
+        raise AudioDecodeError(f"{path.name}: ffmpeg failed: {p.stderr.decode(errors='replace')[:200]}")
+    return np.frombuffer(p.stdout, dtype="<f4").copy(), rate
+
+def read_audio(path, sr: int | None = None) -> Tuple[np.ndarray, int]:
+    """
+    Decode to mono float32 in [-1, 1]. PCM WAV is read with NumPy; everything else through ffmpeg.
+    `sr` only forces a rate on the ffmpeg path; use resample() for PCM input.
+    """
+    path = Path(path)
+    with open(path, "rb") as f:
+        head = f.read(16)
+    if sniff_container(head) == "wav":
+        try:
+            return _read_wav_pcm(path)
+        except (wave.Error, EOFError):
+            pass  # float/extensible WAV → let ffmpeg handle it
+    return _read_ffmpeg(path, sr)
+
+def needs_ffmpeg(path) -> bool:
+    """Whether read_audio() has to go through ffmpeg for this file (anything but PCM WAV), from its first 4 KiB."""
+    with open(path, "rb") as f:
+        head = f.read(4096)
+    return sniff_container(head) != "wav" or _probe_wav(head).get("codec") != "pcm"
+
+def resample(x: np.ndarray, sr_in: int, sr_out: int) -> np.ndarray:
+    """Windowed-sinc low-pass + linear interpolation; adequate for speech, not for mastering."""
+    if sr_in == sr_out or len(x) == 0:
+        return x
+    if sr_out < sr_in:
+        cutoff = 0.45 * sr_out / sr_in  # cycles/sample
+        taps = 63
+        n = np.arange(taps) - (taps - 1) / 2
+        h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+        x = np.convolve(x, h / h.sum(), mode="same")
+    t_out = np.arange(int(round(len(x) * sr_out / sr_in))) * (sr_in / sr_out)
+    return np.interp(t_out, np.arange(len(x)), x).astype(np.float32)
+
+def _write_pcm16(dest, samples: np.ndarray, sr: int) -> None:
+    pcm = np.round(np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2")
+    with wave.open(dest, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        w.writeframes(pcm.tobytes())
+
+def write_wav_pcm16(path, samples: np.ndarray, sr: int) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    _write_pcm16(str(path), samples, sr)
+
+def encode_wav_pcm16(samples: np.ndarray, sr: int) -> bytes:
+    """Same as write_wav_pcm16() but returns the file bytes (for atomic or cache writes)."""
+    buf = io.BytesIO()
+    _write_pcm16(buf, samples, sr)
+    return buf.getvalue()
+
+def encode_ffmpeg(path, samples: np.ndarray, sr: int, codec: str, bitrate: str) -> None:
+    """Encode mono float samples with ffmpeg (codec: mp3 | opus | aac)."""
+    if not have_ffmpeg():
+        raise AudioDecodeError(f"encoding {codec} needs ffmpeg on PATH")
+    lib = {"mp3": "libmp3lame", "opus": "libopus", "aac": "aac"}[codec]
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    cmd = ["ffmpeg", "-v", "error", "-nostdin", "-y", "-f", "f32le", "-ac", "1", "-ar", str(sr), "-i", "-",
+           "-c:a", lib, "-b:a", bitrate, str(path)]
+    p = subprocess.run(cmd, input=np.asarray(samples, dtype="<f4").tobytes(), capture_output=True)
+    if p.returncode != 0:
+        raise AudioDecodeError(f"ffmpeg {codec} encode failed: {p.stderr.decode(errors='replace')[:200]}")
+
+def iter_audio_files(root, recursive: bool = True):
+    """Audio files under `root` (by extension), sorted, skipping dot-files and dot-dirs."""
+    root = Path(root)
+    it = root.rglob("*") if recursive else root.iterdir()
+    for p in sorted(it):
+        if p.suffix.lower() in AUDIO_EXTS and p.is_file() and not any(part.startswith(".") for part in p.relative_to(root).parts):
+            yield p
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the dev tools' hot paths, with per-commit results and regression checks.
+
+    python dev_tools/bench.py run                     # all benchmarks -> dev_tools/bench_results/<commit>.json
+    python dev_tools/bench.py run --quick --only synth
+    python dev_tools/bench.py compare 519232c         # that commit's results vs the latest run
+    python dev_tools/bench.py compare a.json b.json --threshold 15
+
+Benchmarks (all throughput, higher is better):
+  synth/<preset>      generate_continuous() / generate_segments() samples/s for every sinoid preset
+  wav_encode          write_wav_mono16() MB/s of PCM written
+  csv_parse           vocab.py rows/s on an hsk6-sized CSV (uncached parse + card ids), csv_cached the warm path
+  transfer            transfer.py index + match + hardlink files/s over a synthetic directory of 10k clips
+  tts_pipeline        make_tts_from_csv.py rows/s end to end against the local fake TTS endpoint
+
+Each benchmark reports the best of --repeat runs. `compare` flags every metric that got worse by more
+than --threshold percent and exits 1 if there is any.
+"""
+import argparse, json, os, platform, shutil, subprocess, sys, tempfile, time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+HERE = Path(__file__).resolve().parent
+RESULTS_DIR = HERE / "bench_results"
+RESULTS_VERSION = 1
+
+# ---------- helpers ----------
+
+def best_time(fn: Callable, repeat: int) -> float:
+    fn()  # warm-up (imports, caches, page faults)
+    times = []
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter(); fn(); times.append(time.perf_counter() - t0)
+    return min(times)
+
+def git_commit() -> str:
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=HERE,
+                               capture_output=True, text=True).stdout.strip()
+        return rev + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def synthetic_csv(path: Path, rows: int) -> None:
+    """hsk-like rows with unique hanzi (CJK block) so every row is a distinct card."""
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(rows):
+            word = chr(0x4E00 + i % 20000) + chr(0x4E00 + (i * 7919) % 20000)
+            f.write(f'{word},zhōng wén  {i},"word {i}, as in ""example"""\n')
+
+# ---------- benchmarks ----------
+# Each returns {name: (value, unit)}.
+
+def bench_synth(repeat: int, quick: bool) -> Dict[str, tuple]:
+    from generate_sinoid import CONT_PRESETS, SEG_PRESETS, generate_continuous, generate_segments
+    out = {}
+    cases = [(c["id"], lambda c=c: generate_continuous(c)) for c in CONT_PRESETS]
+    cases += [(c["id"], lambda c=c: generate_segments(c["segments"], c.get("clicks", False))) for c in SEG_PRESETS]
+    if quick:
+        cases = cases[:3]
+    for name, fn in cases:
+        n = len(fn())
+        out[f"synth/{name}"] = (n / best_time(fn, repeat), "samples/s")
+    return out
+
+def bench_wav_encode(repeat: int, quick: bool) -> Dict[str, tuple]:
+    from generate_sinoid import SR, write_wav_mono16
+    x = np.sin(np.linspace(0, 2000 * np.pi, SR * (10 if quick else 60))) * 0.5
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.wav")
+        t = best_time(lambda: write_wav_mono16(path, x), repeat)
+    return {"wav_encode": (2 * len(x) / 1e6 / t, "MB/s")}
+
+def bench_csv(repeat: int, quick: bool) -> Dict[str, tuple]:
+    import vocab
+    n = 2500 if quick else 5000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "hsk_bench.csv"
+        synthetic_csv(path, n)
+        cold = best_time(lambda: sum(1 for _ in vocab.iter_cards(path, use_cache=False)), repeat)
+        warm = best_time(lambda: sum(1 for _ in vocab.iter_cards(path)), repeat)
+        vocab._get_cache().entries.pop(str(path.resolve()), None)  # keep the bench file out of the shared cache
+    return {"csv_parse": (n / cold, "rows/s"), "csv_cached": (n / warm, "rows/s")}
+
+def bench_transfer(repeat: int, quick: bool) -> Dict[str, tuple]:
+    import transfer
+    n = 2000 if quick else 10000
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = Path(tmp) / "tts", Path(tmp) / "rec"
+        src.mkdir()
+        words = [f"w{i:05d}" for i in range(n)]
+        for w in words:  # two takes per word, as with --voice/--model choices
+            (src / f"{w}__alloy__tts-1.wav").write_bytes(b"RIFF")
+            (src / f"{w}__verse__gpt-4o-mini-tts.wav").write_bytes(b"RIFF")
+
+        def run():
+            shutil.rmtree(dst, ignore_errors=True)
+            dst.mkdir()
+            counts = transfer.place(words, transfer.index_dir(src), dst, ["verse"], [], verbose=False)
+            assert counts.get("missing", 0) == 0, counts
+        t = best_time(run, repeat)
+    return {"transfer": (n / t, "files/s")}
+
+def bench_tts_pipeline(repeat: int, quick: bool) -> Dict[str, tuple]:
+    from fake_tts_server import serve
+    n = 100 if quick else 400
+    srv = serve(latency=0.0)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "tts_bench.csv"
+            synthetic_csv(csv_path, n)
+            env = dict(os.environ, OPENAI_API_KEY="bench")
+            cmd = [sys.executable, str(HERE / "make_tts_from_csv.py"), str(csv_path), "--url", srv.url,
+                   "--workers", "8", "--rate", "0", "--force", "--out"]
+
+            def run():
+                out = Path(tmp) / "out"
+                shutil.rmtree(out, ignore_errors=True)
+                subprocess.run(cmd + [str(out)], env=env, check=True, stdout=subprocess.DEVNULL)
+            t = best_time(run, max(1, repeat // 2))
+    finally:
+        srv.shutdown()
+    return {"tts_pipeline": (n / t, "rows/s")}
+
+BENCHMARKS = {
+    "synth": bench_synth,
+    "wav_encode": bench_wav_encode,
+    "csv": bench_csv,
+    "transfer": bench_transfer,
+    "tts_pipeline": bench_tts_pipeline,
+}
+
+# ---------- run / compare ----------
+
+def run(args) -> int:
+    selected = [b for b in BENCHMARKS if not args.only or any(b.startswith(o) for o in args.only)]
+    results = {}
+    for name in selected:
+        t0 = time.perf_counter()
+        for metric, (value, unit) in BENCHMARKS[name](args.repeat, args.quick).items():
+            results[metric] = {"value": round(value, 3), "unit": unit}
+            print(f"[BENCH] {metric:<34}{value:>14,.1f} {unit}")
+        print(f"[BENCH]   ({name} took {time.perf_counter() - t0:.1f}s)")
+    commit = git_commit()
+    doc = {"version": RESULTS_VERSION, "commit": commit, "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+           "quick": args.quick, "repeat": args.repeat, "python": platform.python_version(),
+           "numpy": np.__version__, "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} cpus)",
+           "results": results}
+    out = Path(args.out) if args.out else RESULTS_DIR / f"{commit}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(doc, indent=1, sort_keys=True), encoding="utf-8")
+    print(f"[BENCH] Wrote {out}")
+    return 0
+
+def load_results(ref: str) -> dict:
+    """A results file path, or a commit id (prefix) looked up in bench_results/."""
+    p = Path(ref)
+    if not p.is_file():
+        matches = sorted(RESULTS_DIR.glob(f"{ref}*.json"), key=lambda q: q.stat().st_mtime)
+        if not matches:
+            raise SystemExit(f"[BENCH] No results for '{ref}' (looked in {RESULTS_DIR})")
+        p = matches[-1]
+    return json.loads(p.read_text(encoding="utf-8"))
+
+def latest_results() -> str:
+    files = sorted(RESULTS_DIR.glob("*.json"), key=lambda q: q.stat().st_mtime)
+    if not files:
+        raise SystemExit(f"[BENCH] No results in {RESULTS_DIR}; run 'bench.py run' first")
+    return str(files[-1])
+
+def compare(base: dict, head: dict, threshold: float) -> List[str]:
+    """Print a table and return the metrics that regressed by more than threshold percent."""
+    regressions = []
+    print(f"{'metric':<36}{base['commit']:>16}{head['commit']:>16}{'change':>9}")
+    for metric in sorted(set(base["results"]) | set(head["results"])):
+        a, b = base["results"].get(metric), head["results"].get(metric)
+        if not a or not b:
+            va = f"{a['value']:,.1f}" if a else "-"
+            vb = f"{b['value']:,.1f}" if b else "-"
+            print(f"{metric:<36}{va:>16}{vb:>16}{'':>9}")
+            continue
+        change = (b["value"] - a["value"]) / a["value"] * 100 if a["value"] else 0.0
+        flag = ""
+        if change < -threshold:
+            flag = "  REGRESSION"
+            regressions.append(metric)
+        print(f"{metric:<36}{a['value']:>16,.1f}{b['value']:>16,.1f}{change:>+8.1f}%{flag}")
+    if base.get("machine") != head.get("machine") or base.get("quick") != head.get("quick"):
+        print("[BENCH] NOTE: results come from different machines or modes; treat the comparison with care")
+    return regressions
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the dev tools and track regressions per commit.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("run", help="Run benchmarks and store results as JSON")
+    r.add_argument("--only", action="append", help=f"Benchmark name prefix (repeatable): {', '.join(BENCHMARKS)}")
+    r.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark, best is kept (default 5)")
+    r.add_argument("--quick", action="store_true", help="Smaller inputs, for a fast sanity check")
+    r.add_argument("--out", help="Results file (default: dev_tools/bench_results/<commit>.json)")
+    c = sub.add_parser("compare", help="Compare two result sets and flag regressions")
+    c.add_argument("base", help="Baseline: results file or commit id")
+    c.add_argument("head", nargs="?", help="Candidate: results file or commit id (default: latest results)")
+    c.add_argument("--threshold", type=float, default=10.0, help="Allowed slowdown in percent (default 10)")
+    args = ap.parse_args()
+
+    if args.cmd == "run":
+        raise SystemExit(run(args))
+    base, head = load_results(args.base), load_results(args.head or latest_results())
+    regressions = compare(base, head, args.threshold)
+    if regressions:
+        print(f"[BENCH] {len(regressions)} regression(s) beyond {args.threshold:g}%: {', '.join(regressions)}")
+        raise SystemExit(1)
+    print(f"[BENCH] No regressions beyond {args.threshold:g}%")
+
+if __name__ == "__main__":
+    main()
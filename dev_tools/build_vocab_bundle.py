@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Compile every deck in data/vocab.csv into one pre-parsed vocabulary bundle for the web app.
+
+The app then loads the whole catalogue with one request instead of fetching and parsing each CSV
+(js/data.js falls back to the CSVs when the bundle is missing, lacks a requested deck, or is older than the
+index or a requested deck).
+
+    data/vocab.bundle.json       {"version", "hash", "fields", "decks": [{"filename", "displayName",
+                                  "description", "locale", "cards": [[id, hanzi, pinyin, english, locale, audio], ...]}]}
+    data/vocab.bundle.json.gz    same bytes gzip'ed (and .br when the brotli module is installed)
+
+Cards are exactly what rowsToCards() would build from each CSV (see vocab.py). `audio` is 1 when
+data/recordings/<locale>/<hanzi>.wav exists. `hash` is a digest of the content, so an unchanged
+catalogue rebuilds to identical files and `--check` can tell whether the bundle is stale. The bundle is
+build output (gitignored, like data/packs): build it before deploying.
+
+    python dev_tools/build_vocab_bundle.py
+    python dev_tools/build_vocab_bundle.py --check      # exit 1 if the bundle is out of date
+"""
+import argparse, gzip, hashlib, json, os, sys
+from pathlib import Path
+
+from fsutil import atomic_write_bytes
+from vocab import VOCAB_INDEX, iter_cards, load_index
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BUNDLE_NAME = "vocab.bundle.json"
+BUNDLE_VERSION = 1
+FIELDS = ["id", "hanzi", "pinyin", "english", "locale", "audio"]
+
+
+def recorded_words(rec_root: Path, locale: str) -> set:
+    """Hanzi with a <hanzi>.wav under rec_root/<locale>/ (the file name speech.js getAudioUrl() asks for)."""
+    d = rec_root / locale
+    if not locale or not d.is_dir():
+        return set()
+    with os.scandir(d) as it:
+        return {e.name[:-4] for e in it if e.name.endswith(".wav") and not e.name.startswith(".")}
+
+def build_bundle(index_path: Path, rec_root: Path) -> dict:
+    decks, recorded = [], {}
+    for deck in load_index(index_path):
+        if not deck.path.exists():
+            print(f"[BUNDLE] WARN: {deck.filename} is listed in {index_path} but missing", file=sys.stderr)
+            continue
+        cards = []
+        for c in iter_cards(deck.path):
+            loc = c.locale or deck.locale
+            if loc not in recorded:
+                recorded[loc] = recorded_words(rec_root, loc)
+            audio = c.hanzi in recorded[loc]
+            cards.append([c.id, c.hanzi, c.pinyin, c.english, c.locale, int(audio)])
+        decks.append({"filename": deck.filename, "displayName": deck.display_name,
+                      "description": deck.description, "locale": deck.locale, "cards": cards})
+    body = {"version": BUNDLE_VERSION, "fields": FIELDS, "decks": decks}
+    digest = hashlib.sha256(json.dumps(body, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+    return {"version": BUNDLE_VERSION, "hash": digest[:16], "fields": FIELDS, "decks": decks}
+
+def encode(bundle: dict) -> bytes:
+    return json.dumps(bundle, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def current_hash(path: Path):
+    try:
+        return json.loads(path.read_text(encoding="utf-8")).get("hash")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def write_variants(path: Path, data: bytes, compress: bool) -> list:
+    """Write the bundle and its precompressed sidecars; returns [(path, size)]."""
+    atomic_write_bytes(path, data)
+    out = [(path, len(data))]
+    if compress:
+        gz = gzip.compress(data, compresslevel=9, mtime=0)
+        atomic_write_bytes(path.with_name(path.name + ".gz"), gz)
+        out.append((path.with_name(path.name + ".gz"), len(gz)))
+        if brotli is not None:
+            br = brotli.compress(data, quality=11)
+            atomic_write_bytes(path.with_name(path.name + ".br"), br)
+            out.append((path.with_name(path.name + ".br"), len(br)))
+    return out
+
+def main():
+    ap = argparse.ArgumentParser(description="Compile data/vocab.csv decks into one vocabulary bundle.")
+    ap.add_argument("--index", default=str(VOCAB_INDEX), help="Deck index (default: data/vocab.csv)")
+    ap.add_argument("--recordings", default=os.path.join("data", "recordings"), help="Recordings root for the audio bit")
+    ap.add_argument("--out", help=f"Bundle path (default: {BUNDLE_NAME} next to the index)")
+    ap.add_argument("--no-compress", action="store_true", help="Do not write .gz/.br sidecars")
+    ap.add_argument("--force", action="store_true", help="Rewrite even if the content hash is unchanged")
+    ap.add_argument("--check", action="store_true", help="Only report whether the bundle is up to date (exit 1 if not)")
+    args = ap.parse_args()
+
+    index_path = Path(args.index)
+    out = Path(args.out) if args.out else index_path.parent / BUNDLE_NAME
+    bundle = build_bundle(index_path, Path(args.recordings))
+    n_cards = sum(len(d["cards"]) for d in bundle["decks"])
+    n_audio = sum(c[5] for d in bundle["decks"] for c in d["cards"])
+    old = current_hash(out)
+
+    if args.check:
+        ok = old == bundle["hash"]
+        print(f"[BUNDLE] {out}: {'up to date' if ok else 'STALE'} ({old or 'missing'} vs {bundle['hash']})")
+        raise SystemExit(0 if ok else 1)
+    if old == bundle["hash"] and not args.force:
+        os.utime(out)  # newer than the CSVs again, or the app would take it for stale (isBundleStale() in js/data.js)
+        print(f"[BUNDLE] {out} is up to date ({bundle['hash']}, {n_cards} cards)")
+        return
+    written = write_variants(out, encode(bundle), not args.no_compress)
+    print(f"[BUNDLE] {len(bundle['decks'])} decks, {n_cards} cards ({n_audio} with audio), hash {bundle['hash']}")
+    for p, size in written:
+        print(f"[BUNDLE]   {p}  {size / 1024:.1f} KiB")
+    if not args.no_compress and brotli is None:
+        print("[BUNDLE] (brotli module not installed; skipped .br)")
+
+if __name__ == "__main__":
+    main()
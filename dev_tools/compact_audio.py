@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Compact recordings for the app: probe the real container, trim leading/trailing silence,
+normalize loudness and re-encode to a small speech format with the correct extension.
+
+PCM WAVs (e.g. generate_sinoid.py output) are handled in NumPy alone; MP3 input and mp3/opus output
+use ffmpeg when it is on PATH. With `--codec auto` the tool picks mp3 if ffmpeg is available and
+16-bit PCM WAV otherwise, so a PCM-only directory always runs offline. Without ffmpeg, any other input
+(e.g. MP3 data in a .wav file) stops the run before it starts.
+
+    python dev_tools/compact_audio.py data/recordings/zh-CN dev_tools/compact/zh-CN --codec mp3 --bitrate 48k
+    python dev_tools/compact_audio.py data/recordings/xx-COOL /tmp/xx --codec wav --sr 24000
+
+Note: speech.js / toneLab.js still request `<word>.wav`; use transfer.py's recordings manifest to
+publish clips whose extension changed.
+"""
+import argparse, csv, os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from audio_io import (AudioDecodeError, encode_ffmpeg, have_ffmpeg, iter_audio_files, needs_ffmpeg, probe,
+                      read_audio, resample, sniff_container, write_wav_pcm16)
+
+CODEC_EXT = {"wav": ".wav", "mp3": ".mp3", "opus": ".ogg"}
+REPORT_FIELDS = ["file", "container", "codec", "bytes_in", "duration_in", "out", "bytes_out", "duration_out",
+                 "trim_start_ms", "trim_end_ms", "gain_db", "status"]
+
+# ---------- signal processing ----------
+
+def frame_db(x: np.ndarray, sr: int, frame_ms: float = 10.0) -> np.ndarray:
+    """RMS level per frame in dBFS."""
+    n = max(1, int(sr * frame_ms / 1000))
+    frames = len(x) // n
+    if frames == 0:
+        return np.full(1, -120.0)
+    rms = np.sqrt(np.mean(np.square(x[: frames * n].reshape(frames, n), dtype=np.float64), axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-6))
+
+def trim_silence(x: np.ndarray, sr: int, rel_db: float = -40.0, floor_db: float = -60.0,
+                 pad_ms: float = 40.0, frame_ms: float = 10.0):
+    """
+    Drop leading/trailing frames quieter than max(loudest frame + rel_db, floor_db), keeping `pad_ms`.
+    Returns (trimmed, start_sample, end_sample).
+    """
+    db = frame_db(x, sr, frame_ms)
+    thresh = max(float(db.max()) + rel_db, floor_db)
+    voiced = np.flatnonzero(db > thresh)
+    if voiced.size == 0:
+        return x, 0, len(x)
+    n = max(1, int(sr * frame_ms / 1000))
+    pad = int(sr * pad_ms / 1000)
+    start = max(0, voiced[0] * n - pad)
+    end = min(len(x), (voiced[-1] + 1) * n + pad)
+    return x[start:end], start, end
+
+def loudness_gain(x: np.ndarray, sr: int, target_db: float = -20.0, peak_db: float = -1.0,
+                  gate_db: float = -50.0) -> float:
+    """
+    Linear gain that brings the active-speech RMS (frames above `gate_db`) to `target_db`,
+    limited so the sample peak stays at or below `peak_db`.
+    """
+    db = frame_db(x, sr)
+    active = db[db > gate_db]
+    if active.size == 0:
+        return 1.0
+    level = 10 * np.log10(np.mean(10 ** (active / 10)))  # energy mean of active frames
+    gain = 10 ** ((target_db - level) / 20)
+    peak = float(np.abs(x).max()) if len(x) else 0.0
+    if peak > 0:
+        gain = min(gain, 10 ** (peak_db / 20) / peak)
+    return gain
+
+# ---------- per-clip worker ----------
+
+def compact_one(job):
+    src, dst_base, opts = job
+    row = {"file": str(src), "bytes_in": src.stat().st_size}
+    try:
+        info = probe(src)
+        row.update(container=info["container"], codec=info.get("codec", ""),
+                   duration_in=round(info.get("duration", 0.0), 3))
+        x, sr = read_audio(src)
+        trimmed, start, end = trim_silence(x, sr, opts["silence_db"], opts["floor_db"], opts["pad_ms"])
+        gain = loudness_gain(trimmed, sr, opts["target_db"], opts["peak_db"])
+        y = trimmed * gain
+        out_sr = opts["sr"] or sr
+        dst = dst_base.with_suffix(CODEC_EXT[opts["codec"]])
+        y = resample(y, sr, out_sr)
+        if opts["codec"] == "wav":
+            write_wav_pcm16(dst, y, out_sr)
+        else:
+            encode_ffmpeg(dst, y, out_sr, opts["codec"], opts["bitrate"])
+        row.update(out=str(dst), bytes_out=dst.stat().st_size, duration_out=round((end - start) / sr, 3),
+                   trim_start_ms=round(1000 * start / sr), trim_end_ms=round(1000 * (len(x) - end) / sr),
+                   gain_db=round(20 * np.log10(max(gain, 1e-9)), 2), status="ok")
+    except (AudioDecodeError, OSError, ValueError) as e:
+        row["status"] = f"error: {e}"
+    return row
+
+def main():
+    ap = argparse.ArgumentParser(description="Trim, loudness-normalize and re-encode recordings into a compact format.")
+    ap.add_argument("indir", help="Directory with recordings (e.g. data/recordings/zh-CN)")
+    ap.add_argument("outdir", help="Output directory (mirrors the input tree)")
+    ap.add_argument("--codec", choices=["auto", "wav", "mp3", "opus"], default="auto",
+                    help="Output codec (auto = mp3 if ffmpeg is available, else 16-bit WAV)")
+    ap.add_argument("--bitrate", default="48k", help="Bitrate for mp3/opus (default 48k)")
+    ap.add_argument("--sr", type=int, default=0, help="Output sample rate (default: keep input rate)")
+    ap.add_argument("--silence-db", type=float, default=-40.0, help="Trim threshold relative to the loudest frame (default -40 dB)")
+    ap.add_argument("--floor-db", type=float, default=-60.0, help="Absolute trim threshold floor (default -60 dBFS)")
+    ap.add_argument("--pad-ms", type=float, default=40.0, help="Silence kept before/after speech (default 40 ms)")
+    ap.add_argument("--target-db", type=float, default=-20.0, help="Active-speech RMS target (default -20 dBFS)")
+    ap.add_argument("--peak-db", type=float, default=-1.0, help="Peak ceiling (default -1 dBFS)")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes (default: all cores)")
+    ap.add_argument("--report", help="CSV report path (default: <outdir>/compaction_report.csv)")
+    args = ap.parse_args()
+
+    indir, outdir = Path(args.indir), Path(args.outdir)
+    if not indir.is_dir():
+        sys.exit(f"ERROR: not a directory: {indir}")
+    codec = args.codec if args.codec != "auto" else ("mp3" if have_ffmpeg() else "wav")
+    if codec != "wav" and not have_ffmpeg():
+        sys.exit(f"ERROR: --codec {codec} needs ffmpeg on PATH (use --codec wav for the NumPy-only path)")
+    opts = {"codec": codec, "bitrate": args.bitrate, "sr": args.sr, "silence_db": args.silence_db,
+            "floor_db": args.floor_db, "pad_ms": args.pad_ms, "target_db": args.target_db, "peak_db": args.peak_db}
+
+    jobs = [(p, outdir / p.relative_to(indir), opts) for p in iter_audio_files(indir)]
+    if not jobs:
+        sys.exit(f"No audio files found in {indir}")
+    if not have_ffmpeg():
+        need = [p for p, _, _ in jobs if needs_ffmpeg(p)]
+        if need:
+            kinds = sorted({sniff_container(p.read_bytes()[:16]) for p in need})
+            sys.exit(f"ERROR: {len(need)} of {len(jobs)} clips ({', '.join(kinds)}, e.g. {need[0].name}) can only be "
+                     f"decoded with ffmpeg, which is not on PATH. Install ffmpeg; only PCM WAV input works without it.")
+    print(f"[COMPACT] {len(jobs)} clips from {indir} -> {outdir}   Codec: {codec}"
+          f"{'' if codec == 'wav' else ' @ ' + args.bitrate}   Workers: {args.jobs}   ffmpeg: {'yes' if have_ffmpeg() else 'no'}")
+
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        rows = list(pool.map(compact_one, jobs, chunksize=16))
+    dt = time.perf_counter() - t0
+
+    report = Path(args.report) if args.report else outdir / "compaction_report.csv"
+    report.parent.mkdir(parents=True, exist_ok=True)
+    with open(report, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+        w.writeheader()
+        w.writerows(rows)
+
+    ok = [r for r in rows if r.get("status") == "ok"]
+    failed = [r for r in rows if r.get("status") != "ok"]
+    for r in failed[:10]:
+        print(f"  FAIL {r['file']}: {r['status']}")
+    if len(failed) > 10:
+        print(f"  ... and {len(failed) - 10} more failures (see report)")
+    b_in, b_out = sum(r["bytes_in"] for r in ok), sum(r["bytes_out"] for r in ok)
+    d_in, d_out = sum(r["duration_in"] for r in ok), sum(r["duration_out"] for r in ok)
+    containers = {}
+    for r in rows:
+        if "container" in r:
+            containers[r["container"]] = containers.get(r["container"], 0) + 1
+    print(f"[COMPACT] Input containers: {', '.join(f'{k}={v}' for k, v in sorted(containers.items()))}")
+    print(f"[COMPACT] Done: {len(ok)}/{len(rows)} clips in {dt:.1f}s   "
+          f"Size: {b_in / 1e6:.2f} MB -> {b_out / 1e6:.2f} MB ({100 * b_out / max(b_in, 1):.0f}%)   "
+          f"Duration: {d_in:.1f}s -> {d_out:.1f}s")
+    print(f"[COMPACT] Report: {report}")
+
+if __name__ == "__main__":
+    main()
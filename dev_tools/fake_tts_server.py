@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI speech endpoint (POST /v1/audio/speech), for testing the TTS tools offline.
+
+Answers each request with a short 24 kHz PCM WAV (a tone whose length grows with the input text),
+optionally adding latency and injecting 429/500 responses so retry and rate limiting can be exercised.
+
+    python dev_tools/fake_tts_server.py --port 8765 --latency 0.2 --fail-rate 0.1
+    OPENAI_API_KEY=dummy python dev_tools/make_tts_from_csv.py data/hsk1.csv --out /tmp/tts \\
+        --url http://127.0.0.1:8765/v1/audio/speech --workers 8 --rate 0
+"""
+import argparse, io, json, math, random, struct, threading, time, wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FAKE_SR = 24000
+
+
+def _tone(text: str, sr: int) -> list:
+    n = int(sr * 0.12 * max(1, len(text)))
+    freq = 180.0 + (sum(map(ord, text)) % 200)
+    return [int(8000 * math.sin(2 * math.pi * freq * i / sr)) for i in range(n)]
+
+def fake_wav(text: str, sr: int = FAKE_SR, pause: float = 0.4) -> bytes:
+    """
+    ~120 ms of tone per character, so distinct inputs give distinct audio.
+    Multi-line input (a batch) is read line by line with `pause` seconds of silence in between.
+    """
+    samples = []
+    for i, line in enumerate(text.split("\n")):
+        if i:
+            samples += [0] * int(sr * pause)
+        samples += _tone(line, sr)
+    frames = struct.pack(f"<{len(samples)}h", *samples)
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        w.writeframes(frames)
+    return buf.getvalue()
+
+
+class FakeTtsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled sessions are exercised
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _reply(self, status: int, body: bytes, ctype: str, extra: dict | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (extra or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client went away (e.g. an interrupted batch run)
+
+    def do_POST(self):
+        srv = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        with srv.lock:
+            srv.requests += 1
+            srv.in_flight += 1
+            srv.max_in_flight = max(srv.max_in_flight, srv.in_flight)
+        try:
+            if self.path.rstrip("/") != srv.path:
+                return self._reply(404, b'{"error":"not found"}', "application/json")
+            if not self.headers.get("Authorization", "").startswith("Bearer "):
+                return self._reply(401, b'{"error":"missing api key"}', "application/json")
+            try:
+                payload = json.loads(body or b"{}")
+                text = str(payload["input"])
+            except (ValueError, KeyError):
+                return self._reply(400, b'{"error":"bad payload"}', "application/json")
+            if payload.get("response_format", "mp3") != "wav":
+                # the real endpoint answers MP3 unless asked otherwise; this stand-in only makes WAV
+                return self._reply(400, b'{"error":"only response_format=wav is supported"}', "application/json")
+            if srv.latency > 0:
+                time.sleep(srv.latency * (0.5 + srv.rng.random()))
+            roll = srv.rng.random()
+            if roll < srv.fail_rate:
+                with srv.lock:
+                    srv.failures += 1
+                if roll < srv.fail_rate / 2:
+                    return self._reply(429, b'{"error":"rate limited"}', "application/json",
+                                       {"Retry-After": f"{srv.retry_after:g}"})
+                return self._reply(500, b'{"error":"server error"}', "application/json")
+            self._reply(200, fake_wav(text), "audio/wav")
+        finally:
+            with srv.lock:
+                srv.in_flight -= 1
+
+
+def serve(host: str = "127.0.0.1", port: int = 0, *, latency: float = 0.0, fail_rate: float = 0.0,
+          retry_after: float = 0.5, seed: int = 0, path: str = "/v1/audio/speech",
+          verbose: bool = False) -> ThreadingHTTPServer:
+    """Start the stand-in server on a daemon thread and return it (`server.url` is the endpoint)."""
+    srv = ThreadingHTTPServer((host, port), FakeTtsHandler)
+    srv.daemon_threads = True
+    srv.latency, srv.fail_rate, srv.retry_after = latency, fail_rate, retry_after
+    srv.path, srv.verbose = path.rstrip("/"), verbose
+    srv.rng = random.Random(seed)
+    srv.lock = threading.Lock()
+    srv.requests = srv.failures = srv.in_flight = srv.max_in_flight = 0
+    srv.url = f"http://{srv.server_address[0]}:{srv.server_address[1]}{srv.path}"
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Local stand-in for the OpenAI speech endpoint.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="Mean seconds per request (default 0)")
+    ap.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered 429/500")
+    ap.add_argument("--retry-after", type=float, default=0.5, help="Retry-After seconds sent with 429")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--verbose", action="store_true")
+    args = ap.parse_args()
+
+    srv = serve(args.host, args.port, latency=args.latency, fail_rate=args.fail_rate,
+                retry_after=args.retry_after, seed=args.seed, verbose=args.verbose)
+    print(f"[FAKE-TTS] Listening on {srv.url}  (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    srv.shutdown()
+    print(f"[FAKE-TTS] Requests: {srv.requests}  Injected failures: {srv.failures}  Max in flight: {srv.max_in_flight}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""File placement helpers shared by the dev tools (atomic writes, link-instead-of-copy)."""
+import os, shutil, tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+    FICLONE = 0x40049409  # Linux ioctl: share extents (btrfs, xfs, ...)
+except ImportError:  # Windows
+    fcntl = None
+
+_UMASK = os.umask(0); os.umask(_UMASK)
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write via a temp file in the same directory + rename, so readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o666 & ~_UMASK)  # mkstemp creates 0600; give the file normal permissions
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def atomic_open(path: Path):
+    """Like atomic_write_bytes() for data written incrementally: yields a binary file, renamed into place on success."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.chmod(tmp, 0o666 & ~_UMASK)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    if fcntl is None:
+        return False
+    try:
+        with open(src, "rb") as fs, open(dst, "wb") as fd:
+            fcntl.ioctl(fd.fileno(), FICLONE, fs.fileno())
+        return True
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+
+
+def link_or_copy(src: Path, dst: Path, mode: str = "auto") -> str:
+    """
+    Make `dst` have the content of `src`, replacing it atomically.
+    mode "auto" tries a hardlink, then a reflink (copy-on-write clone), then a plain copy;
+    "link"/"reflink"/"copy" force one method. Returns the method used.
+    """
+    src, dst = Path(src), Path(dst)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.link")
+    tmp.unlink(missing_ok=True)
+    how = None
+    if mode in ("auto", "link"):
+        try:
+            os.link(src, tmp)
+            how = "link"
+        except OSError:
+            if mode == "link":
+                raise
+    if how is None and mode in ("auto", "reflink"):
+        if _reflink(src, tmp):
+            how = "reflink"
+        elif mode == "reflink":
+            raise OSError(f"reflink not supported for {src} -> {dst}")
+    if how is None:
+        shutil.copyfile(src, tmp)
+        how = "copy"
+    os.replace(tmp, dst)
+    return how
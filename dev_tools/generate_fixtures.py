@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bulk synthetic tone fixtures for load-testing the Tone Lab and the audio cache.
+
+Renders parameter sweeps (tone type × F0 range × duration × vibrato × harmonics) with the
+generate_sinoid.py engine in a process pool, writes the clips to data/recordings/<locale>/,
+the matching vocabulary CSV to data/<name>.csv and registers it in data/vocab.csv.
+
+The sweep is described by a JSON spec (see DEFAULT_SPEC). In "grid" mode every value list is
+crossed; in "random" mode `count` clips are drawn with the given seed, where a list means
+"choose one" and {"min": a, "max": b} means uniform (integers if both bounds are ints).
+The same spec + seed always gives the same files.
+
+    python dev_tools/generate_fixtures.py --mode grid
+    python dev_tools/generate_fixtures.py spec.json --mode random --count 5000 --seed 7 --jobs 8
+"""
+import argparse, csv, itertools, json, os, random, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from generate_sinoid import SR, generate_continuous, write_wav_mono16
+from vocab import update_index
+
+DEFAULT_SPEC = {
+    "name": "sinoid_load",
+    "display_name": "Sinoid Load Test 🤖",
+    "description": "Synthetic tone sweep (for load testing only)",
+    "locale": "xx-LOAD",
+    "mode": "grid",
+    "seed": 0,
+    "count": 1000,
+    "params": {
+        "tone": ["T1", "T2", "T3", "T4", "GLIDE", "STEP"],
+        "f0Low": [90, 150, 200],
+        "f0Range": [80, 130],
+        "durMs": [300, 600, 900],
+        "vibratoHz": [0, 5],
+        "vibratoDepth": [0.03],
+        "harmonics": [0, 4],
+    },
+}
+
+# Tone shapes as fractions of the speaker range [lo, lo + range]; ratios follow CONT_PRESETS.
+TONE_SHAPES = {
+    "T1":    lambda lo, r: {"type": "T1", "f0": lo + 0.55 * r},
+    "T2":    lambda lo, r: {"type": "T2", "f0Start": lo + 0.23 * r, "f0End": lo + r},
+    "T3":    lambda lo, r: {"type": "T3", "f0A": lo + 0.85 * r, "f0B": lo + 0.08 * r, "f0End": lo + 0.62 * r, "split": 0.6},
+    "T4":    lambda lo, r: {"type": "T4", "f0Start": lo + r, "f0End": lo},
+    "GLIDE": lambda lo, r: {"type": "GLIDE", "f0Start": lo, "f0End": lo + r},
+    "STEP":  lambda lo, r: {"type": "STEP", "f0A": lo + 0.38 * r, "f0B": lo + 0.85 * r, "split": 0.5},
+}
+
+# ---------- parameter sampling ----------
+
+def sample_value(rng: random.Random, spec):
+    if isinstance(spec, dict):
+        lo, hi = spec["min"], spec["max"]
+        if isinstance(lo, int) and isinstance(hi, int):
+            return rng.randint(lo, hi)
+        return round(rng.uniform(lo, hi), 4)
+    if isinstance(spec, list):
+        return rng.choice(spec)
+    return spec
+
+def expand(spec: Dict) -> List[Dict]:
+    """Spec → ordered list of parameter dicts (deterministic for a given spec + seed)."""
+    params = spec["params"]
+    keys = sorted(params)
+    if spec.get("mode", "grid") == "grid":
+        values = [v if isinstance(v, list) else [v] for v in (params[k] for k in keys)]
+        return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+    rng = random.Random(spec.get("seed", 0))
+    return [{k: sample_value(rng, params[k]) for k in keys} for _ in range(int(spec.get("count", 1000)))]
+
+def to_cfg(clip_id: str, p: Dict) -> Dict:
+    """Parameter dict → generate_continuous() config."""
+    tone = p.get("tone", "T1")
+    if tone not in TONE_SHAPES:
+        raise ValueError(f"unknown tone type {tone!r} (expected one of {', '.join(TONE_SHAPES)})")
+    cfg = TONE_SHAPES[tone](float(p.get("f0Low", 150)), float(p.get("f0Range", 120)))
+    cfg.update(id=clip_id, durMs=int(p.get("durMs", 600)), harmonics=int(p.get("harmonics", 0)))
+    if p.get("vibratoHz") and p.get("vibratoDepth"):
+        cfg.update(vibratoHz=float(p["vibratoHz"]), vibratoDepth=float(p["vibratoDepth"]))
+    return cfg
+
+def describe(cfg: Dict) -> str:
+    hz = [cfg[k] for k in ("f0", "f0Start", "f0A", "f0B", "f0End") if k in cfg]
+    span = f"{min(hz):.0f}" if min(hz) == max(hz) else f"{min(hz):.0f}-{max(hz):.0f}"
+    text = f"{cfg['type']} {span} Hz, {cfg['durMs']} ms"
+    if cfg.get("vibratoHz"):
+        text += f", vibrato {cfg['vibratoHz']:g} Hz ±{cfg['vibratoDepth'] * 100:g}%"
+    if cfg.get("harmonics"):
+        text += f", {cfg['harmonics']} harmonics"
+    return text
+
+# ---------- rendering (runs in worker processes) ----------
+
+def render_clip(job):
+    path, cfg = job
+    samples = generate_continuous(cfg)
+    write_wav_mono16(path, samples, SR)
+    return len(samples)
+
+# ---------- index files ----------
+
+def write_vocab_csv(path: str, cfgs: List[Dict]) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["hanzi", "pinyin", "english"])
+        for cfg in cfgs:
+            w.writerow([cfg["id"], cfg["type"].lower(), describe(cfg)])
+
+def main():
+    ap = argparse.ArgumentParser(description="Render a parametric sweep of synthetic tone clips in parallel.")
+    ap.add_argument("spec", nargs="?", help="JSON spec file (default: built-in DEFAULT_SPEC)")
+    ap.add_argument("--mode", choices=["grid", "random"], help="Override the spec's sampling mode")
+    ap.add_argument("--count", type=int, help="Number of clips in random mode")
+    ap.add_argument("--seed", type=int, help="Random seed (random mode)")
+    ap.add_argument("--name", help="Deck name: writes data/<name>.csv (default from spec)")
+    ap.add_argument("--locale", help="Recording locale dir (default from spec)")
+    ap.add_argument("--data", default="data", help="Data directory (default: data)")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes (default: all cores)")
+    ap.add_argument("--no-register", action="store_true", help="Do not add the deck to data/vocab.csv")
+    args = ap.parse_args()
+
+    spec = dict(DEFAULT_SPEC)
+    if args.spec:
+        with open(args.spec, encoding="utf-8") as f:
+            spec.update(json.load(f))
+    for key in ("mode", "count", "seed", "name", "locale"):
+        if getattr(args, key) is not None:
+            spec[key] = getattr(args, key)
+
+    try:
+        cfgs = [to_cfg(f"{spec['name']}-{i:05d}", p) for i, p in enumerate(expand(spec))]
+    except (KeyError, ValueError) as e:
+        sys.exit(f"ERROR: bad spec: {e}")
+    if not cfgs:
+        sys.exit("ERROR: spec produced no clips.")
+
+    locale_dir = os.path.join(args.data, "recordings", spec["locale"])
+    os.makedirs(locale_dir, exist_ok=True)
+    jobs = [(os.path.join(locale_dir, f"{cfg['id']}.wav"), cfg) for cfg in cfgs]
+    print(f"[FIX] {len(jobs)} clips ({spec['mode']}, seed {spec.get('seed', 0)}) -> {locale_dir}   Workers: {args.jobs}")
+
+    t0 = time.perf_counter()
+    total_samples = 0
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        for n in pool.map(render_clip, jobs, chunksize=max(1, len(jobs) // (8 * max(1, args.jobs)))):
+            total_samples += n
+    dt = time.perf_counter() - t0
+    print(f"[FIX] Rendered {len(jobs)} clips, {total_samples / SR:.1f} s of audio in {dt:.2f}s "
+          f"({len(jobs) / max(dt, 1e-9):.0f} clips/s)")
+
+    csv_name = f"{spec['name']}.csv"
+    write_vocab_csv(os.path.join(args.data, csv_name), cfgs)
+    print("Wrote", os.path.join(args.data, csv_name))
+    if not args.no_register:
+        index_path = os.path.join(args.data, "vocab.csv")
+        if update_index(index_path, [[csv_name, spec.get("display_name", spec["name"]),
+                                      spec.get("description", ""), spec["locale"]]]):
+            print("Updated", index_path)
+
+if __name__ == "__main__":
+    main()
@@ -1,148 +1,180 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import os, csv, math, wave, struct
-from typing import List, Dict, Tuple, Optional
+import os, csv, math, wave, time, argparse
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 SR = 48000  # sample rate
+CHUNK = 1 << 16  # samples per block in the streaming pipeline (memory stays O(CHUNK) for any duration)
+PEAK = 0.6  # normalization target
 
 # ---------- small helpers ----------
 
-def hann(n: int, N: int) -> float:
-    return 0.5 * (1 - math.cos(2 * math.pi * n / (N - 1))) if N > 1 else 1.0
+def hann_ramp(n: int, N: int) -> np.ndarray:
+    """hann(i, N) for i in 0..n-1, as one array."""
+    if N <= 1:
+        return np.ones(n)
+    return 0.5 * (1 - np.cos(2 * np.pi * np.arange(n, dtype=np.float64) / (N - 1)))
+
+def to_pcm16(samples) -> np.ndarray:
+    """Clip to [-1, 1] and truncate toward zero (same as int(s * 32767))."""
+    return (np.clip(np.asarray(samples, dtype=np.float64), -1.0, 1.0) * 32767.0).astype('<i2')
 
-def write_wav_mono16(path: str, samples: List[float], sr: int = SR) -> None:
-    frames = bytearray()
-    for s in samples:
-        v = int(max(-1.0, min(1.0, s)) * 32767.0)
-        frames += struct.pack('<h', v)
-    os.makedirs(os.path.dirname(path), exist_ok=True)
+def write_wav_stream(path: str, blocks: Iterable[np.ndarray], sr: int = SR) -> int:
+    """Write float blocks as 16-bit mono, one block at a time; returns the number of samples written."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    n = 0
     with wave.open(path, 'wb') as w:
         w.setnchannels(1)
         w.setsampwidth(2)  # 16-bit
         w.setframerate(sr)
-        w.writeframes(frames)
+        for block in blocks:
+            w.writeframes(to_pcm16(block).tobytes())
+            n += len(block)
+    return n
 
-# ---------- continuous F0 synth (as before) ----------
-
-def generate_continuous(cfg: Dict) -> List[float]:
-    """Existing continuous F0 patterns (T1/T2/T3/T4/STEP/GLIDE + vibrato/harmonics)."""
-    dur = cfg.get("durMs", 600) / 1000.0
-    N = max(1, int(SR * dur))
-    f0 = [0.0] * N
+def write_wav_mono16(path: str, samples, sr: int = SR) -> None:
+    write_wav_stream(path, [samples], sr)
 
+def normalized(make_blocks: Callable[[], Iterator[np.ndarray]], target: float = PEAK) -> Iterator[np.ndarray]:
+    """
+    Two-pass peak normalization of a block stream: the first pass only measures the peak,
+    the second regenerates the blocks and scales them, so nothing is held in memory.
+    """
+    peak = 1e-9
+    for block in make_blocks():
+        if block.size:
+            peak = max(peak, float(np.abs(block).max()))
+    gain = target / peak
+    for block in make_blocks():
+        yield block * gain
+
+def _spans(N: int, chunk: int) -> Iterator[Tuple[int, int]]:
+    for a in range(0, N, chunk):
+        yield a, min(N, a + chunk)
+
+# ---------- continuous F0 synth ----------
+
+def f0_track(cfg: Dict, N: int, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+    """Pitch track in Hz for T1/T2/T3/T4/STEP/GLIDE/SWEEP (before vibrato), samples start..stop of N."""
     typ = cfg["type"]
+    stop = N if stop is None else stop
+    i = np.arange(start, stop, dtype=np.float64)
+    ramp = i / (N - 1) if N > 1 else np.zeros(len(i))
 
     if typ == "T1":
-        for i in range(N):
-            f0[i] = float(cfg["f0"])
-    elif typ == "T2":
+        return np.full(len(i), float(cfg["f0"]))
+    if typ in ("T2", "T4"):
         f0s, f0e = float(cfg["f0Start"]), float(cfg["f0End"])
-        for i in range(N):
-            a = i / (N - 1) if N > 1 else 0.0
-            f0[i] = f0s + (f0e - f0s) * a
-    elif typ == "T3":
+        return f0s + (f0e - f0s) * ramp
+    if typ == "T3":
         split = int(cfg.get("split", 0.6) * N)
         f0A, f0B, f0E = float(cfg["f0A"]), float(cfg["f0B"]), float(cfg["f0End"])
-        for i in range(N):
-            if i < split:
-                a = i / max(1, split - 1)
-                f0[i] = f0A + (f0B - f0A) * a
-            else:
-                rem = N - split
-                a = (i - split) / max(1, rem - 1)
-                f0[i] = f0B + (f0E - f0B) * a
-    elif typ == "T4":
-        f0s, f0e = float(cfg["f0Start"]), float(cfg["f0End"])
-        for i in range(N):
-            a = i / (N - 1) if N > 1 else 0.0
-            f0[i] = f0s + (f0e - f0s) * a
-    elif typ == "STEP":
+        k = max(0, min(len(i), split - start))
+        f0 = np.empty(len(i))
+        f0[:k] = f0A + (f0B - f0A) * (i[:k] / max(1, split - 1))
+        rem = N - split
+        f0[k:] = f0B + (f0E - f0B) * ((i[k:] - split) / max(1, rem - 1))
+        return f0
+    if typ == "STEP":
         split = int(cfg.get("split", 0.5) * N)
-        f0A, f0B = float(cfg["f0A"]), float(cfg["f0B"])
-        for i in range(N):
-            f0[i] = f0A if i < split else f0B
-    elif typ == "GLIDE":
+        return np.where(i < split, float(cfg["f0A"]), float(cfg["f0B"]))
+    if typ == "GLIDE":
+        f0s, f0e = float(cfg["f0Start"]), float(cfg["f0End"])
+        s = ramp * ramp * (3 - 2 * ramp)  # cubic smoothstep
+        return f0s + (f0e - f0s) * s
+    if typ == "SWEEP":
+        # triangle sweep f0Start → f0End → f0Start every periodMs (long soak-test fixtures)
         f0s, f0e = float(cfg["f0Start"]), float(cfg["f0End"])
-        for i in range(N):
-            a = i / (N - 1) if N > 1 else 0.0
-            # cubic smoothstep
-            s = a * a * (3 - 2 * a)
-            f0[i] = f0s + (f0e - f0s) * s
-    else:
-        for i in range(N):
-            f0[i] = 220.0
+        period = max(2.0, SR * cfg.get("periodMs", 4000) / 1000.0)
+        tri = 1.0 - np.abs(2.0 * ((i / period) % 1.0) - 1.0)
+        return f0s + (f0e - f0s) * tri
+    return np.full(len(i), 220.0)
 
+def iter_continuous_raw(cfg: Dict, chunk: int = CHUNK) -> Iterator[np.ndarray]:
+    """Unnormalized blocks of a continuous pattern; the phase carries across blocks."""
+    dur = cfg.get("durMs", 600) / 1000.0
+    N = max(1, int(SR * dur))
     vib_hz = cfg.get("vibratoHz", None)
     vib_depth = cfg.get("vibratoDepth", None)
-    if vib_hz and vib_depth:
-        vhz, vdp = float(vib_hz), float(vib_depth)
-        for i in range(N):
-            t = i / SR
-            f0[i] *= (1.0 + vdp * math.sin(2 * math.pi * vhz * t))
-
-    # Integrate frequency → phase and synthesize sine (+ optional harmonics)
-    samples = [0.0] * N
-    phase = 0.0
     harmonics = int(cfg.get("harmonics", 0))
-
-    for i in range(N):
-        phase += (2 * math.pi * f0[i]) / SR
-        s = math.sin(phase)
+    # short fade-in/out (~10 ms) to avoid clicks in continuous tones
+    fade = max(1, int(0.01 * SR))
+    n = min(fade, N)
+    w = hann_ramp(n, fade)
+    phase = 0.0
+    for a, b in _spans(N, chunk):
+        f0 = f0_track(cfg, N, a, b)
+        if vib_hz and vib_depth:
+            vhz, vdp = float(vib_hz), float(vib_depth)
+            t = np.arange(a, b, dtype=np.float64) / SR
+            f0 *= (1.0 + vdp * np.sin(2 * np.pi * vhz * t))
+
+        # Integrate frequency → phase (sequential cumsum, carried in from the previous block)
+        inc = (2 * np.pi * f0) / SR
+        inc[0] += phase
+        ph = np.cumsum(inc)
+        phase = float(ph[-1])
+        samples = np.sin(ph)
         if harmonics > 0:
             for k in range(2, harmonics + 1):
-                s += (1.0 / (k * k)) * math.sin(k * phase)
-            s /= (1.0 + 0.2)
-        samples[i] = s
+                samples += (1.0 / (k * k)) * np.sin(k * ph)
+            samples /= (1.0 + 0.2)
 
-    # short fade-in/out (~10 ms) to avoid clicks in continuous tones
-    fade = max(1, int(0.01 * SR))
-    for i in range(min(fade, N)):
-        w = hann(i, fade)
-        samples[i] *= w
-        samples[-1 - i] *= w
+        if a < n:  # fade-in
+            samples[: min(n, b) - a] *= w[a: min(n, b)]
+        if b > N - n:  # fade-out (w reversed over the last n samples)
+            lo = max(a, N - n)
+            samples[lo - a:] *= w[::-1][lo - (N - n): b - (N - n)]
+        yield samples
+
+def iter_continuous(cfg: Dict, chunk: int = CHUNK) -> Iterator[np.ndarray]:
+    """Continuous F0 patterns (T1/T2/T3/T4/STEP/GLIDE/SWEEP + vibrato/harmonics), normalized to ~0.6 peak."""
+    return normalized(lambda: iter_continuous_raw(cfg, chunk))
 
-    # normalize to ~0.6 peak
-    peak = max(1e-9, max(abs(x) for x in samples))
-    scale = 0.6 / peak
-    return [x * scale for x in samples]
+def generate_continuous(cfg: Dict) -> np.ndarray:
+    """Whole clip of iter_continuous() as float64 samples."""
+    return np.concatenate(list(iter_continuous(cfg)))
 
-# ---------- NEW: segment engine for timing tests ----------
+# ---------- segment engine for timing tests ----------
 
 Segment = Tuple[int, Optional[float]]  # (duration_ms, hz or None for silence)
 
-def generate_segments(segments: List[Segment], add_clicks: bool = False) -> List[float]:
+def iter_segments_raw(segments: List[Segment], add_clicks: bool = False, chunk: int = CHUNK) -> Iterator[np.ndarray]:
+    """Unnormalized blocks of generate_segments(); tone phase carries across blocks and segments."""
+    phase = 0.0
+    for j, (dur_ms, hz) in enumerate(segments):
+        n = max(1, int(SR * (dur_ms / 1000.0)))
+        # Optional boundary click: a 1-sample spike on the last sample before the next segment
+        click = add_clicks and j + 1 < len(segments)
+        for a, b in _spans(n, chunk):
+            if hz is None or hz <= 0.0:
+                block = np.zeros(b - a)  # silence
+            else:
+                # tone segment – hard step by design (no crossfade)
+                inc = np.full(b - a, (2 * math.pi * hz) / SR)
+                inc[0] += phase
+                ph = np.cumsum(inc)
+                phase = float(ph[-1])
+                block = np.sin(ph)
+            if click and b == n:
+                block[-1] = 0.95
+            yield block
+
+def iter_segments(segments: List[Segment], add_clicks: bool = False, chunk: int = CHUNK) -> Iterator[np.ndarray]:
     """
-    Build a waveform from timed segments. Each segment is (duration_ms, f_hz or None for silence).
+    Stream a waveform from timed segments. Each segment is (duration_ms, f_hz or None for silence).
     If add_clicks=True, put a 1-sample marker (small spike) at each boundary to make timing obvious.
+    Globally normalized to ~0.6 peak.
     """
-    out: List[float] = []
-    last_was_tone = False
-    phase = 0.0
+    return normalized(lambda: iter_segments_raw(segments, add_clicks, chunk))
 
-    for si, (dur_ms, hz) in enumerate(segments):
-        n = max(1, int(SR * (dur_ms / 1000.0)))
-
-        # Optional boundary click (tiny, but visible in waveform/spectrogram)
-        if add_clicks and out:
-            out[-1] = 0.95  # single-sample spike
-
-        if hz is None or hz <= 0.0:
-            # silence
-            out.extend([0.0] * n)
-            last_was_tone = False
-            continue
-
-        # tone segment – hard step by design (no crossfade)
-        for i in range(n):
-            phase += (2 * math.pi * hz) / SR
-            out.append(math.sin(phase))
-        last_was_tone = True
-
-    # global normalization to ~0.6 peak
-    peak = max(1e-9, max(abs(x) for x in out))
-    scale = 0.6 / peak
-    return [x * scale for x in out]
+def generate_segments(segments: List[Segment], add_clicks: bool = False) -> np.ndarray:
+    """Whole clip of iter_segments() as float64 samples."""
+    blocks = list(iter_segments(segments, add_clicks))
+    return np.concatenate(blocks) if blocks else np.zeros(0)
 
 # ---------- presets ----------
 
@@ -156,6 +188,10 @@ CONT_PRESETS = [
     { "id":"sinoid-t4-rich", "type":"T4",   "durMs":600, "f0Start":280, "f0End":150, "harmonics":4 }
 ]
 
+# Long soak-test fixture (--soak): slow 150↔300 Hz sweeps with vibrato and harmonics; durMs comes from the CLI.
+SOAK_PRESET = { "id":"sinoid-soak-sweep", "type":"SWEEP", "f0Start":150, "f0End":300, "periodMs":4000,
+                "vibratoHz":5, "vibratoDepth":0.02, "harmonics":3 }
+
 # Timing fixtures (clear steps + initial/final silence).
 SEG_PRESETS = [
     {
@@ -226,22 +262,67 @@ VOCAB_TIMING = [
     ("sinoid-pulse-train","siːnɔɪd pʌls treɪn","Pulse train at 4 Hz: (200 ms tone @ 300 Hz + 50 ms silence) × 8 after 300 ms silence")
 ]
 
+def bench(repeat: int = 3) -> int:
+    """Compare the NumPy engine against the original loops (sinoid_reference.py): speed and max LSB diff."""
+    import sinoid_reference as ref
+
+    def best(fn):
+        times = []
+        for _ in range(max(1, repeat)):
+            t0 = time.perf_counter(); out = fn(); times.append(time.perf_counter() - t0)
+        return min(times), out
+
+    cases = [(c["id"], lambda c=c: generate_continuous(c), lambda c=c: ref.generate_continuous(c)) for c in CONT_PRESETS]
+    cases += [(c["id"], lambda c=c: generate_segments(c["segments"], c.get("clicks", False)),
+               lambda c=c: ref.generate_segments(c["segments"], c.get("clicks", False))) for c in SEG_PRESETS]
+
+    print(f"{'preset':<26}{'samples':>9}{'loop ms':>10}{'numpy ms':>10}{'speedup':>9}{'max LSB':>9}")
+    worst, t_loop, t_np = 0, 0.0, 0.0
+    for name, fast, slow in cases:
+        ts, ref_samples = best(lambda: ref.encode_pcm16(slow()))
+        tf, new_samples = best(lambda: to_pcm16(fast()).tobytes())
+        a = np.frombuffer(ref_samples, dtype='<i2').astype(np.int32)
+        b = np.frombuffer(new_samples, dtype='<i2').astype(np.int32)
+        diff = int(np.abs(a - b).max()) if a.size == b.size else 1 << 16
+        worst = max(worst, diff); t_loop += ts; t_np += tf
+        print(f"{name:<26}{a.size:>9}{ts * 1e3:>10.1f}{tf * 1e3:>10.2f}{ts / max(tf, 1e-9):>8.0f}x{diff:>9}")
+    print(f"{'total':<26}{'':>9}{t_loop * 1e3:>10.1f}{t_np * 1e3:>10.2f}{t_loop / max(t_np, 1e-9):>8.0f}x{worst:>9}")
+    if worst > 1:
+        print(f"FAIL: NumPy engine differs from the reference by {worst} LSB (allowed: 1)")
+        return 1
+    return 0
+
 def main():
+    ap = argparse.ArgumentParser(description="Write the artificial sinoid fixtures (data/recordings/xx-COOL) and data/artificial.csv.")
+    ap.add_argument("--bench", action="store_true", help="Benchmark against the original per-sample loops instead of writing files")
+    ap.add_argument("--repeat", type=int, default=3, help="Timing repetitions for --bench (best of N)")
+    ap.add_argument("--soak", type=float, metavar="MINUTES",
+                    help="Only write a long pitch-sweep fixture of this length (streamed, constant memory)")
+    ap.add_argument("--soak-out", default=os.path.join("dev_tools", "soak", "sinoid-soak-sweep.wav"),
+                    help="Output path for --soak (default: dev_tools/soak/sinoid-soak-sweep.wav)")
+    args = ap.parse_args()
+    if args.bench:
+        raise SystemExit(bench(args.repeat))
+    if args.soak:
+        cfg = dict(SOAK_PRESET, durMs=int(args.soak * 60000))
+        t0 = time.perf_counter()
+        n = write_wav_stream(args.soak_out, iter_continuous(cfg), SR)
+        print(f"Wrote {args.soak_out} ({n / SR / 60:.1f} min, {n * 2 / 1e6:.1f} MB) in {time.perf_counter() - t0:.1f}s")
+        return
+
     locale_dir = os.path.join("data", "recordings", "xx-COOL")  # invented locale
     os.makedirs(locale_dir, exist_ok=True)
 
     # 1) continuous presets
     for cfg in CONT_PRESETS:
         path = os.path.join(locale_dir, f"{cfg['id']}.wav")
-        samples = generate_continuous(cfg)
-        write_wav_mono16(path, samples, SR)
+        write_wav_stream(path, iter_continuous(cfg), SR)
         print("Wrote", path)
 
     # 2) timing/segment presets
     for scfg in SEG_PRESETS:
         path = os.path.join(locale_dir, f"{scfg['id']}.wav")
-        samples = generate_segments(scfg["segments"], add_clicks=scfg.get("clicks", False))
-        write_wav_mono16(path, samples, SR)
+        write_wav_stream(path, iter_segments(scfg["segments"], add_clicks=scfg.get("clicks", False)), SR)
         print("Wrote", path)
 
     # 3) vocabulary CSV
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Integrity and metadata index of data/recordings, so broken clips are found here instead of one failed
+decodeAudioData at a time in the browser.
+
+Every clip under data/recordings/<locale>/ is probed in a process pool:
+
+- from the headers: real container, codec, sample rate, channels, duration and truncation
+- from the decoded samples: peak and RMS level (dBFS), share of clipped samples, and leading/trailing silence
+
+Decoding MP3 needs ffmpeg; without it those clips get header fields only.
+Issues are flagged as: ext-mismatch (e.g. MP3 data named .wav), truncated, undecodable, empty, silent, clipping,
+odd-rate (rate differs from the locale's usual one) and long-silence.
+Every card of data/vocab.csv is then matched against the recordings by the file the app requests
+(<locale>/<hanzi>.wav, as pack_audio.py does), to list missing audio and orphaned clips.
+
+Results are cached in dev_tools/.cache/recordings.pickle keyed on size and mtime, so only new or changed
+clips are probed again.
+
+    python dev_tools/index_recordings.py                         # summary per locale
+    python dev_tools/index_recordings.py --list --json /tmp/recordings_index.json
+    python dev_tools/index_recordings.py --locale zh-CN --strict # exit 1 on any issue
+"""
+import argparse, json, os, pickle, time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from audio_io import EXT_FOR_CONTAINER, AudioDecodeError, have_ffmpeg, iter_audio_files, probe, read_audio
+from compact_audio import trim_silence
+from fsutil import atomic_write_bytes
+from vocab import VOCAB_INDEX, iter_cards, load_index, safe_filename
+
+CACHE_PATH = Path(__file__).resolve().parent / ".cache" / "recordings.pickle"
+CACHE_VERSION = 1
+
+SILENT_DB = -50.0        # peak below this: nothing audible
+CLIP_LEVEL = 0.999       # |sample| at or above this counts as clipped
+CLIP_RATIO = 0.001       # share of clipped samples that flags a clip
+LONG_SILENCE_MS = 1000   # leading or trailing silence longer than this
+
+
+# ---------- per-clip worker ----------
+
+def inspect(job) -> dict:
+    path, rel, can_decode = job
+    st = path.stat()
+    rec = {"file": rel, "size": st.st_size, "mtime": st.st_mtime_ns, "issues": []}
+    try:
+        info = probe(path)
+    except OSError as e:
+        rec["issues"].append("undecodable")
+        rec["error"] = str(e)
+        return rec
+    rec.update({k: info[k] for k in ("container", "codec", "sample_rate", "channels", "bitrate") if k in info})
+    rec["duration"] = round(info.get("duration", 0.0), 3)
+    if info.get("truncated"):
+        rec["issues"].append("truncated")
+    expected_ext = EXT_FOR_CONTAINER.get(info["container"])
+    if expected_ext and expected_ext != path.suffix.lower():
+        rec["issues"].append("ext-mismatch")
+    if info["container"] == "unknown":
+        rec["issues"].append("undecodable")
+        return rec
+    if info["container"] != "wav" and not can_decode:
+        return rec  # header fields only (no ffmpeg)
+
+    try:
+        x, sr = read_audio(path)
+    except (AudioDecodeError, OSError, ValueError, EOFError) as e:
+        rec["issues"].append("undecodable")
+        rec["error"] = str(e)[:200]
+        return rec
+    if not len(x):
+        rec["issues"].append("empty")
+        return rec
+    a = np.abs(x)
+    peak = float(a.max())
+    rms = float(np.sqrt(np.mean(np.square(x, dtype=np.float64))))
+    _, start, end = trim_silence(x, sr, pad_ms=0.0)
+    rec.update(peak_db=round(20 * np.log10(max(peak, 1e-9)), 2), rms_db=round(20 * np.log10(max(rms, 1e-9)), 2),
+               clipped=round(float(np.count_nonzero(a >= CLIP_LEVEL)) / len(x), 5),
+               lead_ms=round(1000 * start / sr), trail_ms=round(1000 * (len(x) - end) / sr))
+    rec.setdefault("sample_rate", sr)
+    if peak < 10 ** (SILENT_DB / 20):
+        rec["issues"].append("silent")
+    if rec["clipped"] >= CLIP_RATIO:
+        rec["issues"].append("clipping")
+    if max(rec["lead_ms"], rec["trail_ms"]) > LONG_SILENCE_MS:
+        rec["issues"].append("long-silence")
+    return rec
+
+# ---------- cache ----------
+
+def load_cache(path: Path) -> Dict[str, Dict[str, dict]]:
+    """{recordings root: {"<locale>/<file>": record}}"""
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        if data.get("version") == CACHE_VERSION:
+            return data["roots"]
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError):
+        pass
+    return {}
+
+def save_cache(path: Path, roots: Dict[str, Dict[str, dict]]) -> None:
+    atomic_write_bytes(path, pickle.dumps({"version": CACHE_VERSION, "roots": roots}, protocol=pickle.HIGHEST_PROTOCOL))
+
+# ---------- scan + cross-reference ----------
+
+def scan(root: Path, locales: List[str], jobs: int, use_cache: bool = True):
+    """→ ({"<locale>/<file>": record}, number of clips probed this run)."""
+    roots = load_cache(CACHE_PATH) if use_cache else {}
+    cache = roots.get(str(root.resolve()), {})
+    can_decode = have_ffmpeg()
+    clips, todo = {}, []
+    for loc in locales:
+        for p in iter_audio_files(root / loc, recursive=False):
+            rel = f"{loc}/{p.name}"
+            st = p.stat()
+            prev = cache.get(rel)
+            # a header-only record is refreshed once ffmpeg becomes available
+            if prev and prev["size"] == st.st_size and prev["mtime"] == st.st_mtime_ns \
+                    and (prev.get("decoded") or not can_decode):
+                clips[rel] = prev
+            else:
+                todo.append((p, rel, can_decode))
+    if todo:
+        with ProcessPoolExecutor(max_workers=max(1, min(jobs, len(todo)))) as pool:
+            for rec in pool.map(inspect, todo, chunksize=16):
+                rec["decoded"] = "peak_db" in rec or "undecodable" in rec["issues"] or "empty" in rec["issues"]
+                clips[rec["file"]] = rec
+    if use_cache:
+        # keep other locales' entries, drop clips that no longer exist
+        merged = {k: v for k, v in cache.items() if k.split("/", 1)[0] not in locales}
+        merged.update(clips)
+        if todo or len(merged) != len(cache):
+            roots[str(root.resolve())] = merged
+            save_cache(CACHE_PATH, roots)
+    # odd-rate: the locale's most common rate is its reference
+    for loc in locales:
+        rates = Counter(r.get("sample_rate") for k, r in clips.items() if k.startswith(loc + "/") and r.get("sample_rate"))
+        if len(rates) > 1:
+            usual = rates.most_common(1)[0][0]
+            for k, r in clips.items():
+                if k.startswith(loc + "/") and r.get("sample_rate") not in (None, usual) and "odd-rate" not in r["issues"]:
+                    r["issues"] = r["issues"] + ["odd-rate"]
+    return clips, len(todo)
+
+def cross_reference(clips: Dict[str, dict], index_path, locales: List[str]):
+    """
+    → ({deck filename: [missing "<locale>/<hanzi>.wav"]}, [orphaned "<locale>/<file>"]) for the given locales.
+    Only the file speech.js getAudioUrl() requests, <locale>/<hanzi>.wav, covers a card. Other files of the word
+    (a compacted .mp3, a safe_filename() name from make_tts_from_csv.py) are orphans, named in the missing entry.
+    """
+    by_stem: Dict[str, List[str]] = {}
+    for k in clips:
+        by_stem.setdefault(k.rsplit(".", 1)[0], []).append(k)
+    wanted, missing = set(), {}
+    for deck in load_index(index_path):
+        if not deck.path.exists():
+            continue
+        for c in iter_cards(deck.path):
+            loc = c.locale or deck.locale
+            if loc not in locales:
+                continue
+            name = f"{loc}/{c.hanzi}.wav"
+            wanted.add(name)
+            if name in clips:
+                continue
+            others = sorted(set(by_stem.get(f"{loc}/{c.hanzi}", []) + by_stem.get(f"{loc}/{safe_filename(c.hanzi)}", [])))
+            found = f" (found {', '.join(k.split('/', 1)[1] for k in others)})" if others else ""
+            missing.setdefault(deck.filename, []).append(name + found)
+    orphans = sorted(k for k in clips if k not in wanted)
+    return missing, orphans
+
+def main():
+    ap = argparse.ArgumentParser(description="Probe every recording and cross-reference it with the vocabulary.")
+    ap.add_argument("--recordings", default=os.path.join("data", "recordings"), help="Recordings root")
+    ap.add_argument("--index", default=str(VOCAB_INDEX), help="Deck index (default: data/vocab.csv)")
+    ap.add_argument("--locale", action="append", help="Only these locales (repeatable; default: all)")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes (default: all cores)")
+    ap.add_argument("--no-cache", action="store_true", help="Probe every clip again")
+    ap.add_argument("--list", action="store_true", help="List every clip with issues, every missing and orphaned clip")
+    ap.add_argument("--json", help="Write the full index (clips, missing, orphans) to this file")
+    ap.add_argument("--strict", action="store_true", help="Exit 1 if any clip has an issue or any card lacks audio")
+    args = ap.parse_args()
+
+    root = Path(args.recordings)
+    locales = args.locale or sorted(p.name for p in root.iterdir() if p.is_dir() and not p.name.startswith("."))
+    t0 = time.perf_counter()
+    clips, probed = scan(root, locales, args.jobs, not args.no_cache)
+    missing, orphans = cross_reference(clips, args.index, locales)
+    dt = time.perf_counter() - t0
+
+    print(f"[INDEX] {len(clips)} clips in {root} ({probed} probed, {len(clips) - probed} cached) in {dt * 1000:.0f} ms"
+          f"   ffmpeg: {'yes' if have_ffmpeg() else 'no (MP3 clips: headers only)'}")
+    for loc in locales:
+        recs = [r for k, r in clips.items() if k.startswith(loc + "/")]
+        if not recs:
+            continue
+        kinds = Counter(f"{r.get('container', '?')}/{r.get('sample_rate', '?')}" for r in recs)
+        issues = Counter(i for r in recs for i in r["issues"])
+        dur = sum(r.get("duration", 0.0) for r in recs)
+        n_missing = sum(1 for names in missing.values() for n in names if n.startswith(loc + "/"))
+        n_orphans = sum(1 for k in orphans if k.startswith(loc + "/"))
+        print(f"[INDEX] {loc:<8}{len(recs):>6} clips {dur / 60:>6.1f} min   "
+              f"{', '.join(f'{k}={v}' for k, v in sorted(kinds.items()))}")
+        print(f"[INDEX] {'':<8}issues: {', '.join(f'{k}={v}' for k, v in sorted(issues.items())) or 'none'}   "
+              f"missing: {n_missing}   orphaned: {n_orphans}")
+
+    if args.list:
+        for k in sorted(clips):
+            r = clips[k]
+            if r["issues"]:
+                print(f"  ISSUE   {k}: {', '.join(r['issues'])}{'  (' + r['error'] + ')' if r.get('error') else ''}")
+        for deck, names in sorted(missing.items()):
+            for n in names:
+                print(f"  MISSING {deck}: {n}")
+        for k in orphans:
+            print(f"  ORPHAN  {k}")
+
+    if args.json:
+        out = {"version": 1, "root": str(root), "locales": locales, "clips": clips, "missing": missing, "orphans": orphans}
+        atomic_write_bytes(Path(args.json), json.dumps(out, ensure_ascii=False, indent=1, sort_keys=True).encode("utf-8"))
+        print(f"[INDEX] Wrote {args.json}")
+
+    if args.strict and (any(r["issues"] for r in clips.values()) or missing):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,22 @@
 #!/usr/bin/env python3
-import argparse, csv, os, sys, time, re, json
+import argparse, os, sys, time, json, tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 import requests
 
+from tts_cache import MANIFEST_NAME, Manifest, SynthesisCache, cache_key
+from tts_engine import TokenBucket, make_session, post_with_retry, run_bounded
+from tts_journal import Journal, completed, in_shard, journal_name, parse_shard
+from tts_metrics import ProgressLine, RunMetrics
+from audio_io import encode_wav_pcm16, probe, read_audio
+from splitter import SplitError, split_on_silence
+from vocab import iter_rows, safe_filename
+
 # ---- Config defaults ----
 DEFAULT_MODEL = "gpt-4o-mini-tts"   # or "tts-1"
 DEFAULT_VOICE = "alloy"
-OPENAI_TTS_URL = "https://api.openai.com/v1/audio/speech"
+AUDIO_FORMAT = "wav"
+OPENAI_TTS_URL = os.getenv("OPENAI_TTS_URL", "https://api.openai.com/v1/audio/speech")
 
 # ---- Default teaching/flashcard prompt ----
 INSTRUCTIONS_DEFAULT = (
@@ -68,26 +77,6 @@ INSTRUCTIONS_DEFAULT = (
     "Pauses: Brief pauses after the snippet if necessary, highlighting that the unit is complete and self-contained."
 )
 
-def detect_delimiter(sample: str) -> str:
-    return "," if sample.count(",") >= sample.count("\t") else "\t"
-
-def safe_filename(name: str) -> str:
-    name = name.strip()
-    name = re.sub(r"[\\/:*?\"<>|]", "_", name)
-    name = re.sub(r"\s+", " ", name).strip()
-    return name or "untitled"
-
-def read_rows(csv_path: Path):
-    text = csv_path.read_text(encoding="utf-8-sig")
-    delim = detect_delimiter(text.splitlines()[0] if text else ",")
-    reader = csv.reader(text.splitlines(), delimiter=delim)
-    rows = list(reader)
-    if rows and len(rows[0]) >= 3:
-        header = [c.lower() for c in rows[0][:3]]
-        if "chinese" in header[0] and "pinyin" in header[1] and "english" in header[2]:
-            rows = rows[1:]
-    return [r for r in rows if len(r) >= 3 and (r[0].strip() or r[1].strip())]
-
 def build_tts_input(hanzi: str, pinyin: str, before: str, after: str) -> str:
     # We will still feed only Hanzi to the TTS "input" for clean audio.
     core = hanzi if hanzi else pinyin
@@ -103,24 +92,68 @@ def build_instructions_with_pinyin_hint(pinyin: str | None, base: str, enabled:
                 'Pronounce only the Chinese word; do not voice the romanization.')
     return base
 
-def synthesize_wav(api_key: str, text: str, model: str, voice: str, instructions: str) -> bytes:
+def build_batch_instructions(base: str, count: int) -> str:
+    # One item per input line; the pauses are what splitter.py cuts on
+    return (base.rstrip() +
+            f"\n\nBATCH NOTE (do not read aloud): The input is a list of {count} separate items, one per line. "
+            "Read each item exactly once, in order, as its own complete snippet, "
+            "with a clear pause of about one second of silence between items. Do not read any numbering or punctuation.")
+
+def _speech_request(api_key: str, text: str, model: str, voice: str, instructions: str, *,
+                    session, url, limiter, retries, stream: bool, hook=None) -> requests.Response:
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
     payload = {
         "model": model,
         "voice": voice,
         "input": text,
-        "format": "wav",
+        "response_format": AUDIO_FORMAT,  # the API defaults to MP3
         "instructions": instructions or INSTRUCTIONS_DEFAULT,
     }
-    r = requests.post(OPENAI_TTS_URL, headers=headers, data=json.dumps(payload), timeout=90)
-    if r.status_code != 200:
-        raise RuntimeError(f"TTS failed ({r.status_code}): {r.text[:300]}...")
+    return post_with_retry(session or requests, url, headers=headers, data=json.dumps(payload),
+                           timeout=90, limiter=limiter, retries=retries, stream=stream, hook=hook)
+
+def synthesize_wav(api_key: str, text: str, model: str, voice: str, instructions: str, *,
+                   session: requests.Session | None = None, url: str = OPENAI_TTS_URL,
+                   limiter: TokenBucket | None = None, retries: int = 0, hook=None) -> bytes:
+    r = _speech_request(api_key, text, model, voice, instructions, session=session, url=url,
+                        limiter=limiter, retries=retries, stream=False, hook=hook)
     return r.content
 
+def synthesize_to_file(dest: Path, api_key: str, text: str, model: str, voice: str, instructions: str, *,
+                       session: requests.Session | None = None, url: str = OPENAI_TTS_URL,
+                       limiter: TokenBucket | None = None, retries: int = 0, chunk_size: int = 64 * 1024,
+                       hook=None) -> int:
+    """Stream the audio into a temp file next to `dest`, then rename it into place. Returns bytes written."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.", suffix=".part")
+    written = 0
+    try:
+        with _speech_request(api_key, text, model, voice, instructions, session=session, url=url,
+                             limiter=limiter, retries=retries, stream=True, hook=hook) as r, os.fdopen(fd, "wb") as f:
+            for chunk in r.iter_content(chunk_size):
+                f.write(chunk)
+                written += len(chunk)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, dest)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return written
+
+def resolve_csv_path(name: str) -> Path:
+    csv_path = Path(name)
+    if csv_path.suffix.lower() != ".csv":
+        candidate1 = Path("data") / f"{csv_path.name}.csv"
+        candidate2 = Path(f"{csv_path.name}.csv")
+        if candidate1.exists(): csv_path = candidate1
+        elif candidate2.exists(): csv_path = candidate2
+        else: csv_path = Path(f"{csv_path}.csv")
+    return csv_path
+
 def main():
     load_dotenv()
     ap = argparse.ArgumentParser(description="Generate WAVs from HSK CSV via OpenAI TTS (with teaching prompt).")
-    ap.add_argument("csv", help="Path to CSV, e.g. data/hsk0.csv (or just 'hsk0' to auto-prepend .csv)")
+    ap.add_argument("csv", nargs="+", help="Path(s) to CSV, e.g. data/hsk0.csv (or just 'hsk0' to auto-prepend .csv)")
     ap.add_argument("--out", default="tts_out_wav", help="Output directory (default: tts_out_wav)")
     ap.add_argument("--model", default=DEFAULT_MODEL, help="OpenAI TTS model (e.g., gpt-4o-mini-tts, tts-1)")
     ap.add_argument("--voice", default=DEFAULT_VOICE, help="OpenAI TTS voice (e.g., alloy, verse, onyx...)")
@@ -130,24 +163,35 @@ def main():
     ap.add_argument("--instructions", help="Inline instructions override (short text)")
     ap.add_argument("--pinyin-hint", action="store_true", help="Append non-spoken Pinyin hint to instructions")
     ap.add_argument("--limit", type=int, default=0, help="Only process first N rows (0 = all)")
-    ap.add_argument("--skip-existing", action="store_true", help="Skip files that already exist")
-    ap.add_argument("--sleep", type=float, default=0.3, help="Sleep seconds between calls (default 0.3)")
+    ap.add_argument("--skip-existing", action="store_true", help="Skip files that already exist (even if their inputs changed)")
+    ap.add_argument("--cache-dir", help="Content-addressed audio cache (default: <out>/.tts_cache); share it between output dirs")
+    ap.add_argument("--force", action="store_true", help="Ignore manifest and cache; synthesize every row again")
+    ap.add_argument("--workers", type=int, default=1, help="Requests in flight at once (default 1 = serial)")
+    ap.add_argument("--rate", type=float, default=None, help="Max requests per second across all workers (0 = unlimited; default 1/--sleep)")
+    ap.add_argument("--sleep", type=float, default=0.3, help="Legacy pacing: same as --rate 1/SLEEP (default 0.3)")
+    ap.add_argument("--retries", type=int, default=4, help="Retries per row on 429/5xx/connection errors (default 4)")
+    ap.add_argument("--url", default=OPENAI_TTS_URL, help="Speech endpoint (e.g. a local fake_tts_server.py)")
+    ap.add_argument("--resume", action="store_true", help="Skip rows the job journal records as done (even if the manifest was not saved)")
+    ap.add_argument("--shard", help="Only process shard i/N (0 <= i < N) of the rows; shards never overlap")
+    ap.add_argument("--progress", action="store_true", help="Show a live progress line with ETA instead of one line per row")
+    ap.add_argument("--batch", type=int, default=1, help="Words per request: read K words with pauses in one call and split "
+                    "the audio on silence (default 1 = off; falls back to single requests if a split fails)")
+    ap.add_argument("--price", type=float, help="USD per unit for the cost estimate (per 1 char for tts-1*, per audio minute otherwise)")
     args = ap.parse_args()
 
+    try:
+        shard = parse_shard(args.shard)
+    except ValueError as e:
+        sys.exit(f"ERROR: {e}")
+
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         sys.exit("ERROR: OPENAI_API_KEY not set (env or .env).")
 
-    # Resolve CSV path
-    csv_path = Path(args.csv)
-    if csv_path.suffix.lower() != ".csv":
-        candidate1 = Path("data") / f"{csv_path.name}.csv"
-        candidate2 = Path(f"{csv_path.name}.csv")
-        if candidate1.exists(): csv_path = candidate1
-        elif candidate2.exists(): csv_path = candidate2
-        else: csv_path = Path(f"{csv_path}.csv")
-    if not csv_path.exists():
-        sys.exit(f"ERROR: CSV file not found: {csv_path}")
+    csv_paths = [resolve_csv_path(c) for c in args.csv]
+    for csv_path in csv_paths:
+        if not csv_path.exists():
+            sys.exit(f"ERROR: CSV file not found: {csv_path}")
 
     out_dir = Path(args.out); out_dir.mkdir(parents=True, exist_ok=True)
 
@@ -166,51 +210,229 @@ def main():
     else:
         base_instructions = INSTRUCTIONS_DEFAULT
 
-    rows = read_rows(csv_path)
-    if not rows:
-        sys.exit("No valid rows found (need at least 3 columns: Chinese, Pinyin, English).")
-
-    total = len(rows) if args.limit <= 0 else min(args.limit, len(rows))
-    print(f"[TTS] Input: {csv_path}   Rows: {len(rows)}   Will process: {total}")
     print(f"[TTS] Model: {args.model}   Voice: {args.voice}   Out: {out_dir.resolve()}")
     print(f"[TTS] Using instructions: {'inline' if args.instructions else ('file' if args.instructions_file else 'default')}, Pinyin hint: {args.pinyin_hint}")
 
-    processed = 0
-    for i, r in enumerate(rows):
-        if processed >= total: break
-        hanzi, pinyin, english = (r[0].strip(), r[1].strip(), r[2].strip())
-        if not (hanzi or pinyin): continue
+    # Build the work list first; the pool then keeps at most --workers requests in flight.
+    # job = (label, text_for_audio, instructions, out_path, cache key)
+    jobs = []
+    for csv_path in csv_paths:
+        rows = [r for r in iter_rows(csv_path) if r.hanzi or r.pinyin]
+        if not rows:
+            print(f"[TTS] WARN: no valid rows in {csv_path} (columns: Chinese, Pinyin, English).")
+            continue
+        total = len(rows) if args.limit <= 0 else min(args.limit, len(rows))
+        print(f"[TTS] Input: {csv_path}   Rows: {len(rows)}   Will process: {total}")
+        n = 0
+        for r in rows:
+            if n >= total: break
+            hanzi, pinyin = r.hanzi, r.pinyin
+            n += 1
+
+            base = safe_filename(hanzi if hanzi else pinyin)
+            out_path = out_dir / f"{base}__{args.voice}__{args.model}.wav"
 
-        base = safe_filename(hanzi if hanzi else pinyin)
-        out_path = out_dir / f"{base}__{args.voice}__{args.model}.wav"
+            # Audio input: Hanzi only (clean output), unless --before/--after wrap it
+            text_for_audio = build_tts_input(hanzi, pinyin, args.before, args.after)
+
+            # Instructions: base + optional Pinyin hint (not to be spoken)
+            instructions_text = build_instructions_with_pinyin_hint(pinyin, base_instructions, args.pinyin_hint)
+            if len(jobs) < 5:
+                print(f"[TTS] Instructions: {instructions_text}")
+                print(f"[TTS] Text for audio: {text_for_audio}")
+            # Batch clips are read as list items, so they get their own keys and never stand in for single takes
+            batch = build_batch_instructions(instructions_text, args.batch) if args.batch > 1 and "\n" not in text_for_audio else ""
+            key = cache_key(text_for_audio, args.model, args.voice, instructions_text or INSTRUCTIONS_DEFAULT, AUDIO_FORMAT, batch)
+            jobs.append((f"{csv_path.stem}:{r.line}", text_for_audio, instructions_text, out_path, key))
+    if not jobs:
+        sys.exit("No valid rows found (need at least 3 columns: Chinese, Pinyin, English).")
+    if shard:
+        jobs = [job for job in jobs if in_shard(job[4], shard)]
+        print(f"[TTS] Shard {shard[0]}/{shard[1]}: {len(jobs)} row(s)")
+
+    journal_path = out_dir / journal_name(shard)
+    metrics_stem = "metrics" if not shard else f"metrics.shard-{shard[0]}-of-{shard[1]}"
+    done = completed(sorted(out_dir.glob("journal*.jsonl"))) if args.resume else {}
+    if args.resume:
+        print(f"[TTS] Resume: {len(done)} completed row(s) in journal")
+
+    # Classify every row: fresh (manifest key matches), cache hit (relink), or miss.
+    # Misses are grouped by key so a word shared by several CSVs is synthesized once.
+    cache = SynthesisCache(Path(args.cache_dir) if args.cache_dir else out_dir / ".tts_cache", AUDIO_FORMAT)
+    manifest = Manifest(out_dir / MANIFEST_NAME)
+    cache.sweep_partials()
+    stats = {"fresh": 0, "cached": 0, "skipped": 0, "miss": 0, "dup": 0}
+    metrics = RunMetrics(args.model, args.voice, args.workers, price=args.price)
+    misses: dict = {}
+    for job in jobs:
+        label, text_for_audio, _, out_path, key = job
         if args.skip_existing and out_path.exists():
-            print(f"  [{i+1:>4}] SKIP (exists): {out_path.name}")
-            processed += 1; continue
+            print(f"  [{label:>10}] SKIP (exists): {out_path.name}")
+            stats["skipped"] += 1; continue
+        if not args.force:
+            if manifest.is_fresh(out_path, key):
+                stats["fresh"] += 1; continue
+            if (out_path.name, key) in done and out_path.exists():
+                manifest.record(out_path, key, text_for_audio)
+                stats["fresh"] += 1; continue
+            if cache.has(key):
+                cache.materialize(key, out_path)
+                manifest.record(out_path, key, text_for_audio)
+                print(f"  [{label:>10}] CACHE -> {out_path.name}")
+                stats["cached"] += 1; continue
+        if key in misses:
+            misses[key].append(job)
+            stats["dup"] += 1
+        else:
+            misses[key] = [job]
+            stats["miss"] += 1
+    metrics.total_rows = stats["miss"]
+    for kind in ("fresh", "cached", "skipped", "dup"):
+        metrics.count(kind, stats[kind])
+    print(f"[TTS] Rows: {len(jobs)}   Up to date: {stats['fresh']}   From cache: {stats['cached']}   "
+          f"Skipped: {stats['skipped']}   To synthesize: {stats['miss']} (+{stats['dup']} duplicate rows)")
 
-        # Audio input: ONLY Hanzi (clean output)
-        text_for_audio = hanzi if hanzi else pinyin
+    rate = args.rate if args.rate is not None else (1.0 / args.sleep if args.sleep > 0 else 0.0)
+    limiter = TokenBucket(rate, capacity=max(1, args.workers))
+    session = make_session(args.workers)
+    if misses:
+        print(f"[TTS] Workers: {args.workers}   Rate limit: {f'{rate:g}/s' if rate > 0 else 'none'}   Retries: {args.retries}   URL: {args.url}")
 
-        # Instructions: base + optional Pinyin hint (not to be spoken)
-        instructions_text = build_instructions_with_pinyin_hint(pinyin, base_instructions, args.pinyin_hint)
-        if (i < 5):
-            print(f"[TTS] Instructions: {instructions_text}")
-            print(f"[TTS] Text for audio: {text_for_audio}")
+    def work_one(group):
+        _, text_for_audio, instructions_text, _, key = group[0]
+        t = time.perf_counter()
+        nbytes = synthesize_to_file(cache.path_for(key), api_key, text_for_audio, args.model, args.voice, instructions_text,
+                                    session=session, url=args.url, limiter=limiter, retries=args.retries, hook=metrics)
+        t_disk = time.perf_counter()
+        for _, _, _, out_path, _ in group:
+            cache.materialize(key, out_path)
+        t_end = time.perf_counter()
+        try:
+            audio_s = probe(cache.path_for(key)).get("duration", 0.0)
+        except (OSError, ValueError):
+            audio_s = 0.0
+        metrics.row_ok(t_end - t, t_end - t_disk, nbytes, audio_s, len(text_for_audio))
+        return t_end - t, nbytes
 
+    def work_batch(unit):
+        """One request for all groups of the unit; each cut-out clip is cached under its word's batch key."""
+        texts = [group[0][1] for group in unit]
+        text, instructions_text = "\n".join(texts), build_batch_instructions(unit[0][0][2], len(unit))
+        tmp = cache.root / "batch" / f"{cache_key(text, args.model, args.voice, instructions_text, AUDIO_FORMAT)}.wav"
+        t = time.perf_counter()
         try:
-            audio = synthesize_wav(api_key, text_for_audio, args.model, args.voice, instructions_text)
-            out_path.write_bytes(audio)
-            print(f"  [{i+1:>4}] OK  -> {out_path.name}")
-            processed += 1
-            if args.sleep > 0: time.sleep(args.sleep)
-        except Exception as e:
-            print(f"  [{i+1:>4}] FAIL: {e}")
+            synthesize_to_file(tmp, api_key, text, args.model, args.voice, instructions_text, session=session,
+                               url=args.url, limiter=limiter, retries=args.retries, hook=metrics)
+            x, sr = read_audio(tmp)
+        finally:
+            tmp.unlink(missing_ok=True)
+        spans = split_on_silence(x, sr, len(unit))
+        if spans is None:
+            raise SplitError(f"audio of {len(unit)} words did not split cleanly")
+        t_disk = time.perf_counter()
+        share = (t_disk - t) / len(unit)
+        results = []
+        for group, (a, b) in zip(unit, spans):
+            key = group[0][4]
+            t_row = time.perf_counter()
+            data = encode_wav_pcm16(x[a:b], sr)
+            cache.put(key, data)
+            for _, _, _, out_path, _ in group:
+                cache.materialize(key, out_path)
+            disk = time.perf_counter() - t_row
+            metrics.row_ok(share + disk, disk, len(data), (b - a) / sr, len(group[0][1]))
+            results.append((share + disk, len(data)))
+        metrics.count("batched", len(unit))
+        return results
+
+    def work(unit):
+        """→ [(group, result, error)] for each group of the unit."""
+        if len(unit) > 1:
+            try:
+                return [(group, res, None) for group, res in zip(unit, work_batch(unit))]
+            except Exception as e:
+                metrics.count("fallback", len(unit))
+                print(f"  [{unit[0][0][0]:>10}] BATCH of {len(unit)} failed ({e}); retrying word by word")
+        out = []
+        for group in unit:
+            try:
+                out.append((group, work_one(group), None))
+            except Exception as e:
+                out.append((group, None, e))
+        return out
+
+    # Units of work: single groups, or up to --batch consecutive groups sharing the same instructions
+    # (so a per-row --pinyin-hint effectively disables batching) whose text fits on one line.
+    units = []
+    for group in misses.values():
+        _, text_for_audio, instructions_text, _, _ = group[0]
+        last = units[-1] if units else None
+        if (args.batch > 1 and last and len(last) < args.batch and "\n" not in text_for_audio
+                and "\n" not in last[0][0][1] and last[0][0][2] == instructions_text):
+            last.append(group)
+        else:
+            units.append([group])
+    if args.batch > 1 and misses:
+        print(f"[TTS] Batching: {len(misses)} word(s) in {len(units)} request(s) (up to {args.batch} per request)")
+
+    def report(group, res, err):
+        nonlocal generated, failed
+        label, text_for_audio, _, out_path, key = group[0]
+        extra = f" (+{len(group) - 1} dup)" if len(group) > 1 else ""
+        if err is None:
+            latency, nbytes = res
+            for row, _, _, p, _ in group:
+                manifest.record(p, key, text_for_audio)
+                journal.write(row=row, out=p.name, key=key, status="ok",
+                              latency=round(latency, 3), bytes=nbytes)
+            if not progress:
+                print(f"  [{label:>10}] OK  -> {out_path.name}{extra}  ({latency:.2f}s, {nbytes} B)")
+            generated += 1
+        else:
+            for row, _, _, p, _ in group:
+                journal.write(row=row, out=p.name, key=key, status="fail", error=str(err)[:300])
+            metrics.row_failed(err)
+            print(f"{chr(10) if progress and progress.tty else ''}  [{label:>10}] FAIL: {err}")
+            failed += 1
+        if progress:
+            progress.update()
+
+    t0 = time.perf_counter()
+    generated = failed = 0
+    progress = ProgressLine(metrics) if args.progress else None
+    try:
+        with session, Journal(journal_path) as journal:
+            for unit, results, err in run_bounded(units, work, args.workers):
+                for group, res, group_err in (results if err is None else [(g, None, err) for g in unit]):
+                    report(group, res, group_err)
+    finally:
+        if progress:
+            progress.close()
+        manifest.save()
+        if misses:
+            metrics.write(out_dir / f"{metrics_stem}.json", out_dir / f"{metrics_stem}.prom")
 
-    print(f"[TTS] Done. Generated {processed} WAV file(s).")
+    print(f"[TTS] Done. Synthesized {generated} clip(s), {failed} failed, in {time.perf_counter() - t0:.1f}s.   "
+          f"Cache hits: {stats['fresh'] + stats['cached']}   Misses: {stats['miss']}   Deduplicated: {stats['dup']}")
+    if misses:
+        s = metrics.summary()
+        lat, cost = s["latency"], s["cost_estimate"]
+        print(f"[TTS] Latency p50/p95/p99: request {lat['request'].get('p50', 0):.2f}/{lat['request'].get('p95', 0):.2f}/"
+              f"{lat['request'].get('p99', 0):.2f}s  row {lat['row'].get('p50', 0):.2f}/{lat['row'].get('p95', 0):.2f}/"
+              f"{lat['row'].get('p99', 0):.2f}s   Retries: {s['requests']['retries']}   "
+              f"Throttled: {s['requests']['throttle_seconds']:.1f}s   Errors: {s['errors'] or 'none'}")
+        usd = f"${cost['usd']:.4f}" if cost["usd"] is not None else "n/a (unknown model, use --price)"
+        print(f"[TTS] Produced {s['bytes'] / 1e6:.2f} MB, {s['audio_seconds']:.1f}s audio   Est. cost: {usd}   "
+              f"Metrics: {out_dir / metrics_stem}.json / .prom")
 
 # Example:
 # python dev_tools/make_tts_from_csv.py dev_tools/chinese_dev.csv --out dev_tools/audio_chinese_dev_with_laobeijing --model gpt-4o-mini-tts --voice alloy 
 # python dev_tools/make_tts_from_csv.py data/eng_oliver.csv --out dev_tools/audio_eng_oliver --model gpt-4o-mini-tts --voice alloy 
 # python dev_tools/make_tts_from_csv.py data/hsk1.csv --out dev_tools/audio_chinese_hsk1_wo_pinyin --model gpt-4o-mini-tts --voice alloy 
+# python dev_tools/make_tts_from_csv.py data/hsk6.csv --out dev_tools/audio_chinese_hsk6 --workers 8 --rate 5 --skip-existing
+# python dev_tools/make_tts_from_csv.py data/hsk1.csv data/hsk2.csv data/hsk3.csv --out dev_tools/audio_chinese_hsk --workers 8
+# python dev_tools/make_tts_from_csv.py data/hsk6.csv --out dev_tools/audio_chinese_hsk6 --workers 4 --shard 0/2 --resume   # and --shard 1/2 elsewhere
+# python dev_tools/make_tts_from_csv.py data/hsk1.csv --out dev_tools/audio_chinese_hsk1 --workers 4 --batch 8
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
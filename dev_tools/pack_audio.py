@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Pack each deck's recordings into one archive, so the app can prefetch a deck with one request or fetch
+single clips with HTTP byte ranges instead of one request per word.
+
+For every deck in data/vocab.csv, the clips its cards would play (data/recordings/<locale>/<hanzi>.wav, in
+CSV order, each file once) are concatenated unchanged into data/packs/<deck>.audiopack, so every slice is a
+complete, decodable file. Next to it, <deck>.audiopack.json holds the offset index:
+
+    {"version": 1, "deck", "locale", "pack", "size", "hash",
+     "clips": [[offset, length, "<locale>/<hanzi>"], ...],     # byte range of each clip in the pack
+     "cards": {"<card id>": clip number, ...},                   # card ids as computed by the app
+     "sources": "<digest of clip names, sizes and mtimes>"}
+
+data/packs/index.json lists all packs ({"version", "packs": {deck filename: {"index", "pack", "size", "clips", "hash"}}}).
+A pack is rebuilt only when its source clips changed. `AudioPack` reads packs memory-mapped for the tooling.
+
+    python dev_tools/pack_audio.py                  # all decks
+    python dev_tools/pack_audio.py hsk5.csv --verify
+"""
+import argparse, hashlib, json, mmap, os, sys, time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from fsutil import atomic_open, atomic_write_bytes
+from vocab import VOCAB_INDEX, iter_cards, load_index
+
+PACK_VERSION = 1
+PACK_EXT = ".audiopack"
+CATALOG_NAME = "index.json"
+
+
+class AudioPack:
+    """Memory-mapped view of a packed deck: clip bytes by card id or by '<locale>/<hanzi>'."""
+    def __init__(self, index_path: Path):
+        self.index_path = Path(index_path)
+        self.index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        self.by_name = {c[2]: i for i, c in enumerate(self.index["clips"])}
+        self._f = open(self.index_path.with_name(self.index["pack"]), "rb")
+        size = os.fstat(self._f.fileno()).st_size
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def clip(self, n: int) -> memoryview:
+        off, length, _ = self.index["clips"][n]
+        return memoryview(self._mm)[off: off + length]
+
+    def get(self, card_id: str) -> Optional[memoryview]:
+        n = self.index["cards"].get(card_id)
+        return None if n is None else self.clip(n)
+
+    def get_word(self, locale: str, hanzi: str) -> Optional[memoryview]:
+        n = self.by_name.get(f"{locale}/{hanzi}")
+        return None if n is None else self.clip(n)
+
+    def close(self) -> None:
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def collect(deck, rec_root: Path):
+    """→ (clip names in order, {name: path}, {card id: clip number}, cards without a recording)."""
+    names: List[str] = []
+    paths: Dict[str, Path] = {}
+    position: Dict[str, int] = {}
+    cards: Dict[str, int] = {}
+    missing = 0
+    for c in iter_cards(deck.path):
+        loc = c.locale or deck.locale
+        name = f"{loc}/{c.hanzi}"
+        if name not in position:
+            p = rec_root / loc / f"{c.hanzi}.wav"
+            if not p.is_file():
+                missing += 1
+                continue
+            position[name] = len(names)
+            paths[name] = p
+            names.append(name)
+        cards[c.id] = position[name]
+    return names, paths, cards, missing
+
+def sources_digest(names: List[str], paths: Dict[str, Path]) -> str:
+    h = hashlib.sha256()
+    for name in names:
+        st = paths[name].stat()
+        h.update(f"{name}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+    return h.hexdigest()[:16]
+
+def build_pack(deck, rec_root: Path, out_dir: Path, force: bool = False) -> dict:
+    stem = Path(deck.filename).stem
+    pack_path, index_path = out_dir / f"{stem}{PACK_EXT}", out_dir / f"{stem}{PACK_EXT}.json"
+    names, paths, cards, missing = collect(deck, rec_root)
+    digest = sources_digest(names, paths)
+    if not force and index_path.exists() and pack_path.exists():
+        try:
+            old = json.loads(index_path.read_text(encoding="utf-8"))
+            if old.get("version") == PACK_VERSION and old.get("sources") == digest and old.get("cards") == cards \
+                    and pack_path.stat().st_size == old.get("size"):
+                return dict(old, _status="up to date", _missing=missing)
+        except ValueError:
+            pass
+
+    clips, offset, h = [], 0, hashlib.sha256()
+    with atomic_open(pack_path) as f:
+        for name in names:
+            data = paths[name].read_bytes()
+            f.write(data)
+            h.update(data)
+            clips.append([offset, len(data), name])
+            offset += len(data)
+    index = {"version": PACK_VERSION, "deck": deck.filename, "locale": deck.locale, "pack": pack_path.name,
+             "size": offset, "hash": h.hexdigest()[:16], "clips": clips, "cards": cards, "sources": digest}
+    atomic_write_bytes(index_path, json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    return dict(index, _status="built", _missing=missing)
+
+def verify(index_path: Path, rec_root: Path) -> int:
+    """Compare every clip in the pack with its source file; returns the number of mismatches."""
+    bad = 0
+    with AudioPack(index_path) as pack:
+        for n, (_, _, name) in enumerate(pack.index["clips"]):
+            loc, hanzi = name.split("/", 1)
+            src = rec_root / loc / f"{hanzi}.wav"
+            if not src.exists() or src.read_bytes() != bytes(pack.clip(n)):
+                bad += 1
+                print(f"[PACK]   MISMATCH {name}")
+    return bad
+
+def update_packs(decks, rec_root: Path, out_dir: Path, force: bool = False, check: bool = False) -> int:
+    """Build the given decks' packs and update the catalog (other decks' entries are kept); → mismatching clips."""
+    catalog_path = out_dir / CATALOG_NAME
+    try:
+        catalog = json.loads(catalog_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        catalog = {"version": PACK_VERSION, "packs": {}}
+    t0, failures = time.perf_counter(), 0
+    for deck in decks:
+        if not deck.path.exists():
+            print(f"[PACK] WARN: {deck.filename} is listed but missing")
+            continue
+        info = build_pack(deck, rec_root, out_dir, force)
+        stem = Path(deck.filename).stem
+        if not info["clips"]:
+            catalog["packs"].pop(deck.filename, None)
+            (out_dir / f"{stem}{PACK_EXT}").unlink(missing_ok=True)
+            (out_dir / f"{stem}{PACK_EXT}.json").unlink(missing_ok=True)
+            print(f"[PACK] {deck.filename}: no recordings, skipped")
+            continue
+        catalog["packs"][deck.filename] = {"index": f"{stem}{PACK_EXT}.json", "pack": info["pack"],
+                                           "size": info["size"], "clips": len(info["clips"]), "hash": info["hash"]}
+        print(f"[PACK] {deck.filename}: {len(info['clips'])} clips, {info['size'] / 1e6:.1f} MB, "
+              f"{len(info['cards'])} cards ({info['_missing']} without audio) — {info['_status']}")
+        if check:
+            failures += verify(out_dir / f"{stem}{PACK_EXT}.json", rec_root)
+    atomic_write_bytes(catalog_path, json.dumps(catalog, ensure_ascii=False, indent=1, sort_keys=True).encode("utf-8"))
+    print(f"[PACK] {len(catalog['packs'])} packs in {out_dir} ({time.perf_counter() - t0:.1f}s)")
+    return failures
+
+def main():
+    ap = argparse.ArgumentParser(description="Pack each deck's recordings into one archive with an offset index.")
+    ap.add_argument("decks", nargs="*", help="Deck file names from the index, e.g. hsk5.csv (default: all)")
+    ap.add_argument("--index", default=str(VOCAB_INDEX), help="Deck index (default: data/vocab.csv)")
+    ap.add_argument("--recordings", default=os.path.join("data", "recordings"), help="Recordings root")
+    ap.add_argument("--out", default=os.path.join("data", "packs"), help="Output directory (default: data/packs)")
+    ap.add_argument("--force", action="store_true", help="Rebuild packs even if their clips did not change")
+    ap.add_argument("--verify", action="store_true", help="Read every clip back (memory-mapped) and compare with its source")
+    args = ap.parse_args()
+
+    rec_root, out_dir = Path(args.recordings), Path(args.out)
+    decks = load_index(args.index)
+    if args.decks:
+        unknown = set(args.decks) - {d.filename for d in decks}
+        if unknown:
+            sys.exit(f"ERROR: not in {args.index}: {', '.join(sorted(unknown))}")
+        decks = [d for d in decks if d.filename in args.decks]
+
+    failures = update_packs(decks, rec_root, out_dir, args.force, args.verify)
+    if args.verify:
+        print(f"[PACK] Verify: {'OK' if not failures else f'{failures} mismatching clips'}")
+        raise SystemExit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Precompute pitch contours for all reference recordings, so the Tone Lab can draw them without client-side DSP.
+
+Walks data/recordings/<locale>/, runs the vectorized YIN tracker (pitch.py) in a process pool and writes one
+packed file per locale, data/recordings/<locale>.f0pack (build output, gitignored like data/packs):
+
+    b"F0PK" | uint32 LE json_len | JSON index (UTF-8, padded to 4 bytes) | float16 LE data
+
+Index: {"version", "hop_ms", "opts", "fields": ["f0", "voicing", "energy_db"], "clips": {word: {"file", "size", "mtime",
+"offset", "frames", "t0"}}}, where `opts` are the tracker settings the pack was computed with. A clip's data is `frames` values of each field, one field after another, starting at
+byte `offset` of the data section; frame i is at time t0 + i * hop_ms / 1000. f0 is 0 for unvoiced frames.
+Unchanged clips (same file, size and mtime) are copied from the previous pack instead of re-analysed, as long as the
+tracker settings are the same. When a word has several files (e.g. .wav and .mp3) the .wav is analysed, with a warning.
+
+    python dev_tools/precompute_pitch.py                    # all locales
+    python dev_tools/precompute_pitch.py --locale xx-COOL
+
+The tracker's accuracy on the generate_sinoid.py presets is checked by dev_tools/tests/test_precompute_pitch.py.
+"""
+import argparse, json, os, struct, time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+
+from audio_io import AudioDecodeError, iter_audio_files, read_audio
+from fsutil import atomic_write_bytes
+from pitch import DEFAULTS, yin
+
+MAGIC = b"F0PK"
+FIELDS = ("f0", "voicing", "energy_db")
+
+# ---------- pack format ----------
+
+def write_pack(path: Path, opts: dict, clips: Dict[str, Tuple[dict, np.ndarray]]) -> None:
+    """clips: word -> (meta, array of shape (3, frames))."""
+    index = {"version": 1, "hop_ms": opts["hop_ms"], "opts": opts, "fields": list(FIELDS), "clips": {}}
+    chunks, offset = [], 0
+    for word in sorted(clips):
+        meta, arr = clips[word]
+        blob = np.ascontiguousarray(arr, dtype="<f2").tobytes()
+        index["clips"][word] = dict(meta, offset=offset, frames=int(arr.shape[1]))
+        chunks.append(blob)
+        offset += len(blob)
+    head = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    head += b" " * (-len(head) % 4)
+    atomic_write_bytes(path, MAGIC + struct.pack("<I", len(head)) + head + b"".join(chunks))
+
+def read_pack(path: Path):
+    """→ (index, {word: array (3, frames) float16}); memory-mapped, arrays are views."""
+    raw = np.memmap(path, dtype=np.uint8, mode="r")
+    if bytes(raw[:4]) != MAGIC:
+        raise ValueError(f"{path}: not an f0pack file")
+    n = struct.unpack("<I", bytes(raw[4:8]))[0]
+    index = json.loads(bytes(raw[8:8 + n]).decode("utf-8"))
+    data = raw[8 + n:]
+    out = {}
+    for word, e in index["clips"].items():
+        k = e["frames"]
+        out[word] = data[e["offset"]: e["offset"] + 2 * 3 * k].view("<f2").reshape(3, k)
+    return index, out
+
+# ---------- analysis ----------
+
+def analyse(job):
+    path, opts = job
+    try:
+        x, sr = read_audio(path)
+    except (AudioDecodeError, OSError, ValueError) as e:
+        return path, None, str(e)
+    r = yin(x, sr, **opts)
+    arr = np.stack([r["f0"], r["voicing"], r["energy_db"]])
+    t0 = float(r["times"][0]) if len(r["times"]) else 0.0
+    return path, (round(t0, 5), arr), None
+
+def process_locale(loc_dir: Path, pack_path: Path, opts: dict, jobs: int, force: bool):
+    old_index, old_data = {"clips": {}}, {}
+    if pack_path.exists() and not force:
+        try:
+            old_index, old_data = read_pack(pack_path)
+            if old_index.get("opts") != opts:
+                old_index, old_data = {"clips": {}}, {}
+        except (ValueError, OSError):
+            pass
+
+    files: Dict[str, Path] = {}
+    for p in iter_audio_files(loc_dir, recursive=False):
+        other = files.get(p.stem)
+        if other is not None:
+            keep = min(other, p, key=lambda q: (q.suffix.lower() != ".wav", q.name))
+            print(f"[PITCH] WARN: {loc_dir.name}/{other.name} and {p.name} are the same word; using {keep.name}")
+            p = keep
+        files[p.stem] = p
+
+    clips, todo = {}, []
+    for p in files.values():
+        st = p.stat()
+        word = p.stem
+        meta = {"file": p.name, "size": st.st_size, "mtime": int(st.st_mtime)}
+        prev = old_index["clips"].get(word)
+        if prev and all(prev.get(k) == v for k, v in meta.items()):
+            clips[word] = (dict(meta, t0=prev["t0"]), np.array(old_data[word]))
+        else:
+            todo.append((p, meta))
+
+    failed = []
+    if todo:
+        with ProcessPoolExecutor(max_workers=max(1, jobs)) as pool:
+            metas = {p: m for p, m in todo}
+            for path, res, err in pool.map(analyse, [(p, opts) for p, _ in todo], chunksize=8):
+                if err:
+                    failed.append((path, err))
+                    continue
+                t0, arr = res
+                clips[path.stem] = (dict(metas[path], t0=t0), arr)
+    write_pack(pack_path, opts, clips)
+    return len(clips), len(todo) - len(failed), failed
+
+def main():
+    ap = argparse.ArgumentParser(description="Precompute F0/voicing/energy contours for reference recordings.")
+    ap.add_argument("--root", default=os.path.join("data", "recordings"), help="Recordings root (default: data/recordings)")
+    ap.add_argument("--locale", action="append", help="Only this locale (repeatable; default: all)")
+    ap.add_argument("--fmin", type=float, default=DEFAULTS["fmin"])
+    ap.add_argument("--fmax", type=float, default=DEFAULTS["fmax"])
+    ap.add_argument("--hop-ms", type=float, default=DEFAULTS["hop_ms"])
+    ap.add_argument("--threshold", type=float, default=DEFAULTS["threshold"], help="YIN aperiodicity threshold")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes (default: all cores)")
+    ap.add_argument("--force", action="store_true", help="Re-analyse every clip")
+    args = ap.parse_args()
+
+    opts = {"fmin": args.fmin, "fmax": args.fmax, "hop_ms": args.hop_ms, "threshold": args.threshold}
+    root = Path(args.root)
+    locales = args.locale or sorted(p.name for p in root.iterdir() if p.is_dir() and not p.name.startswith("."))
+    for loc in locales:
+        loc_dir = root / loc
+        if not loc_dir.is_dir():
+            print(f"[PITCH] WARN: no such locale dir {loc_dir}")
+            continue
+        t0 = time.perf_counter()
+        pack = root / f"{loc}.f0pack"
+        total, analysed, failed = process_locale(loc_dir, pack, opts, args.jobs, args.force)
+        print(f"[PITCH] {loc}: {total} clips in {pack} ({analysed} analysed, {total - analysed} reused, "
+              f"{len(failed)} failed) in {time.perf_counter() - t0:.1f}s")
+        for path, err in failed[:5]:
+            print(f"  FAIL {err}")
+        if len(failed) > 5:
+            print(f"  ... and {len(failed) - 5} more")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Local static server for the app (replaces `python3 -m http.server`).
+
+- threaded, HTTP/1.1 keep-alive; file bodies are sent with sendfile()
+- compression: an existing `<file>.br` / `<file>.gz` sidecar is served when the client accepts it; other text
+  files (csv, js, css, json, html, svg, md) are gzip'ed once and kept in memory until they change
+- strong ETags (content hash, per encoding) with If-None-Match / If-Modified-Since -> 304
+- single byte ranges (`Range`, `If-Range`) -> 206 / 416, for audio seeking and data/packs clip reads
+- `Cache-Control: immutable` for content-hashed assets (`?v=<hash>` or `name.<hex>.ext`), `no-cache` otherwise
+- request latency statistics: printed every --stats-every seconds and on exit, JSON at /__stats
+- dot-files and dot-directories (.git, .env) are never served
+
+    python dev_tools/serve.py                   # serves the repo root on http://127.0.0.1:8000
+    python dev_tools/serve.py --port 8080 --bind 0.0.0.0 --log
+"""
+import argparse, email.utils, gzip, hashlib, json, mimetypes, re, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+COMPRESSIBLE = {".csv", ".js", ".mjs", ".css", ".json", ".html", ".htm", ".svg", ".md", ".txt"}
+SIDECARS = (("br", ".br"), ("gzip", ".gz"))
+MIN_COMPRESS = 1024
+HASHED_NAME = re.compile(r"\.[0-9a-f]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+TYPES = {".js": "text/javascript", ".mjs": "text/javascript", ".csv": "text/csv", ".md": "text/markdown",
+         ".json": "application/json", ".wav": "audio/wav", ".mp3": "audio/mpeg", ".opus": "audio/ogg",
+         ".svg": "image/svg+xml", ".audiopack": "application/octet-stream", ".f0pack": "application/octet-stream"}
+LAT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+
+def content_type(path: Path) -> str:
+    ext = path.suffix.lower()
+    ctype = TYPES.get(ext) or mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    if ctype.startswith("text/") or ctype in ("application/json", "image/svg+xml"):
+        ctype += "; charset=utf-8"
+    return ctype
+
+def parse_range(header: str, size: int):
+    """'bytes=a-b' -> (start, end) inclusive; None if absent/unsupported (multi-range); 'invalid' if unsatisfiable."""
+    m = re.fullmatch(r"\s*bytes=(\d*)-(\d*)\s*", header or "")
+    if not m or (not m.group(1) and not m.group(2)):
+        return None
+    if m.group(1):
+        start = int(m.group(1))
+        end = min(int(m.group(2)), size - 1) if m.group(2) else size - 1
+    else:
+        n = int(m.group(2))
+        if n == 0:
+            return "invalid"
+        start, end = max(0, size - n), size - 1
+    if start >= size or start > end:
+        return "invalid"
+    return start, end
+
+def parse_accept_encoding(header: str) -> dict:
+    """'br;q=0.5, gzip, *;q=0' -> {"br": 0.5, "gzip": 1.0, "*": 0.0}; a coding with q=0 is refused."""
+    out = {}
+    for part in (header or "").split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        m = re.search(r"(?:^|;)\s*q\s*=\s*([0-9.]+)", params)
+        try:
+            out[name] = float(m.group(1)) if m else 1.0
+        except ValueError:
+            out[name] = 0.0
+    return out
+
+def coding_q(accept: dict, enc: str) -> float:
+    return accept.get(enc, accept.get("*", 0.0))
+
+
+class FileInfo:
+    """Per-file cache: strong ETag and the in-memory gzip variant, valid while size and mtime are unchanged."""
+    __slots__ = ("key", "etag", "gz", "gz_etag")
+
+    def __init__(self, key, etag):
+        self.key, self.etag, self.gz, self.gz_etag = key, etag, None, None
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.count = self.bytes = 0
+        self.status: dict = {}
+        self.encodings: dict = {}
+        self.samples: list = []  # seconds, last 10k requests
+
+    def add(self, status: int, nbytes: int, seconds: float, encoding: str):
+        with self.lock:
+            self.count += 1
+            self.bytes += nbytes
+            self.status[status] = self.status.get(status, 0) + 1
+            self.encodings[encoding] = self.encodings.get(encoding, 0) + 1
+            self.samples.append(seconds)
+            if len(self.samples) > 10000:
+                del self.samples[:5000]
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            v = sorted(self.samples)
+            pick = lambda q: round(v[min(len(v) - 1, int(q * (len(v) - 1)))] * 1000, 3) if v else 0.0
+            return {"requests": self.count, "bytes": self.bytes, "uptime": round(time.time() - self.started, 1),
+                    "status": {str(k): n for k, n in sorted(self.status.items())}, "encodings": dict(self.encodings),
+                    "latency_ms": {"p50": pick(0.5), "p95": pick(0.95), "p99": pick(0.99), "max": pick(1.0)},
+                    "latency_buckets": {f"le_{b:g}s": sum(1 for s in v if s <= b) for b in LAT_BUCKETS}}
+
+    def line(self) -> str:
+        s = self.snapshot()
+        lat = s["latency_ms"]
+        return (f"[SERVE] {s['requests']} requests, {s['bytes'] / 1e6:.1f} MB   latency p50 {lat['p50']}ms  "
+                f"p95 {lat['p95']}ms  p99 {lat['p99']}ms   status {s['status']}")
+
+
+class StaticHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "hsk-serve"
+    disable_nagle_algorithm = True  # headers and body go out in separate writes; don't wait for delayed ACKs
+
+    def log_message(self, fmt, *args):
+        if self.server.log:
+            super().log_message(fmt, *args)
+
+    def do_HEAD(self):
+        self.handle_get(head=True)
+
+    def do_GET(self):
+        self.handle_get(head=False)
+
+    # ---------- helpers ----------
+
+    def _finish(self, status: int, nbytes: int, encoding: str = "identity"):
+        self.server.stats.add(status, nbytes, time.perf_counter() - self._t0, encoding)
+
+    def _simple(self, status: int, body: bytes = b"", ctype: str = "text/plain; charset=utf-8", extra: dict | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (extra or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+        self._finish(status, len(body))
+
+    def _resolve(self, url_path: str):
+        root = self.server.root
+        rel = unquote(url_path).lstrip("/")
+        if any(part.startswith(".") for part in re.split(r"[/\\]", rel)):
+            return None  # .git/, .env (API keys), dev_tools/.cache, and ../ traversal
+        path = (root / rel).resolve()
+        if path != root and root not in path.parents:
+            return None
+        if path.is_dir():
+            if not url_path.endswith("/"):
+                return ("redirect", url_path + "/")
+            path = path / "index.html"
+        return path if path.is_file() else None
+
+    def _info(self, path: Path, st) -> FileInfo:
+        key = (st.st_size, st.st_mtime_ns)
+        cache = self.server.files
+        info = cache.get(path)
+        if info is None or info.key != key:
+            h = hashlib.blake2b(digest_size=12)
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            info = FileInfo(key, f'"{h.hexdigest()}"')
+            cache[path] = info
+        return info
+
+    def _not_modified(self, etag: str, mtime: float) -> bool:
+        inm = self.headers.get("If-None-Match")
+        if inm is not None:
+            return inm.strip() == "*" or etag in [t.strip() for t in inm.split(",")]
+        ims = self.headers.get("If-Modified-Since")
+        if ims:
+            try:
+                return int(mtime) <= email.utils.parsedate_to_datetime(ims).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    # ---------- GET / HEAD ----------
+
+    def handle_get(self, head: bool):
+        self._t0 = time.perf_counter()
+        url = urlsplit(self.path)
+        if url.path == "/__stats":
+            return self._simple(200, json.dumps(self.server.stats.snapshot()).encode(), "application/json",
+                                {"Cache-Control": "no-store"})
+        path = self._resolve(url.path)
+        if isinstance(path, tuple):
+            return self._simple(301, b"", extra={"Location": path[1] + (f"?{url.query}" if url.query else "")})
+        if path is None:
+            return self._simple(404, b"Not found\n")
+
+        try:
+            st = path.stat()
+            info = self._info(path, st)
+        except OSError:
+            return self._simple(404, b"Not found\n")
+        immutable = "v" in parse_qs(url.query) or bool(HASHED_NAME.search(path.name))
+        headers = {"Cache-Control": IMMUTABLE if immutable else "no-cache",
+                   "Last-Modified": email.utils.formatdate(st.st_mtime, usegmt=True)}
+
+        # pick the representation: sidecar file, in-memory gzip, or the file itself
+        accept = parse_accept_encoding(self.headers.get("Accept-Encoding", ""))
+        compressible = path.suffix.lower() in COMPRESSIBLE
+        body_path, body_bytes, encoding, etag = path, None, "identity", info.etag
+        if compressible or any(path.with_name(path.name + ext).is_file() for _, ext in SIDECARS):
+            headers["Vary"] = "Accept-Encoding"
+            for enc, ext in sorted(SIDECARS, key=lambda s: -coding_q(accept, s[0])):  # stable: br wins ties
+                side = path.with_name(path.name + ext)
+                if coding_q(accept, enc) > 0 and side.is_file() and side.stat().st_mtime_ns >= st.st_mtime_ns:
+                    body_path, encoding = side, enc
+                    etag = f'{info.etag[:-1]}-{ext[1:]}"'
+                    break
+            else:
+                if coding_q(accept, "gzip") > 0 and compressible and st.st_size >= MIN_COMPRESS:
+                    if info.gz is None:
+                        info.gz = gzip.compress(path.read_bytes(), compresslevel=6, mtime=0)
+                        info.gz_etag = f'{info.etag[:-1]}-gz"'
+                    if len(info.gz) < st.st_size:
+                        body_bytes, encoding, etag = info.gz, "gzip", info.gz_etag
+        headers["ETag"] = etag
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+
+        if self._not_modified(etag, st.st_mtime):
+            self.send_response(304)
+            for k, v in headers.items():
+                if k != "Content-Encoding":
+                    self.send_header(k, v)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return self._finish(304, 0, encoding)
+
+        size = len(body_bytes) if body_bytes is not None else body_path.stat().st_size
+        start, end, status = 0, size - 1, 200
+        if encoding == "identity":
+            headers["Accept-Ranges"] = "bytes"
+            rng = self.headers.get("Range")
+            if_range = self.headers.get("If-Range")
+            if rng and (not if_range or if_range.strip() == etag):
+                r = parse_range(rng, size)
+                if r == "invalid":
+                    return self._simple(416, b"", extra={"Content-Range": f"bytes */{size}", **headers})
+                if r:
+                    start, end = r
+                    status = 206
+                    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        length = max(0, end - start + 1)
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type(path))
+        self.send_header("Content-Length", str(length))
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        sent = 0
+        if not head and length:
+            try:
+                if body_bytes is not None:
+                    self.wfile.write(body_bytes[start:end + 1])
+                else:
+                    with open(body_path, "rb") as f:
+                        self.connection.sendfile(f, start, length)
+                sent = length
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+        self._finish(status, sent, encoding)
+
+
+def make_server(root: Path, host: str = "127.0.0.1", port: int = 8000, log: bool = False) -> ThreadingHTTPServer:
+    srv = ThreadingHTTPServer((host, port), StaticHandler)
+    srv.daemon_threads = True
+    srv.root = Path(root).resolve()
+    srv.files = {}
+    srv.stats = Stats()
+    srv.log = log
+    return srv
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve the app locally with caching, compression and byte ranges.")
+    ap.add_argument("--root", default=str(Path(__file__).resolve().parent.parent), help="Directory to serve (default: repo root)")
+    ap.add_argument("--bind", default="127.0.0.1", help="Address to bind (default 127.0.0.1)")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--log", action="store_true", help="Log every request")
+    ap.add_argument("--stats-every", type=float, default=60.0, help="Print latency stats every N seconds (0 = only on exit)")
+    args = ap.parse_args()
+
+    srv = make_server(Path(args.root), args.bind, args.port, args.log)
+    host, port = srv.server_address[:2]
+    print(f"[SERVE] Serving {srv.root} on http://{'localhost' if host in ('127.0.0.1', '0.0.0.0') else host}:{port}/  (Ctrl+C to stop)")
+    if args.stats_every > 0:
+        def report():
+            last = -1
+            while True:
+                time.sleep(args.stats_every)
+                if srv.stats.count != last:
+                    last = srv.stats.count
+                    print(srv.stats.line(), flush=True)
+        threading.Thread(target=report, daemon=True).start()
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+        print("\n" + srv.stats.line())
+
+if __name__ == "__main__":
+    main()
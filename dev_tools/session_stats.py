@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Analytics over exported study sessions (flash_sessions_YYYYMMDD.json, format in data/JSON_FORMAT.md).
+
+`ingest` streams each export: the root object is walked key by key and the `summaries`/`sessions` arrays
+are decoded one element at a time, so memory stays bounded by the largest single session, not the file.
+Sessions are deduplicated by id across overlapping exports (the copy with the latest lastPlayedAt, then
+the most events, wins) and flattened into one row per card shown:
+
+    attempts(card_id, session_id, pos, shown_at, seconds, revealed, mistake, removed, gap)
+
+in a SQLite store (default dev_tools/.cache/sessions.sqlite). The table is clustered on card_id, so the
+per-card aggregates behind every query are one sequential pass; `gap` (days since the card was last shown)
+is refreshed after each ingest so retention needs no window function at query time. Files whose size and
+mtime did not change since the last ingest are skipped. Cards are mapped to decks with vocab.py (card ids
+as in the app).
+
+    python dev_tools/session_stats.py ingest ~/Downloads/flash_sessions_*.json
+    python dev_tools/session_stats.py summary
+    python dev_tools/session_stats.py hardest --deck hsk4.csv --top 20
+    python dev_tools/session_stats.py retention
+    python dev_tools/session_stats.py time --deck hsk4.csv
+"""
+import argparse, json, sqlite3, sys, time
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from vocab import VOCAB_INDEX, iter_index_cards
+
+DB_PATH = Path(__file__).resolve().parent / ".cache" / "sessions.sqlite"
+SCHEMA_VERSION = 3
+RETENTION_BUCKETS = [(1, "< 1 day"), (2, "1 day"), (4, "2-3 days"), (8, "4-7 days"), (15, "1-2 weeks"),
+                     (31, "2-4 weeks"), (91, "1-3 months"), (None, "> 3 months")]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files(path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sessions INTEGER);
+CREATE TABLE IF NOT EXISTS sessions(id TEXT PRIMARY KEY, started_at REAL, finished_at REAL, last_played REAL,
+    locale TEXT, name TEXT, replay_of TEXT, total INTEGER, mistakes INTEGER, n_events INTEGER, source TEXT);
+CREATE TABLE IF NOT EXISTS cards(id TEXT PRIMARY KEY, hanzi TEXT, pinyin TEXT, english TEXT, deck TEXT);
+CREATE TABLE IF NOT EXISTS attempts(card_id TEXT NOT NULL, session_id TEXT NOT NULL, pos INTEGER NOT NULL,
+    shown_at REAL, seconds REAL, revealed INTEGER, mistake INTEGER, removed INTEGER, gap REAL,
+    PRIMARY KEY(card_id, session_id, pos)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS attempts_session ON attempts(session_id);
+CREATE INDEX IF NOT EXISTS cards_deck ON cards(deck);
+"""
+
+# ---------- streaming JSON ----------
+
+_DECODER = json.JSONDecoder()
+_WS = " \t\r\n"
+
+
+class StreamReader:
+    """Decode one JSON value at a time from a text file, keeping only a small window of it in memory."""
+    def __init__(self, f, chunk: int = 1 << 20):
+        self.f, self.chunk = f, chunk
+        self.buf, self.pos, self.eof = "", 0, False
+
+    def _fill(self) -> bool:
+        data = self.f.read(self.chunk)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos] if self.pos < len(self.buf) else ""
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise ValueError(f"expected {ch!r} at offset {self.pos}, got {self.peek()!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        grow = self.chunk
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buf, self.pos)
+                if end < len(self.buf) or self.eof:  # a number at the very end might continue in the next chunk
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # the value continues past the window: read more (in growing steps, so long values stay linear)
+            data = self.f.read(grow)
+            grow *= 2
+            if data:
+                self.buf = self.buf[self.pos:] + data
+                self.pos = 0
+            else:
+                self.eof = True
+
+    def items(self) -> Iterator:
+        """Elements of the array starting at the current position."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            ch = self.peek()
+            self.pos += 1
+            if ch == "]":
+                return
+            if ch != ",":
+                raise ValueError(f"expected ',' or ']' at offset {self.pos - 1}")
+
+
+def iter_export(path: Path) -> Iterator[Tuple[str, dict]]:
+    """("summary" | "session", object) for every element of an export (standard, simplified or flat-array form)."""
+    with open(path, "r", encoding="utf-8") as f:
+        r = StreamReader(f)
+        ch = r.peek()
+        if ch == "[":
+            for obj in r.items():
+                yield "session", obj
+            return
+        r.expect("{")
+        if r.peek() == "}":
+            return
+        while True:
+            key = r.value()
+            r.expect(":")
+            if key in ("sessions", "summaries") and r.peek() == "[":
+                kind = {"sessions": "session", "summaries": "summary"}[key]
+                for obj in r.items():
+                    yield kind, obj
+            else:
+                r.value()
+            ch = r.peek()
+            r.pos += 1
+            if ch == "}":
+                return
+            if ch != ",":
+                raise ValueError(f"{path}: expected ',' or '}}' at offset {r.pos - 1}")
+
+# ---------- flattening ----------
+
+@lru_cache(maxsize=1 << 16)
+def ts(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+def attempts_of(s: dict):
+    """Rows (pos, card_id, shown_at, seconds, revealed, mistake, removed) for each card the session showed."""
+    cards = [c for c in s.get("cards") or [] if isinstance(c, dict)]
+    order = s.get("order") or list(range(len(cards)))
+    mistakes = set(s.get("mistakeIds") or [])
+    shown, left, revealed, removed, marked = {0: ts(s.get("startedAt"))}, {}, set(), set(), set()
+    for e in s.get("events") or []:
+        i, typ, t = e.get("index"), e.get("type"), ts(e.get("at"))
+        if not isinstance(i, int):
+            continue
+        if typ == "start":
+            shown.setdefault(i, t)
+        elif typ == "next":
+            left.setdefault(i, t)
+            shown.setdefault(i + 1, t)
+        elif typ == "reveal":
+            revealed.add(i)
+        elif typ == "remove":
+            removed.add(e.get("cardId"))
+        elif typ in ("mistake", "unmistake"):
+            marked.add(i)
+    rows = []
+    for i, ci in enumerate(order):
+        if i not in left and i not in marked:
+            continue  # never answered (unfinished session)
+        if not isinstance(ci, int) or not 0 <= ci < len(cards):
+            continue
+        cid = cards[ci].get("id")
+        if not cid:
+            continue
+        t0, t1 = shown.get(i), left.get(i)
+        secs = round(t1 - t0, 3) if t0 is not None and t1 is not None and t1 >= t0 else None
+        rows.append((i, cid, t0, secs, int(i in revealed), int(cid in mistakes), int(cid in removed)))
+    return rows, cards
+
+# ---------- store ----------
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(db_path)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.executescript(SCHEMA)
+    v = con.execute("SELECT value FROM meta WHERE key='schema'").fetchone()
+    if v is None:
+        con.execute("INSERT INTO meta VALUES('schema', ?)", (str(SCHEMA_VERSION),))
+    elif int(v[0]) != SCHEMA_VERSION:
+        sys.exit(f"ERROR: {db_path} has schema {v[0]}, expected {SCHEMA_VERSION}; delete it and ingest again")
+    return con
+
+def sync_decks(con: sqlite3.Connection, index_path) -> None:
+    """Card id → deck (first deck listing the card), from the vocabulary the app loads."""
+    rows, seen = [], set()
+    for c in iter_index_cards(Path(index_path)):
+        if c.id not in seen:
+            seen.add(c.id)
+            rows.append((c.id, c.hanzi, c.pinyin, c.english, c.deck))
+    con.executemany("INSERT INTO cards VALUES(?,?,?,?,?) ON CONFLICT(id) DO UPDATE SET deck=excluded.deck", rows)
+
+def ingest_file(con: sqlite3.Connection, path: Path) -> Tuple[int, int, int]:
+    """→ (sessions in file, sessions added or replaced, attempts written)."""
+    known = dict(((sid, (lp or 0.0, n)) for sid, lp, n in con.execute("SELECT id, last_played, n_events FROM sessions")))
+    locales, seen, changed, written = {}, 0, 0, 0
+    unlocalized = []  # sessions stored before their summary (which may carry the locale) was read
+    for kind, obj in iter_export(path):
+        if not isinstance(obj, dict) or not obj.get("id"):
+            continue
+        if kind == "summary":
+            locales[obj["id"]] = obj.get("locale")
+            continue
+        seen += 1
+        sid = obj["id"]
+        rank = (ts(obj.get("lastPlayedAt")) or ts(obj.get("finishedAt")) or ts(obj.get("startedAt")) or 0.0,
+                len(obj.get("events") or []))
+        if sid in known and known[sid] >= rank:
+            continue
+        rows, cards = attempts_of(obj)
+        counts = obj.get("counts") or {}
+        if not obj.get("locale") and sid not in locales:
+            unlocalized.append(sid)
+        con.execute("DELETE FROM attempts WHERE session_id=?", (sid,))
+        con.execute("INSERT OR REPLACE INTO sessions VALUES(?,?,?,?,?,?,?,?,?,?,?)",
+                    (sid, ts(obj.get("startedAt")), ts(obj.get("finishedAt")), rank[0],
+                     obj.get("locale") or locales.get(sid) or "zh-CN", obj.get("name"), obj.get("replayOf"),
+                     counts.get("total", len(obj.get("order") or [])), counts.get("mistakes", len(obj.get("mistakeIds") or [])),
+                     rank[1], path.name))
+        con.executemany("INSERT OR REPLACE INTO attempts(session_id, pos, card_id, shown_at, seconds, revealed, mistake, removed) "
+                        "VALUES(?,?,?,?,?,?,?,?)", [(sid,) + r for r in rows])
+        con.executemany("INSERT OR IGNORE INTO cards VALUES(?,?,?,?,NULL)",
+                        [(c.get("id"), c.get("hanzi"), c.get("pinyin"), c.get("english")) for c in cards if c.get("id")])
+        known[sid] = rank
+        changed += 1
+        written += len(rows)
+    con.executemany("UPDATE sessions SET locale=? WHERE id=?", [(locales[sid], sid) for sid in unlocalized if locales.get(sid)])
+    return seen, changed, written
+
+def refresh_gaps(con: sqlite3.Connection) -> None:
+    """attempts.gap = days since the same card was previously shown (NULL for its first showing)."""
+    con.execute(
+        "UPDATE attempts SET gap = g.gap FROM (SELECT card_id, session_id, pos, (shown_at - LAG(shown_at) "
+        "OVER (PARTITION BY card_id ORDER BY shown_at)) / 86400.0 AS gap FROM attempts WHERE shown_at IS NOT NULL) AS g "
+        "WHERE attempts.card_id = g.card_id AND attempts.session_id = g.session_id AND attempts.pos = g.pos "
+        "AND attempts.gap IS NOT g.gap")
+
+def cmd_ingest(con: sqlite3.Connection, args) -> None:
+    paths = []
+    for p in map(Path, args.paths):
+        paths += sorted(p.glob("flash_sessions_*.json")) if p.is_dir() else [p]
+    t0 = time.perf_counter()
+    sync_decks(con, args.index)
+    con.commit()  # before any file: a bad export's rollback must not take the deck mapping with it
+    skipped, dirty = 0, False
+    for p in paths:
+        st = p.stat()
+        prev = con.execute("SELECT size, mtime_ns FROM files WHERE path=?", (str(p.resolve()),)).fetchone()
+        if prev == (st.st_size, st.st_mtime_ns) and not args.force:
+            skipped += 1
+            continue
+        t = time.perf_counter()
+        try:
+            seen, changed, written = ingest_file(con, p)
+        except (ValueError, UnicodeDecodeError) as e:
+            con.rollback()
+            print(f"[SESSIONS] SKIP {p.name}: not a valid export ({e})")
+            continue
+        con.execute("INSERT OR REPLACE INTO files VALUES(?,?,?,?)", (str(p.resolve()), st.st_size, st.st_mtime_ns, seen))
+        con.commit()
+        dirty |= changed > 0
+        print(f"[SESSIONS] {p.name}: {seen} sessions, {changed} new or updated, {written} attempts "
+              f"({st.st_size / 1e6:.1f} MB in {time.perf_counter() - t:.2f}s)")
+    if dirty:
+        refresh_gaps(con)
+    con.commit()
+    n_s, n_a = con.execute("SELECT (SELECT COUNT(*) FROM sessions), (SELECT COUNT(*) FROM attempts)").fetchone()
+    print(f"[SESSIONS] {len(paths)} file(s), {skipped} unchanged   Store: {n_s} sessions, {n_a} attempts   "
+          f"({time.perf_counter() - t0:.1f}s)")
+
+# ---------- queries ----------
+
+def _deck_filter(args) -> Tuple[str, tuple]:
+    """Restrict attempts to one deck; the IN list turns into range seeks on the card_id clustering."""
+    return (" AND card_id IN (SELECT id FROM cards WHERE deck = ?)", (args.deck,)) if args.deck else ("", ())
+
+def cmd_summary(con, args) -> None:
+    n_s, first, last = con.execute("SELECT COUNT(*), MIN(started_at), MAX(started_at) FROM sessions").fetchone()
+    if not n_s:
+        print("[SESSIONS] Store is empty (run ingest first)")
+        return
+    day = lambda t: time.strftime("%Y-%m-%d", time.gmtime(t))
+    print(f"[SESSIONS] {n_s} sessions from {day(first)} to {day(last)}")
+    print(f"{'deck':<28}{'attempts':>10}{'cards':>8}{'mistakes':>10}{'rate':>7}")
+    for deck, n, cards, m in con.execute(
+            "WITH per AS (SELECT card_id, COUNT(*) AS n, SUM(mistake) AS m FROM attempts GROUP BY card_id) "
+            "SELECT COALESCE(c.deck, '?'), SUM(n), COUNT(*), SUM(m) FROM per LEFT JOIN cards c ON c.id = per.card_id "
+            "GROUP BY 1 ORDER BY 2 DESC"):
+        print(f"{deck:<28}{n:>10}{cards:>8}{m:>10}{m / n:>7.1%}")
+
+def cmd_hardest(con, args) -> None:
+    where, params = _deck_filter(args)
+    q = ("WITH per AS (SELECT card_id, COUNT(*) AS n, SUM(mistake) AS m, AVG(CASE WHEN seconds <= ? THEN seconds END) AS s "
+         f"FROM attempts WHERE removed = 0{where} GROUP BY card_id HAVING n >= ?) "
+         "SELECT c.hanzi, c.pinyin, c.english, COALESCE(c.deck, '?'), n, m, s FROM per JOIN cards c ON c.id = per.card_id "
+         "ORDER BY (m + 1.0) / (n + 2.0) DESC, n DESC LIMIT ?")
+    print(f"{'hanzi':<10}{'pinyin':<18}{'deck':<16}{'seen':>6}{'wrong':>7}{'rate':>7}{'avg s':>7}  english")
+    for hanzi, pinyin, english, deck, n, m, secs in con.execute(q, (args.max_seconds,) + params + (args.min_seen, args.top)):
+        print(f"{hanzi or '':<10}{pinyin or '':<18}{deck:<16}{n:>6}{m:>7}{m / n:>7.1%}"
+              f"{secs if secs is not None else float('nan'):>7.1f}  {(english or '')[:40]}")
+
+def cmd_retention(con, args) -> None:
+    """Share of correct answers by time since the same card was last seen."""
+    where, params = _deck_filter(args)
+    cases = " ".join(f"WHEN gap < {lim} THEN {i}" for i, (lim, _) in enumerate(RETENTION_BUCKETS) if lim is not None)
+    q = (f"SELECT CASE {cases} ELSE {len(RETENTION_BUCKETS) - 1} END AS b, COUNT(*), AVG(1 - mistake) "
+         f"FROM attempts WHERE removed = 0 AND gap IS NOT NULL{where} GROUP BY b ORDER BY b")
+    print(f"{'since last seen':<18}{'reviews':>9}{'recalled':>10}")
+    for b, n, recalled in con.execute(q, params):
+        print(f"{RETENTION_BUCKETS[b][1]:<18}{n:>9}{recalled:>10.1%}  {'#' * int(round(recalled * 30))}")
+
+def cmd_time(con, args) -> None:
+    """Time from showing a card to moving on, per deck and for the slowest cards (answers over --max-seconds ignored)."""
+    where, params = _deck_filter(args)
+    per = ("WITH per AS (SELECT card_id, COUNT(*) AS n, SUM(seconds) AS s, SUM(revealed) AS r FROM attempts "
+           f"WHERE seconds <= ?{where} GROUP BY card_id) ")
+    print(f"{'deck':<28}{'answers':>9}{'avg s':>8}{'revealed':>10}")
+    for deck, n, avg, rev in con.execute(
+            per + "SELECT COALESCE(c.deck, '?'), SUM(n), SUM(s) / SUM(n), SUM(r) * 1.0 / SUM(n) "
+            "FROM per LEFT JOIN cards c ON c.id = per.card_id GROUP BY 1 ORDER BY 2 DESC", (args.max_seconds,) + params):
+        print(f"{deck:<28}{n:>9}{avg:>8.1f}{rev:>10.0%}")
+    print(f"\nSlowest cards (seen at least {args.min_seen} times):")
+    for hanzi, pinyin, n, avg in con.execute(
+            per + "SELECT c.hanzi, c.pinyin, n, s / n AS avg FROM per JOIN cards c ON c.id = per.card_id "
+            "WHERE n >= ? ORDER BY avg DESC LIMIT ?", (args.max_seconds,) + params + (args.min_seen, args.top)):
+        print(f"  {hanzi or '':<10}{pinyin or '':<18}{n:>6}{avg:>8.1f}s")
+
+def main():
+    ap = argparse.ArgumentParser(description="Streaming analytics over exported study sessions.")
+    ap.add_argument("--db", default=str(DB_PATH), help="SQLite store (default: dev_tools/.cache/sessions.sqlite)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("ingest", help="Add export files (or directories of flash_sessions_*.json) to the store")
+    p.add_argument("paths", nargs="+")
+    p.add_argument("--index", default=str(VOCAB_INDEX), help="Deck index for the card → deck mapping")
+    p.add_argument("--force", action="store_true", help="Re-read files even if unchanged")
+    sub.add_parser("summary", help="Sessions, attempts and mistake rate per deck")
+    for name, help_ in (("hardest", "Cards with the highest mistake rate"),
+                        ("retention", "Recall by time since the card was last seen"),
+                        ("time", "Time per card, per deck and slowest cards")):
+        p = sub.add_parser(name, help=help_)
+        p.add_argument("--deck", help="Only this deck (file name from data/vocab.csv, e.g. hsk4.csv)")
+        p.add_argument("--top", type=int, default=20)
+        p.add_argument("--min-seen", type=int, default=3, help="Ignore cards seen fewer times (default 3)")
+        p.add_argument("--max-seconds", type=float, default=120.0, help="Ignore answers slower than this (default 120)")
+    args = ap.parse_args()
+
+    con = connect(Path(args.db))
+    t0 = time.perf_counter()
+    {"ingest": cmd_ingest, "summary": cmd_summary, "hardest": cmd_hardest,
+     "retention": cmd_retention, "time": cmd_time}[args.cmd](con, args)
+    if args.cmd != "ingest":
+        print(f"[SESSIONS] Query: {(time.perf_counter() - t0) * 1000:.0f} ms")
+    con.close()
+
+if __name__ == "__main__":
+    main()
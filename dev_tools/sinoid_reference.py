@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Original per-sample (pure Python) synthesis from generate_sinoid.py.
+
+Kept only as ground truth for `generate_sinoid.py --bench`, which checks that the NumPy engine
+stays within 1 LSB of these loops and reports the speedup. Do not use it to write fixtures.
+"""
+
+import math, struct
+from typing import List, Dict, Tuple, Optional
+
+SR = 48000  # sample rate
+
+def hann(n: int, N: int) -> float:
+    return 0.5 * (1 - math.cos(2 * math.pi * n / (N - 1))) if N > 1 else 1.0
+
+def encode_pcm16(samples: List[float]) -> bytes:
+    frames = bytearray()
+    for s in samples:
+        v = int(max(-1.0, min(1.0, s)) * 32767.0)
+        frames += struct.pack('<h', v)
+    return bytes(frames)
+
+# ---------- continuous F0 synth ----------
+
+def generate_continuous(cfg: Dict) -> List[float]:
+    """Existing continuous F0 patterns (T1/T2/T3/T4/STEP/GLIDE + vibrato/harmonics)."""
+    dur = cfg.get("durMs", 600) / 1000.0
+    N = max(1, int(SR * dur))
+    f0 = [0.0] * N
+
+    typ = cfg["type"]
+
+    if typ == "T1":
+        for i in range(N):
+            f0[i] = float(cfg["f0"])
+    elif typ == "T2":
+        f0s, f0e = float(cfg["f0Start"]), float(cfg["f0End"])
+        for i in range(N):
+            a = i / (N - 1) if N > 1 else 0.0
+            f0[i] = f0s + (f0e - f0s) * a
+    elif typ == "T3":
+        split = int(cfg.get("split", 0.6) * N)
+        f0A, f0B, f0E = float(cfg["f0A"]), float(cfg["f0B"]), float(cfg["f0End"])
+        for i in range(N):
+            if i < split:
+                a = i / max(1, split - 1)
+                f0[i] = f0A + (f0B - f0A) * a
+            else:
+                rem = N - split
+                a = (i - split) / max(1, rem - 1)
+                f0[i] = f0B + (f0E - f0B) * a
+    elif typ == "T4":
+        f0s, f0e = float(cfg["f0Start"]), float(cfg["f0End"])
+        for i in range(N):
+            a = i / (N - 1) if N > 1 else 0.0
+            f0[i] = f0s + (f0e - f0s) * a
+    elif typ == "STEP":
+        split = int(cfg.get("split", 0.5) * N)
+        f0A, f0B = float(cfg["f0A"]), float(cfg["f0B"])
+        for i in range(N):
+            f0[i] = f0A if i < split else f0B
+    elif typ == "GLIDE":
+        f0s, f0e = float(cfg["f0Start"]), float(cfg["f0End"])
+        for i in range(N):
+            a = i / (N - 1) if N > 1 else 0.0
+            # cubic smoothstep
+            s = a * a * (3 - 2 * a)
+            f0[i] = f0s + (f0e - f0s) * s
+    else:
+        for i in range(N):
+            f0[i] = 220.0
+
+    vib_hz = cfg.get("vibratoHz", None)
+    vib_depth = cfg.get("vibratoDepth", None)
+    if vib_hz and vib_depth:
+        vhz, vdp = float(vib_hz), float(vib_depth)
+        for i in range(N):
+            t = i / SR
+            f0[i] *= (1.0 + vdp * math.sin(2 * math.pi * vhz * t))
+
+    # Integrate frequency → phase and synthesize sine (+ optional harmonics)
+    samples = [0.0] * N
+    phase = 0.0
+    harmonics = int(cfg.get("harmonics", 0))
+
+    for i in range(N):
+        phase += (2 * math.pi * f0[i]) / SR
+        s = math.sin(phase)
+        if harmonics > 0:
+            for k in range(2, harmonics + 1):
+                s += (1.0 / (k * k)) * math.sin(k * phase)
+            s /= (1.0 + 0.2)
+        samples[i] = s
+
+    # short fade-in/out (~10 ms) to avoid clicks in continuous tones
+    fade = max(1, int(0.01 * SR))
+    for i in range(min(fade, N)):
+        w = hann(i, fade)
+        samples[i] *= w
+        samples[-1 - i] *= w
+
+    # normalize to ~0.6 peak
+    peak = max(1e-9, max(abs(x) for x in samples))
+    scale = 0.6 / peak
+    return [x * scale for x in samples]
+
+# ---------- segment engine for timing tests ----------
+
+Segment = Tuple[int, Optional[float]]  # (duration_ms, hz or None for silence)
+
+def generate_segments(segments: List[Segment], add_clicks: bool = False) -> List[float]:
+    """
+    Build a waveform from timed segments. Each segment is (duration_ms, f_hz or None for silence).
+    If add_clicks=True, put a 1-sample marker (small spike) at each boundary to make timing obvious.
+    """
+    out: List[float] = []
+    last_was_tone = False
+    phase = 0.0
+
+    for si, (dur_ms, hz) in enumerate(segments):
+        n = max(1, int(SR * (dur_ms / 1000.0)))
+
+        # Optional boundary click (tiny, but visible in waveform/spectrogram)
+        if add_clicks and out:
+            out[-1] = 0.95  # single-sample spike
+
+        if hz is None or hz <= 0.0:
+            # silence
+            out.extend([0.0] * n)
+            last_was_tone = False
+            continue
+
+        # tone segment – hard step by design (no crossfade)
+        for i in range(n):
+            phase += (2 * math.pi * hz) / SR
+            out.append(math.sin(phase))
+        last_was_tone = True
+
+    # global normalization to ~0.6 peak
+    peak = max(1e-9, max(abs(x) for x in out))
+    scale = 0.6 / peak
+    return [x * scale for x in out]
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Energy-based splitter for batched TTS audio: cut one recording of K words (read with pauses between them)
+back into K clips.
+
+Frames (10 ms) whose RMS is more than `rel_db` below the loud frames, or under `floor_db` absolute, are silence.
+Runs of silence of at least `min_gap_ms` are candidate word boundaries; the K-1 longest interior runs are
+taken (short pauses inside a word lose to the deliberate pauses between words). The split is rejected
+(None) when there are fewer than K-1 candidates, when a chosen gap is not clearly longer than the longest
+rejected one, or when a clip would be shorter than `min_word_ms`; callers then fall back to per-word requests.
+Checked against the generate_sinoid.py segment presets and synthetic batches in dev_tools/tests/test_splitter.py.
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+DEFAULTS = {"frame_ms": 10.0, "rel_db": 35.0, "floor_db": -60.0, "min_gap_ms": 150.0, "min_word_ms": 80.0,
+            "pad_ms": 40.0, "gap_ratio": 1.5}
+
+
+class SplitError(RuntimeError):
+    """Batched audio could not be cut into the expected number of words."""
+
+
+def frame_db(x: np.ndarray, sr: int, frame_ms: float) -> Tuple[np.ndarray, int]:
+    hop = max(1, int(sr * frame_ms / 1000))
+    n = len(x) // hop
+    if n == 0:
+        return np.zeros(0), hop
+    fr = x[: n * hop].reshape(n, hop).astype(np.float64)
+    return 10 * np.log10(np.maximum((fr * fr).mean(axis=1), 1e-12)), hop
+
+def silent_runs(silent: np.ndarray) -> List[Tuple[int, int]]:
+    """[(first frame, end frame)) of each run of True."""
+    d = np.diff(np.concatenate([[0], silent.astype(np.int8), [0]]))
+    return list(zip(np.flatnonzero(d == 1), np.flatnonzero(d == -1)))
+
+def split_on_silence(x: np.ndarray, sr: int, expected: int, frame_ms: float = DEFAULTS["frame_ms"],
+                     rel_db: float = DEFAULTS["rel_db"], floor_db: float = DEFAULTS["floor_db"],
+                     min_gap_ms: float = DEFAULTS["min_gap_ms"], min_word_ms: float = DEFAULTS["min_word_ms"],
+                     pad_ms: float = DEFAULTS["pad_ms"], gap_ratio: float = DEFAULTS["gap_ratio"]
+                     ) -> Optional[List[Tuple[int, int]]]:
+    """Sample ranges [(start, end)) of `expected` words, or None if the audio does not split cleanly."""
+    db, hop = frame_db(x, sr, frame_ms)
+    if expected < 1 or not len(db):
+        return None
+    loud = np.percentile(db, 95)
+    silent = db < max(loud - rel_db, floor_db)
+    voiced = np.flatnonzero(~silent)
+    if not len(voiced):
+        return None
+    first, last = voiced[0], voiced[-1] + 1
+    min_gap = max(1, int(round(min_gap_ms / frame_ms)))
+    gaps = [(a, b) for a, b in silent_runs(silent) if a > first and b < last and b - a >= min_gap]
+    if len(gaps) < expected - 1:
+        return None
+    gaps.sort(key=lambda g: g[1] - g[0], reverse=True)
+    chosen, rejected = gaps[: expected - 1], gaps[expected - 1:]
+    if chosen and rejected and (chosen[-1][1] - chosen[-1][0]) < gap_ratio * (rejected[0][1] - rejected[0][0]):
+        return None  # ambiguous: an intra-word pause is nearly as long as a word boundary
+    chosen.sort()
+
+    pad = int(sr * pad_ms / 1000)
+    bounds, start = [], first
+    for a, b in chosen + [(last, None)]:
+        bounds.append((start, a))
+        start = b
+    out = []
+    for a, b in bounds:
+        if (b - a) * frame_ms < min_word_ms:
+            return None
+        out.append((max(0, a * hop - pad), min(len(x), b * hop + pad)))
+    return out
@@ -0,0 +1,18 @@
+"""pytest setup for the dev tools: they import each other by bare module name, as when run as scripts."""
+import os, subprocess, sys
+from pathlib import Path
+
+import pytest
+
+DEV_TOOLS = Path(__file__).resolve().parent.parent
+REPO = DEV_TOOLS.parent
+sys.path.insert(0, str(DEV_TOOLS))
+
+
+@pytest.fixture
+def run_tool(tmp_path):
+    """Run a dev tool script in tmp_path: run_tool("make_tts_from_csv.py", *args, env={...}) → CompletedProcess."""
+    def run(script, *args, env=None, cwd=None):
+        return subprocess.run([sys.executable, str(DEV_TOOLS / script), *map(str, args)], cwd=cwd or tmp_path,
+                              env=dict(os.environ, **(env or {})), capture_output=True, text=True, timeout=120)
+    return run
@@ -0,0 +1,63 @@
+"""audio_io.py: PCM WAV write/read round trip, header probing, and which files need ffmpeg."""
+import numpy as np
+import pytest
+
+from audio_io import encode_wav_pcm16, needs_ffmpeg, probe, read_audio, resample, sniff_container, write_wav_pcm16
+
+# one MPEG-1 layer III frame: 128 kbps, 44.1 kHz, stereo, 417 bytes
+MP3_FRAME = b"\xff\xfb\x90\x64" + bytes(413)
+
+
+def tone(seconds=0.5, sr=16000, hz=440.0, level=0.5):
+    t = np.arange(int(sr * seconds)) / sr
+    return (level * np.sin(2 * np.pi * hz * t)).astype(np.float32)
+
+@pytest.mark.parametrize("sr", [8000, 16000, 24000, 44100])
+def test_wav_round_trip(tmp_path, sr):
+    x = tone(sr=sr)
+    write_wav_pcm16(tmp_path / "sub" / "a.wav", x, sr)
+    y, got_sr = read_audio(tmp_path / "sub" / "a.wav")
+    assert got_sr == sr and y.dtype == np.float32 and len(y) == len(x)
+    assert np.max(np.abs(y - x)) <= 1 / 32767
+    assert (tmp_path / "sub" / "a.wav").read_bytes() == encode_wav_pcm16(x, sr)
+
+def test_round_trip_clips_out_of_range_samples(tmp_path):
+    write_wav_pcm16(tmp_path / "a.wav", np.array([-2.0, -1.0, 0.0, 1.0, 2.0], dtype=np.float32), 8000)
+    y, _ = read_audio(tmp_path / "a.wav")
+    assert np.allclose(y, [-32767 / 32768, -32767 / 32768, 0, 32767 / 32768, 32767 / 32768])
+
+def test_probe_wav_headers(tmp_path):
+    (tmp_path / "a.wav").write_bytes(encode_wav_pcm16(tone(seconds=0.25, sr=24000), 24000))
+    info = probe(tmp_path / "a.wav")
+    assert info["container"] == "wav" and info["codec"] == "pcm"
+    assert info["sample_rate"] == 24000 and info["channels"] == 1 and info["bits"] == 16
+    assert info["duration"] == pytest.approx(0.25) and not info["truncated"]
+    (tmp_path / "cut.wav").write_bytes((tmp_path / "a.wav").read_bytes()[:1000])
+    assert probe(tmp_path / "cut.wav")["truncated"]
+
+def test_probe_mp3_named_wav(tmp_path):
+    (tmp_path / "a.wav").write_bytes(b"ID3\x03\x00\x00\x00\x00\x00\x00" + MP3_FRAME * 10)
+    info = probe(tmp_path / "a.wav")
+    assert info["container"] == "mp3" and info["frames"] == 10
+    assert info["sample_rate"] == 44100 and info["bitrate"] == 128000
+    assert info["duration"] == pytest.approx(10 * 1152 / 44100)
+
+def test_sniff_container():
+    assert sniff_container(b"RIFF\x00\x00\x00\x00WAVEfmt ") == "wav"
+    assert sniff_container(MP3_FRAME[:16]) == "mp3"
+    assert sniff_container(b"OggS" + bytes(12)) == "ogg"
+    assert sniff_container(b"hello world 1234") == "unknown"
+
+def test_needs_ffmpeg(tmp_path):
+    (tmp_path / "pcm.wav").write_bytes(encode_wav_pcm16(tone(), 16000))
+    (tmp_path / "mp3.wav").write_bytes(MP3_FRAME * 4)
+    (tmp_path / "a.ogg").write_bytes(b"OggS" + bytes(100))
+    assert not needs_ffmpeg(tmp_path / "pcm.wav")
+    assert needs_ffmpeg(tmp_path / "mp3.wav") and needs_ffmpeg(tmp_path / "a.ogg")
+
+def test_resample_keeps_duration_and_pitch():
+    x = tone(seconds=1.0, sr=24000, hz=300.0)
+    y = resample(x, 24000, 16000)
+    assert len(y) == 16000
+    spectrum = np.abs(np.fft.rfft(y))
+    assert np.argmax(spectrum) * 16000 / len(y) == pytest.approx(300, abs=1)
@@ -0,0 +1,89 @@
+"""compact_audio.py: silence trimming, loudness gain, and the run without ffmpeg."""
+import csv
+
+import numpy as np
+import pytest
+
+from audio_io import encode_wav_pcm16, read_audio
+from compact_audio import frame_db, loudness_gain, trim_silence
+
+SR = 16000
+
+
+def clip(lead_s, speech_s, trail_s, level=0.3, noise_db=-80.0):
+    """Sine burst between silences over a faint noise floor."""
+    rng = np.random.default_rng(0)
+    n = int(SR * (lead_s + speech_s + trail_s))
+    x = rng.normal(0, 10 ** (noise_db / 20), n).astype(np.float32)
+    a, b = int(SR * lead_s), int(SR * (lead_s + speech_s))
+    x[a:b] += level * np.sin(2 * np.pi * 220 * np.arange(b - a) / SR).astype(np.float32)
+    return x, a, b
+
+def rms_db(x):
+    return 20 * np.log10(np.sqrt(np.mean(np.square(x, dtype=np.float64))))
+
+
+def test_frame_db():
+    assert frame_db(np.full(SR, 0.5, dtype=np.float32), SR) == pytest.approx(20 * np.log10(0.5))
+    assert frame_db(np.zeros(10, dtype=np.float32), SR).tolist() == [-120.0]  # shorter than one frame
+
+def test_trim_silence_keeps_the_padding():
+    x, a, b = clip(0.5, 0.4, 0.3)
+    y, start, end = trim_silence(x, SR, pad_ms=40.0)
+    assert abs(start - (a - int(0.04 * SR))) <= SR // 100   # within one 10 ms frame
+    assert abs(end - (b + int(0.04 * SR))) <= SR // 100
+    assert np.array_equal(y, x[start:end])
+    _, start0, end0 = trim_silence(x, SR, pad_ms=0.0)
+    assert abs(start0 - a) <= SR // 100 and abs(end0 - b) <= SR // 100
+
+def test_trim_silence_leaves_silence_and_edge_to_edge_speech_alone():
+    silent = np.zeros(SR, dtype=np.float32)
+    y, start, end = trim_silence(silent, SR)
+    assert (start, end) == (0, SR) and y is silent
+    x, _, _ = clip(0.0, 0.5, 0.0)
+    assert trim_silence(x, SR)[1:] == (0, len(x))
+
+def test_trim_threshold_is_relative_to_the_loudest_frame():
+    """A quiet tail 30 dB under the peak stays with the default -40 dB; -20 dB cuts it."""
+    x, a, b = clip(0.2, 0.3, 0.0)
+    tail = 0.3 * 10 ** (-30 / 20) * np.sin(2 * np.pi * 220 * np.arange(int(0.3 * SR)) / SR).astype(np.float32)
+    x = np.concatenate([x, tail, np.zeros(int(0.2 * SR), dtype=np.float32)])
+    assert trim_silence(x, SR, pad_ms=0.0)[2] >= b + len(tail) - SR // 100
+    assert abs(trim_silence(x, SR, rel_db=-20.0, pad_ms=0.0)[2] - b) <= SR // 100
+
+def test_loudness_gain_reaches_target_on_active_speech():
+    x, a, b = clip(0.5, 0.5, 0.5, level=0.05)
+    g = loudness_gain(x, SR, target_db=-20.0)
+    assert rms_db(x[a:b] * g) == pytest.approx(-20.0, abs=0.3)  # the silences do not dilute the level
+
+def test_loudness_gain_is_limited_by_the_peak():
+    x, _, _ = clip(0.1, 0.5, 0.1, level=0.05)
+    x[100] = 0.9  # one click
+    g = loudness_gain(x, SR, target_db=-10.0, peak_db=-1.0)
+    assert np.abs(x * g).max() == pytest.approx(10 ** (-1 / 20), rel=1e-4)
+
+def test_loudness_gain_leaves_silence_alone():
+    assert loudness_gain(np.zeros(SR, dtype=np.float32), SR) == 1.0
+
+
+def test_wav_only_directory_runs_without_ffmpeg(tmp_path, run_tool):
+    x, _, _ = clip(0.5, 0.4, 0.5, level=0.05)
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "一.wav").write_bytes(encode_wav_pcm16(x, SR))
+    r = run_tool("compact_audio.py", "in", "out", "--jobs", "1", env={"PATH": str(tmp_path)})
+    assert r.returncode == 0, r.stderr
+    assert "Codec: wav" in r.stdout and "Done: 1/1" in r.stdout
+    y, sr = read_audio(tmp_path / "out" / "一.wav")
+    assert sr == SR and len(y) < len(x)
+    with open(tmp_path / "out" / "compaction_report.csv", encoding="utf-8") as f:
+        row = next(csv.DictReader(f))
+    assert row["status"] == "ok" and float(row["gain_db"]) > 0
+
+def test_mp3_input_without_ffmpeg_stops_up_front(tmp_path, run_tool):
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "一.wav").write_bytes(encode_wav_pcm16(np.zeros(SR, dtype=np.float32), SR))
+    (tmp_path / "in" / "二.wav").write_bytes(b"\xff\xfb\x90\x64" + bytes(413))  # MP3 data under a .wav name
+    r = run_tool("compact_audio.py", "in", "out", "--jobs", "1", env={"PATH": str(tmp_path)})
+    assert r.returncode == 1
+    assert "1 of 2 clips (mp3, e.g. 二.wav)" in r.stderr and "ffmpeg" in r.stderr
+    assert not (tmp_path / "out").exists()
@@ -0,0 +1,39 @@
+"""generate_fixtures.py: spec expansion, deterministic output, and registration in data/vocab.csv."""
+import json
+
+from generate_fixtures import DEFAULT_SPEC, expand
+
+INDEX = "﻿filename,display_name,description,locale\r\nhsk1.csv,HSK 1,,zh-CN\r\n"
+SPEC = {"name": "fx", "display_name": "FX", "description": "tiny", "locale": "xx-TEST", "mode": "random", "seed": 3,
+        "count": 4, "params": {"tone": ["T1", "T4"], "f0Low": {"min": 90, "max": 200}, "f0Range": [80],
+                               "durMs": {"min": 200, "max": 300}, "vibratoHz": [0], "vibratoDepth": [0.03], "harmonics": [0]}}
+
+
+def test_grid_crosses_every_value_list():
+    n = 1
+    for values in DEFAULT_SPEC["params"].values():
+        n *= len(values)
+    assert len(list(expand(DEFAULT_SPEC))) == n
+
+def test_random_mode_is_reproducible():
+    a, b = list(expand(SPEC)), list(expand(SPEC))
+    assert a == b and len(a) == 4
+    assert all(90 <= p["f0Low"] <= 200 and isinstance(p["f0Low"], int) for p in a)
+    assert list(expand(dict(SPEC, seed=4))) != a
+
+def test_clips_deck_and_index(tmp_path, run_tool):
+    (tmp_path / "spec.json").write_text(json.dumps(SPEC), encoding="utf-8")
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / "vocab.csv").write_bytes(INDEX.encode("utf-8"))
+    r = run_tool("generate_fixtures.py", "spec.json", "--data", data, "--jobs", "1")
+    assert r.returncode == 0, r.stderr
+    clips = sorted(p.name for p in (data / "recordings" / "xx-TEST").iterdir())
+    assert clips == [f"fx-{i:05d}.wav" for i in range(4)]
+    assert all((data / "recordings" / "xx-TEST" / c).read_bytes()[:4] == b"RIFF" for c in clips)
+    assert (data / "fx.csv").read_text(encoding="utf-8").splitlines()[0] == "hanzi,pinyin,english"
+    assert (data / "vocab.csv").read_bytes().decode("utf-8") == INDEX + "fx.csv,FX,tiny,xx-TEST\r\n"
+    first = {c: (data / "recordings" / "xx-TEST" / c).read_bytes() for c in clips}
+    r = run_tool("generate_fixtures.py", "spec.json", "--data", data, "--jobs", "1")
+    assert r.returncode == 0 and "Updated" not in r.stdout
+    assert first == {c: (data / "recordings" / "xx-TEST" / c).read_bytes() for c in clips}
@@ -0,0 +1,53 @@
+"""index_recordings.py: the probe cache, and matching cards to the file the app requests."""
+import numpy as np
+import pytest
+
+import index_recordings
+from audio_io import encode_wav_pcm16
+from index_recordings import cross_reference, scan
+
+
+def wav(seconds: float = 0.2) -> bytes:
+    t = np.arange(int(24000 * seconds)) / 24000
+    return encode_wav_pcm16(0.3 * np.sin(2 * np.pi * 220 * t).astype(np.float32), 24000)
+
+@pytest.fixture
+def recordings(tmp_path, monkeypatch):
+    monkeypatch.setattr(index_recordings, "CACHE_PATH", tmp_path / "cache" / "recordings.pickle")
+    root = tmp_path / "recordings"
+    (root / "zh-CN").mkdir(parents=True)
+    (tmp_path / "deck.csv").write_text("hanzi,pinyin,english\n一,yī,one\n二,èr,two\n三,sān,three\n四/五,sì wǔ,four five\n",
+                                       encoding="utf-8")
+    (tmp_path / "vocab.csv").write_text("filename,display_name,description,locale\ndeck.csv,Deck,,zh-CN\n", encoding="utf-8")
+    return root
+
+
+def test_cards_are_covered_only_by_the_wav_the_app_requests(recordings, tmp_path):
+    clips = {f"zh-CN/{name}": {} for name in ("一.wav", "一.mp3", "二.mp3", "四_五.wav", "六.wav")}
+    missing, orphans = cross_reference(clips, tmp_path / "vocab.csv", ["zh-CN"])
+    assert missing == {"deck.csv": ["zh-CN/二.wav (found 二.mp3)", "zh-CN/三.wav", "zh-CN/四/五.wav (found 四_五.wav)"]}
+    assert orphans == ["zh-CN/一.mp3", "zh-CN/二.mp3", "zh-CN/六.wav", "zh-CN/四_五.wav"]
+
+def test_other_locales_are_ignored(recordings, tmp_path):
+    missing, orphans = cross_reference({"en-GB/一.wav": {}}, tmp_path / "vocab.csv", ["en-GB"])
+    assert missing == {} and orphans == ["en-GB/一.wav"]
+
+def test_scan_probes_only_new_or_changed_clips(recordings):
+    for word in ("一", "二"):
+        (recordings / "zh-CN" / f"{word}.wav").write_bytes(wav())
+    clips, probed = scan(recordings, ["zh-CN"], jobs=1)
+    assert probed == 2
+    assert clips["zh-CN/一.wav"]["duration"] == pytest.approx(0.2, abs=0.001)
+    assert clips["zh-CN/一.wav"]["issues"] == []
+    assert index_recordings.CACHE_PATH.exists()
+
+    assert scan(recordings, ["zh-CN"], jobs=1)[1] == 0
+    (recordings / "zh-CN" / "二.wav").write_bytes(wav(0.5))
+    clips, probed = scan(recordings, ["zh-CN"], jobs=1)
+    assert probed == 1
+    assert clips["zh-CN/二.wav"]["duration"] == pytest.approx(0.5, abs=0.001)
+
+    (recordings / "zh-CN" / "一.wav").unlink()
+    clips, probed = scan(recordings, ["zh-CN"], jobs=1)
+    assert probed == 0 and sorted(clips) == ["zh-CN/二.wav"]
+    assert scan(recordings, ["zh-CN"], jobs=1, use_cache=False)[1] == 1
@@ -0,0 +1,98 @@
+"""pack_audio.py: pack build, catalog offsets, memory-mapped read-back, rebuild on change, and verify."""
+import hashlib, json
+
+import pytest
+
+from pack_audio import AudioPack, build_pack, update_packs, verify
+from vocab import iter_cards, load_index
+
+DECK = "hanzi,pinyin,english,locale\n一,yī,one,\n二,èr,two,\n一,yī,a / an,\n三,sān,three,\nhello,,hallo,en-GB\n"
+
+
+@pytest.fixture
+def data(tmp_path):
+    d = tmp_path / "data"
+    for loc in ("zh-CN", "en-GB"):
+        (d / "recordings" / loc).mkdir(parents=True)
+    (d / "deck.csv").write_text(DECK, encoding="utf-8")
+    (d / "empty.csv").write_text("hanzi,pinyin,english\n四,sì,four\n", encoding="utf-8")
+    (d / "vocab.csv").write_text("filename,display_name,description,locale\n"
+                                 "deck.csv,Deck,,zh-CN\nempty.csv,Empty,,zh-CN\n", encoding="utf-8")
+    # distinct sizes, so a wrong offset cannot read back the right bytes; 三 has no recording
+    for i, (loc, word) in enumerate([("zh-CN", "一"), ("zh-CN", "二"), ("en-GB", "hello")]):
+        (d / "recordings" / loc / f"{word}.wav").write_bytes(f"RIFF-{word}-".encode() + bytes([i]) * (100 + 37 * i))
+    return d
+
+def deck(data, name="deck.csv"):
+    return next(d for d in load_index(data / "vocab.csv") if d.filename == name)
+
+def source(data, name):
+    loc, hanzi = name.split("/", 1)
+    return (data / "recordings" / loc / f"{hanzi}.wav").read_bytes()
+
+
+def test_clips_are_packed_in_card_order_with_contiguous_offsets(data):
+    info = build_pack(deck(data), data / "recordings", data / "packs")
+    assert info["_status"] == "built" and info["_missing"] == 1
+    assert [c[2] for c in info["clips"]] == ["zh-CN/一", "zh-CN/二", "en-GB/hello"]  # each word once
+    offset = 0
+    for off, length, name in info["clips"]:
+        assert off == offset and length == len(source(data, name))
+        offset += length
+    pack = (data / "packs" / "deck.audiopack").read_bytes()
+    assert info["size"] == len(pack) == offset
+    assert info["hash"] == hashlib.sha256(pack).hexdigest()[:16]
+    cards = {c.hanzi + "|" + c.english: c.id for c in iter_cards(data / "deck.csv")}
+    assert info["cards"] == {cards["一|one"]: 0, cards["二|two"]: 1, cards["一|a / an"]: 0, cards["hello|hallo"]: 2}
+    assert json.loads((data / "packs" / "deck.audiopack.json").read_text(encoding="utf-8")) == \
+        {k: v for k, v in info.items() if not k.startswith("_")}
+
+def test_memory_mapped_read_back(data):
+    build_pack(deck(data), data / "recordings", data / "packs")
+    cards = {c.english: c.id for c in iter_cards(data / "deck.csv")}
+    with AudioPack(data / "packs" / "deck.audiopack.json") as pack:
+        assert bytes(pack.get(cards["two"])) == source(data, "zh-CN/二")
+        assert bytes(pack.get(cards["a / an"])) == bytes(pack.get(cards["one"])) == source(data, "zh-CN/一")
+        assert bytes(pack.get_word("en-GB", "hello")) == source(data, "en-GB/hello")
+        assert pack.get(cards["three"]) is None and pack.get_word("zh-CN", "三") is None
+        assert [bytes(pack.clip(n)) for n in range(3)] == [source(data, c[2]) for c in pack.index["clips"]]
+
+def test_rebuilds_only_when_a_clip_changes(data):
+    rec, out = data / "recordings", data / "packs"
+    build_pack(deck(data), rec, out)
+    assert build_pack(deck(data), rec, out)["_status"] == "up to date"
+    assert build_pack(deck(data), rec, out, force=True)["_status"] == "built"
+    (rec / "zh-CN" / "三.wav").write_bytes(b"RIFF-three")
+    info = build_pack(deck(data), rec, out)
+    assert info["_status"] == "built" and info["_missing"] == 0 and len(info["clips"]) == 4
+    with AudioPack(out / "deck.audiopack.json") as pack:
+        assert bytes(pack.get_word("zh-CN", "三")) == b"RIFF-three"
+
+def test_verify_finds_changed_sources(data, capsys):
+    rec, out = data / "recordings", data / "packs"
+    build_pack(deck(data), rec, out)
+    assert verify(out / "deck.audiopack.json", rec) == 0
+    (rec / "zh-CN" / "二.wav").write_bytes(b"RIFF-changed")
+    (rec / "en-GB" / "hello.wav").unlink()
+    assert verify(out / "deck.audiopack.json", rec) == 2
+    assert "MISMATCH zh-CN/二" in capsys.readouterr().out
+
+def test_catalog_lists_decks_with_recordings(data):
+    out = data / "packs"
+    assert update_packs(load_index(data / "vocab.csv"), data / "recordings", out, check=True) == 0
+    catalog = json.loads((out / "index.json").read_text(encoding="utf-8"))
+    index = json.loads((out / "deck.audiopack.json").read_text(encoding="utf-8"))
+    assert catalog["packs"] == {"deck.csv": {"index": "deck.audiopack.json", "pack": "deck.audiopack",
+                                             "size": index["size"], "clips": 3, "hash": index["hash"]}}
+    assert not (out / "empty.audiopack").exists()
+
+def test_cli_verify_and_unknown_deck(data, run_tool):
+    args = ("--index", data / "vocab.csv", "--recordings", data / "recordings", "--out", data / "packs")
+    r = run_tool("pack_audio.py", "deck.csv", "--verify", *args)
+    assert r.returncode == 0, r.stderr
+    assert "Verify: OK" in r.stdout
+    (data / "packs" / "deck.audiopack").write_bytes(b"x" * (data / "packs" / "deck.audiopack").stat().st_size)
+    r = run_tool("pack_audio.py", "deck.csv", "--verify", *args)
+    assert r.returncode == 1 and "3 mismatching clips" in r.stdout
+    r = run_tool("pack_audio.py", "nope.csv", *args)
+    assert r.returncode == 1 and "not in" in r.stderr
@@ -0,0 +1,61 @@
+"""precompute_pitch.py: tracker accuracy on the sinoid presets, pack round trip, reuse of unchanged clips, and
+invalidation when the tracker settings change."""
+import shutil
+
+import numpy as np
+import pytest
+
+from audio_io import write_wav_pcm16
+from generate_sinoid import CONT_PRESETS, SR, f0_track, generate_continuous
+from pitch import DEFAULTS, yin
+from precompute_pitch import process_locale, read_pack
+
+OPTS = {k: DEFAULTS[k] for k in ("fmin", "fmax", "hop_ms", "threshold")}
+
+
+@pytest.fixture
+def locale_dir(tmp_path):
+    d = tmp_path / "xx-TEST"
+    d.mkdir()
+    for cfg in CONT_PRESETS[:2]:
+        write_wav_pcm16(d / f"{cfg['id']}.wav", generate_continuous(cfg), SR)
+    return d
+
+def run(d, opts=OPTS):
+    return process_locale(d, d.parent / f"{d.name}.f0pack", opts, jobs=1, force=False)
+
+
+@pytest.mark.parametrize("cfg", CONT_PRESETS, ids=lambda c: c["id"])
+def test_tracker_follows_known_f0(cfg):
+    """YIN on each continuous preset: over 90% of frames voiced, median error within 20 cents of the true track."""
+    x = generate_continuous(cfg)
+    truth = f0_track(cfg, len(x))
+    if cfg.get("vibratoHz") and cfg.get("vibratoDepth"):
+        truth = truth * (1.0 + cfg["vibratoDepth"] * np.sin(2 * np.pi * cfg["vibratoHz"] * np.arange(len(x)) / SR))
+    r = yin(x, SR, **OPTS)
+    expected = truth[np.clip((r["times"] * SR).astype(int), 0, len(x) - 1)]
+    voiced = r["f0"] > 0
+    assert voiced.mean() > 0.9
+    assert np.median(1200 * np.abs(np.log2(r["f0"][voiced] / expected[voiced]))) <= 20.0
+
+def test_pack_round_trip_and_reuse(locale_dir):
+    assert run(locale_dir)[:2] == (2, 2)
+    index, data = read_pack(locale_dir.parent / "xx-TEST.f0pack")
+    assert index["opts"] == OPTS and set(data) == {"sinoid-t1", "sinoid-t2"}
+    f0 = data["sinoid-t1"][0]
+    assert np.median(f0[f0 > 0]) == pytest.approx(220, rel=0.02)
+    assert run(locale_dir)[:2] == (2, 0)
+
+@pytest.mark.parametrize("key", ["fmin", "fmax", "threshold", "hop_ms"])
+def test_changed_settings_reanalyse(locale_dir, key):
+    run(locale_dir)
+    changed = dict(OPTS, **{key: OPTS[key] * 1.2})
+    assert run(locale_dir, changed)[:2] == (2, 2)
+    assert read_pack(locale_dir.parent / "xx-TEST.f0pack")[0]["opts"] == changed
+
+def test_same_word_in_two_files_prefers_wav(locale_dir, capsys):
+    shutil.copy(locale_dir / "sinoid-t1.wav", locale_dir / "sinoid-t1.mp3")
+    total, _, failed = run(locale_dir)
+    assert total == 2 and not failed
+    assert "are the same word; using sinoid-t1.wav" in capsys.readouterr().out
+    assert read_pack(locale_dir.parent / "xx-TEST.f0pack")[0]["clips"]["sinoid-t1"]["file"] == "sinoid-t1.wav"
@@ -0,0 +1,120 @@
+"""serve.py: dot-files stay private, content negotiation, conditional and range requests, cache headers."""
+import gzip, http.client, os, threading, time
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+
+from serve import make_server, parse_accept_encoding
+
+CLIP = bytes(range(256)) * 8  # 2048 bytes, not compressible by type
+SCRIPT = "console.log('hsk');\n" * 200
+
+
+@pytest.fixture
+def server(tmp_path):
+    (tmp_path / "index.html").write_text("<h1>app</h1>", encoding="utf-8")
+    (tmp_path / ".env").write_text("OPENAI_API_KEY=sk-secret\n", encoding="utf-8")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "config").write_text("[core]\n", encoding="utf-8")
+    (tmp_path / "data" / ".hidden").mkdir(parents=True)
+    (tmp_path / "data" / ".hidden" / "a.csv").write_text("x,y,z\n", encoding="utf-8")
+    (tmp_path / "data" / "hsk1.csv").write_text("x,y,z\n", encoding="utf-8")
+    (tmp_path / "data" / "clip.wav").write_bytes(CLIP)
+    (tmp_path / "app.js").write_text(SCRIPT, encoding="utf-8")
+    (tmp_path / "app.0123abcd.js").write_text(SCRIPT, encoding="utf-8")
+    bundle = tmp_path / "data" / "bundle.json"
+    bundle.write_text('{"decks": []}', encoding="utf-8")
+    (tmp_path / "data" / "bundle.json.gz").write_bytes(b"gz sidecar")
+    (tmp_path / "data" / "bundle.json.br").write_bytes(b"br sidecar")
+    past = time.time() - 60
+    os.utime(bundle, (past, past))
+    srv = make_server(tmp_path, port=0)
+    threading.Thread(target=srv.serve_forever, args=(0.05,), daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+@pytest.mark.parametrize("path", ["/.env", "/.git/config", "/.git/", "/data/.hidden/a.csv", "/%2Eenv",
+                                  "/data/..%2F.env", "/data/%2E%2E/.env", "/data/..%5C.env"])
+def test_dotfiles_are_not_served(server, path):
+    r = requests.get(server + path)
+    assert r.status_code == 404 and b"sk-secret" not in r.content
+
+def test_regular_files_are_served(server):
+    assert requests.get(server + "/").text == "<h1>app</h1>"
+    assert requests.get(server + "/data/hsk1.csv").status_code == 200
+
+
+def get(base, path, **headers):
+    """Raw GET (no automatic Accept-Encoding or decoding) → (status, headers, body)."""
+    u = urlsplit(base)
+    conn = http.client.HTTPConnection(u.hostname, u.port, timeout=10)
+    conn.putrequest("GET", path, skip_accept_encoding=True)
+    for k, v in headers.items():
+        conn.putheader(k.replace("_", "-"), v)
+    conn.endheaders()
+    r = conn.getresponse()
+    out = r.status, {k.lower(): v for k, v in r.getheaders()}, r.read()
+    conn.close()
+    return out
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip;q=0") == {"gzip": 0.0}
+    assert parse_accept_encoding("identity, gzip;q=0") == {"identity": 1.0, "gzip": 0.0}
+    assert parse_accept_encoding(" br;q=0.5 , GZIP") == {"br": 0.5, "gzip": 1.0}
+    assert parse_accept_encoding("") == {}
+
+@pytest.mark.parametrize("accept", ["", "gzip;q=0", "identity, gzip;q=0", "br", "*;q=0"])
+def test_gzip_only_when_acceptable(server, accept):
+    status, h, body = get(server, "/app.js", Accept_Encoding=accept)
+    assert status == 200 and "content-encoding" not in h and body.decode() == SCRIPT
+    assert h["vary"] == "Accept-Encoding"
+
+@pytest.mark.parametrize("accept", ["gzip", "deflate, gzip;q=0.8", "*"])
+def test_gzip_in_memory(server, accept):
+    status, h, body = get(server, "/app.js", Accept_Encoding=accept)
+    assert status == 200 and h["content-encoding"] == "gzip"
+    assert gzip.decompress(body).decode() == SCRIPT and "accept-ranges" not in h
+
+@pytest.mark.parametrize("accept, expected", [("gzip, br", b"br sidecar"), ("gzip", b"gz sidecar"),
+                                              ("br;q=0.5, gzip", b"gz sidecar"), ("br, gzip;q=0", b"br sidecar"),
+                                              ("br;q=0, gzip;q=0", b'{"decks": []}')])
+def test_sidecar_selection(server, accept, expected):
+    status, h, body = get(server, "/data/bundle.json", Accept_Encoding=accept)
+    assert status == 200 and body == expected
+    assert h.get("content-encoding", "identity") == {b"br sidecar": "br", b"gz sidecar": "gzip"}.get(body, "identity")
+
+def test_etag_per_encoding_and_304(server):
+    _, plain, _ = get(server, "/data/bundle.json")
+    _, gz, _ = get(server, "/data/bundle.json", Accept_Encoding="gzip")
+    assert plain["etag"] != gz["etag"]
+    status, h, body = get(server, "/data/bundle.json", Accept_Encoding="gzip", If_None_Match=gz["etag"])
+    assert status == 304 and body == b"" and h["etag"] == gz["etag"]
+    assert get(server, "/data/bundle.json", If_None_Match=gz["etag"])[0] == 200  # other representation
+    assert get(server, "/data/bundle.json", If_None_Match=f'"nope", {plain["etag"]}')[0] == 304
+    assert get(server, "/data/bundle.json", If_Modified_Since=plain["last-modified"])[0] == 304
+
+@pytest.mark.parametrize("rng, start, end", [("bytes=0-99", 0, 99), ("bytes=100-", 100, 2047),
+                                             ("bytes=-10", 2038, 2047), ("bytes=2000-5000", 2000, 2047),
+                                             ("bytes=-5000", 0, 2047)])
+def test_ranges(server, rng, start, end):
+    status, h, body = get(server, "/data/clip.wav", Range=rng)
+    assert status == 206 and body == CLIP[start:end + 1]
+    assert h["content-range"] == f"bytes {start}-{end}/{len(CLIP)}" and h["content-length"] == str(end - start + 1)
+
+@pytest.mark.parametrize("rng", ["bytes=2048-", "bytes=5000-6000", "bytes=-0"])
+def test_unsatisfiable_range(server, rng):
+    status, h, _ = get(server, "/data/clip.wav", Range=rng)
+    assert status == 416 and h["content-range"] == f"bytes */{len(CLIP)}"
+
+def test_if_range(server):
+    etag = get(server, "/data/clip.wav")[1]["etag"]
+    assert get(server, "/data/clip.wav", Range="bytes=0-9", If_Range=etag)[2] == CLIP[:10]
+    status, _, body = get(server, "/data/clip.wav", Range="bytes=0-9", If_Range='"stale"')
+    assert status == 200 and body == CLIP
+
+def test_cache_control(server):
+    assert get(server, "/app.js")[1]["cache-control"] == "no-cache"
+    assert "immutable" in get(server, "/app.js?v=abc123")[1]["cache-control"]
+    assert "immutable" in get(server, "/app.0123abcd.js")[1]["cache-control"]
@@ -0,0 +1,55 @@
+"""Export parsing and ingest in session_stats.py, on the app's own fixture export."""
+import json, sqlite3
+from collections import Counter
+
+from conftest import REPO
+from session_stats import connect, ingest_file, iter_export
+
+SIMPLE = REPO / "fixtures" / "simple.json"
+
+
+def sessions(con):
+    return dict(con.execute("SELECT id, locale FROM sessions"))
+
+def test_iter_export_kinds():
+    assert Counter(kind for kind, _ in iter_export(SIMPLE)) == {"summary": 2, "session": 2}
+
+def test_ingest_simple_export(tmp_path):
+    con = connect(tmp_path / "s.sqlite")
+    assert ingest_file(con, SIMPLE)[:2] == (2, 2)
+    got = sessions(con)
+    assert len(got) == 2
+    assert got["vocab_eng_oliver_1755588431038"] == "en-US"
+    assert got["5cd29480"] == "zh-CN"
+    assert ingest_file(con, SIMPLE)[1] == 0  # already known
+
+def test_summaries_only_export_adds_no_sessions(tmp_path):
+    doc = json.loads(SIMPLE.read_text(encoding="utf-8"))
+    path = tmp_path / "flash_sessions_summaries.json"
+    path.write_text(json.dumps({"version": 1, "summaries": doc["summaries"]}), encoding="utf-8")
+    con = connect(tmp_path / "s.sqlite")
+    assert ingest_file(con, path) == (0, 0, 0)
+    assert sessions(con) == {}
+
+def test_summary_after_sessions_still_sets_locale(tmp_path):
+    doc = json.loads(SIMPLE.read_text(encoding="utf-8"))
+    path = tmp_path / "flash_sessions_reordered.json"
+    path.write_text(json.dumps({"version": 1, "sessions": doc["sessions"], "summaries": doc["summaries"]}), encoding="utf-8")
+    con = connect(tmp_path / "s.sqlite")
+    ingest_file(con, path)
+    assert sessions(con)["vocab_eng_oliver_1755588431038"] == "en-US"
+
+def test_invalid_export_does_not_drop_the_deck_mapping(tmp_path, run_tool):
+    bad = tmp_path / "flash_sessions_bad.json"
+    bad.write_text('{"version": 1, "sessions": [{"id": "x", ', encoding="utf-8")
+    counts = {}
+    for name, files in (("good", [SIMPLE]), ("bad_first", [bad, SIMPLE])):
+        db = tmp_path / f"{name}.sqlite"
+        r = run_tool("session_stats.py", "--db", db, "ingest", *files, "--index", REPO / "data" / "vocab.csv")
+        assert r.returncode == 0, r.stderr
+        con = sqlite3.connect(db)
+        counts[name] = con.execute("SELECT COUNT(*), COUNT(deck) FROM cards").fetchone()
+        con.close()
+    assert "SKIP flash_sessions_bad.json" in r.stdout
+    assert counts["bad_first"] == counts["good"]
+    assert counts["good"][1] > 1000
@@ -0,0 +1,72 @@
+"""splitter.py against audio with known word boundaries: sinoid segment presets and synthetic batches."""
+import numpy as np
+import pytest
+
+from generate_sinoid import CONT_PRESETS, SEG_PRESETS, SR, generate_continuous, generate_segments
+from splitter import split_on_silence
+
+TOL_S = 0.012
+
+
+def max_boundary_error(x, truth, **kw):
+    got = split_on_silence(x, SR, len(truth), pad_ms=0.0, **kw)
+    assert got is not None, "no clean split"
+    return max(max(abs(a / SR - ta), abs(b / SR - tb)) for (a, b), (ta, tb) in zip(got, truth))
+
+def words():
+    return [generate_continuous(c) for c in CONT_PRESETS[:4]]
+
+
+@pytest.mark.parametrize("preset", SEG_PRESETS, ids=lambda p: p["id"])
+def test_segment_presets(preset):
+    """Tones between known silences (down to the 50 ms gaps of the pulse train)."""
+    x = generate_segments(preset["segments"], preset.get("clicks", False))
+    truth, t, cur = [], 0.0, None
+    for dur, hz in preset["segments"]:
+        if hz:
+            cur = (cur[0], t + dur / 1000) if cur else (t, t + dur / 1000)
+        elif cur:
+            truth.append(cur)
+            cur = None
+        t += dur / 1000
+    if cur:
+        truth.append(cur)
+    gaps = [d for d, hz in preset["segments"] if not hz]
+    assert max_boundary_error(x, truth, min_gap_ms=min(gaps + [150]) * 0.8) <= TOL_S
+
+@pytest.mark.parametrize("k", [2, 4, 8])
+def test_synthetic_batch(k):
+    """Words with 400 ms pauses, every third one with a 60 ms pause inside it, over a -70 dB noise floor."""
+    ws, rng = words(), np.random.default_rng(0)
+    parts, truth, t = [np.zeros(int(0.2 * SR))], [], 0.2
+    for i in range(k):
+        w = ws[i % len(ws)]
+        if i % 3 == 2:
+            w = np.concatenate([w[: len(w) // 2], np.zeros(int(0.06 * SR)), w[len(w) // 2:]])
+        parts += [w, np.zeros(int(0.4 * SR))]
+        truth.append((t, t + len(w) / SR))
+        t += len(w) / SR + 0.4
+    x = np.concatenate(parts)
+    x = x + rng.normal(0, 10 ** (-70 / 20), len(x))
+    assert max_boundary_error(x, truth) <= TOL_S
+
+def test_wrong_count_is_rejected():
+    ws = words()
+    x = np.concatenate([ws[0], np.zeros(int(0.4 * SR)), ws[1]])
+    assert split_on_silence(x, SR, 3) is None
+
+def test_ambiguous_gaps_are_rejected():
+    """An intra-word pause nearly as long as the word boundary must not be guessed at."""
+    ws = words()
+    x = np.concatenate([ws[0], np.zeros(int(0.30 * SR)), ws[1], np.zeros(int(0.25 * SR)), ws[2]])
+    assert split_on_silence(x, SR, 2) is None
+
+def test_padding_stays_inside_the_audio():
+    ws = words()
+    x = np.concatenate([ws[0], np.zeros(int(0.4 * SR)), ws[1]])
+    spans = split_on_silence(x, SR, 2, pad_ms=40.0)
+    assert spans is not None and spans[0][0] == 0 and spans[-1][1] == len(x)
+
+def test_silence_and_empty_input():
+    assert split_on_silence(np.zeros(SR), SR, 1) is None
+    assert split_on_silence(np.zeros(0), SR, 1) is None
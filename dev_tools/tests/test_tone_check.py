@@ -0,0 +1,66 @@
+"""tone_check.py: expected tones from pinyin, sandhi, and the shape classifier on the sinoid tone contours."""
+import numpy as np
+import pytest
+
+from generate_sinoid import CONT_PRESETS, SR, generate_continuous
+from tone_check import SUSPECT_SCORE, check_samples, classify, pinyin_tones, sandhi
+
+SHAPES = {"sinoid-t1": "flat", "sinoid-t2": "rise", "sinoid-t3": "dip", "sinoid-t4": "fall",
+          "sinoid-t2-vib": "rise", "sinoid-t4-rich": "fall"}
+TONE = {"flat": 1, "rise": 2, "dip": 3, "fall": 4}
+GAP = np.zeros(int(0.06 * SR))  # short unvoiced gap between the syllables of a word
+
+
+@pytest.fixture(scope="module")
+def clips():
+    presets = {c["id"]: c for c in CONT_PRESETS}
+    return {pid: generate_continuous(presets[pid]) for pid in SHAPES}
+
+@pytest.mark.parametrize("pinyin, tones", [
+    ("ài hù", [4, 4]), ("nǐ hǎo", [3, 3]), ("nǐhǎo", [3, 3]), ("ni3 hao3", [3, 3]), ("ni3hao3", [3, 3]),
+    ("Xī'ān", [1, 1]), ("xiān", [1]), ("lǜsè", [4, 4]), ("nǚ", [3]), ("ma", [5]), ("yī-èr", [1, 4]),
+    # neutral syllables joined to the previous one
+    ("māma", [1, 5]), ("bāozi", [1, 5]), ("dōngxi", [1, 5]), ("piàoliang", [4, 5]), ("bù kèqi", [4, 4, 5]),
+    ("yìdiǎnr", [4, 3]),
+])
+def test_pinyin_tones(pinyin, tones):
+    assert pinyin_tones(pinyin) == tones
+
+@pytest.mark.parametrize("tones, hanzi, surface", [
+    ([3, 3], "你好", [2, 3]),
+    ([3, 3, 3], "", [6, 2, 3]),       # right to left: (3 (3 3)) → half third, 2, 3
+    ([3, 4], "", [6, 4]),             # half third before another syllable
+    ([3, 5], "", [3, 5]),             # ... but not before a neutral one
+    ([4, 4], "不是", [2, 4]),
+    ([4, 2], "不行", [4, 2]),
+    ([1, 4], "一样", [2, 4]),
+    ([1, 2], "一年", [4, 2]),
+    ([1, 4], "一", [1, 4]),           # characters do not line up with the syllables: no 一 sandhi
+])
+def test_sandhi(tones, hanzi, surface):
+    assert sandhi(tones, hanzi) == surface
+
+@pytest.mark.parametrize("y, shape", [
+    (np.zeros(40), "flat"), (np.linspace(-3, 3, 40), "rise"), (np.linspace(3, -4, 40), "fall"),
+    (np.concatenate([np.linspace(0, -4, 20), np.linspace(-4, 0, 20)]), "dip"), (np.full(3, 5.0), "flat"),
+])
+def test_classify(y, shape):
+    assert classify(np.concatenate([[np.nan] * 3, y, [np.nan] * 3]))[0] == shape
+
+@pytest.mark.parametrize("pid", SHAPES)
+def test_sinoid_contours(clips, pid):
+    r = check_samples(clips[pid], SR, [TONE[SHAPES[pid]]])
+    assert r["shapes"] == [SHAPES[pid]] and r["score"] == 0
+
+@pytest.mark.parametrize("parts, tones", [(["sinoid-t2", "sinoid-t4"], [2, 4]), (["sinoid-t1", "sinoid-t3"], [1, 3]),
+                                          (["sinoid-t4", "sinoid-t1"], [4, 1]), (["sinoid-t4", "sinoid-t4"], [6, 4])])
+def test_two_syllable_words(clips, parts, tones):
+    assert check_samples(np.concatenate([clips[parts[0]], GAP, clips[parts[1]]]), SR, tones)["score"] == 0
+
+def test_wrong_take_is_suspect(clips):
+    x = np.concatenate([clips["sinoid-t4"], GAP, clips["sinoid-t2"]])
+    assert check_samples(x, SR, [1, 3])["score"] >= SUSPECT_SCORE
+
+def test_neutral_syllable_is_not_scored(clips):
+    x = np.concatenate([clips["sinoid-t1"], GAP, clips["sinoid-t4"]])
+    assert check_samples(x, SR, sandhi(pinyin_tones("māma")))["score"] == 0
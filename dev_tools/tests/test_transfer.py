@@ -0,0 +1,84 @@
+"""transfer.py: TTS file names, exact word matching, take preference, and the recordings manifest."""
+import json
+
+import numpy as np
+import pytest
+
+import transfer
+from audio_io import encode_wav_pcm16
+from transfer import build_recordings_manifest, index_dir, parse_tts_name, pick, place
+
+
+def wav(seconds: float, level: float = 0.1) -> bytes:
+    return encode_wav_pcm16(np.full(int(24000 * seconds), level, dtype=np.float32), 24000)
+
+@pytest.mark.parametrize("name, parsed", [
+    ("一__alloy__gpt-4o-mini-tts.wav", ("一", "alloy", "gpt-4o-mini-tts")),
+    ("a__b__verse__tts-1.wav", ("a__b", "verse", "tts-1")),
+    ("一旦.wav", ("一旦", None, None)),
+    ("x__alloy.wav", ("x__alloy", None, None)),
+])
+def test_parse_tts_name(name, parsed):
+    assert parse_tts_name(name) == parsed
+
+def test_index_dir_matches_whole_words(tmp_path):
+    for name in ("一__alloy__tts-1.wav", "一旦__alloy__tts-1.wav", "一__verse__tts-1.wav", ".一__x__y.wav", "一.txt"):
+        (tmp_path / name).write_bytes(b"RIFF")
+    index = index_dir(tmp_path)
+    assert sorted(index) == ["一", "一旦"]
+    assert sorted(v for v, _, _ in index["一"]) == ["alloy", "verse"]
+    assert [p.name for _, _, p in index["一旦"]] == ["一旦__alloy__tts-1.wav"]
+
+def test_pick_follows_voice_then_model_preference(tmp_path):
+    cands = [(v, m, tmp_path / f"w__{v}__{m}.wav") for v, m in
+             [("alloy", "tts-1"), ("verse", "tts-1"), ("verse", "gpt-4o-mini-tts"), ("nova", "tts-1-hd")]]
+    assert pick(cands, ["verse"], [])[:2] == ("verse", "gpt-4o-mini-tts")  # ties by name
+    assert pick(cands, ["verse"], ["tts-1"])[:2] == ("verse", "tts-1")
+    assert pick(cands, ["shimmer", "nova"], [])[:2] == ("nova", "tts-1-hd")
+    assert pick(cands, [], ["tts-1-hd"])[:2] == ("nova", "tts-1-hd")
+    assert pick(cands, [], [])[:2] == ("alloy", "tts-1")
+
+def test_transfer_places_preferred_takes_and_writes_manifest(tmp_path, run_tool):
+    tts, rec = tmp_path / "tts", tmp_path / "data" / "recordings"
+    tts.mkdir()
+    (tmp_path / "deck.csv").write_text("hanzi,pinyin,english\n一,yī,one\n一旦,yídàn,once\n二,èr,two\n", encoding="utf-8")
+    takes = {"一__alloy__tts-1.wav": wav(0.1), "一__verse__tts-1.wav": wav(0.2), "一旦__alloy__tts-1.wav": wav(0.3)}
+    for name, data in takes.items():
+        (tts / name).write_bytes(data)
+    r = run_tool("transfer.py", "deck.csv", tts, rec / "zh-CN", "--voice", "verse")
+    assert r.returncode == 0, r.stderr
+    assert "Missing: 二" in r.stdout
+    assert (rec / "zh-CN" / "一.wav").read_bytes() == takes["一__verse__tts-1.wav"]
+    assert (rec / "zh-CN" / "一旦.wav").read_bytes() == takes["一旦__alloy__tts-1.wav"]
+    manifest = json.loads((rec / "manifest.json").read_text(encoding="utf-8"))
+    words = manifest["locales"]["zh-CN"]
+    assert sorted(words) == ["一", "一旦"]
+    assert words["一"]["file"] == "一.wav" and words["一"]["container"] == "wav"
+    assert words["一"]["duration"] == pytest.approx(0.2, abs=0.001) and words["一旦"]["duration"] == pytest.approx(0.3, abs=0.001)
+    assert words["一"]["size"] == len(takes["一__verse__tts-1.wav"])
+    r = run_tool("transfer.py", "deck.csv", tts, rec / "zh-CN", "--voice", "verse")
+    assert "same=2" in r.stdout  # already in place: nothing rewritten
+
+def test_manifest_smallest_file_wins_and_unchanged_entries_are_reused(tmp_path, monkeypatch):
+    loc = tmp_path / "zh-CN"
+    loc.mkdir()
+    (loc / "好.wav").write_bytes(wav(0.5))
+    (loc / "好.mp3").write_bytes(b"ID3" + bytes(20))
+    (loc / "你.wav").write_bytes(wav(0.25))
+    (tmp_path / ".git").mkdir()
+    first = build_recordings_manifest(tmp_path)
+    assert list(first["locales"]) == ["zh-CN"]
+    assert first["locales"]["zh-CN"]["好"]["file"] == "好.mp3"
+    monkeypatch.setattr(transfer, "probe", lambda path: pytest.fail(f"re-probed {path}"))
+    assert build_recordings_manifest(tmp_path, first)["locales"] == first["locales"]
+
+def test_place_counts_and_quiet_mode(tmp_path, capsys):
+    tts, out = tmp_path / "tts", tmp_path / "out"
+    tts.mkdir(); out.mkdir()
+    (tts / "一__alloy__tts-1.wav").write_bytes(wav(0.1))
+    (tts / "一__verse__tts-1.wav").write_bytes(wav(0.2))
+    counts = place(["一", "二"], index_dir(tts), out, ["verse"], [], verbose=False)
+    assert counts.pop("missing") == 1 and sum(counts.values()) == 1
+    assert (out / "一.wav").read_bytes() == (tts / "一__verse__tts-1.wav").read_bytes()
+    assert capsys.readouterr().out == ""
+    assert place(["一"], index_dir(tts), out, ["verse"], [], verbose=False) == {"same": 1}
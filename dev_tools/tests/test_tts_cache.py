@@ -0,0 +1,94 @@
+"""tts_cache.py: cache keys, the blob store, the rebuild manifest, and incremental reruns of make_tts_from_csv.py."""
+import json, os, time
+
+from fake_tts_server import serve
+from tts_cache import Manifest, SynthesisCache, cache_key
+
+BASE = dict(text="你好", model="gpt-4o-mini-tts", voice="alloy", instructions="clear", fmt="wav")
+
+
+def test_cache_key_depends_on_every_input():
+    k = cache_key(**BASE)
+    assert k == cache_key(**BASE)
+    for field, other in (("text", "您好"), ("model", "tts-1"), ("voice", "verse"), ("instructions", "slow"), ("fmt", "mp3"),
+                         ("batch", "list of 8")):
+        assert cache_key(**dict(BASE, **{field: other})) != k, field
+
+def test_put_has_materialize(tmp_path):
+    cache = SynthesisCache(tmp_path / "cache")
+    key = cache_key(**BASE)
+    assert not cache.has(key)
+    p = cache.put(key, b"RIFF data")
+    assert cache.has(key) and p == cache.path_for(key) and p.parent.name == key[:2]
+    dst = tmp_path / "out" / "你好.wav"
+    dst.parent.mkdir()
+    assert cache.materialize(key, dst) in ("link", "reflink", "copy")
+    assert dst.read_bytes() == b"RIFF data"
+
+def test_sweep_partials_keeps_recent_ones(tmp_path):
+    cache = SynthesisCache(tmp_path)
+    (tmp_path / "ab").mkdir()
+    old, new = tmp_path / "ab" / ".x.wav.1.part", tmp_path / "ab" / ".y.wav.2.part"
+    old.write_bytes(b"1")
+    new.write_bytes(b"2")
+    past = time.time() - 7200
+    os.utime(old, (past, past))
+    assert cache.sweep_partials() == 1
+    assert not old.exists() and new.exists()
+
+def test_manifest_freshness_and_shard_merge(tmp_path):
+    out = tmp_path / "a.wav"
+    out.write_bytes(b"x")
+    m1, m2 = Manifest(tmp_path / "manifest.json"), Manifest(tmp_path / "manifest.json")
+    assert not m1.is_fresh(out, "k1")
+    m1.record(out, "k1", "a")
+    assert m1.is_fresh(out, "k1") and not m1.is_fresh(out, "k2")
+    (tmp_path / "b.wav").write_bytes(b"y")
+    m2.record(tmp_path / "b.wav", "k2", "b")
+    m1.save()
+    m2.save()  # a second shard must not drop the first one's entries
+    entries = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))["entries"]
+    assert set(entries) == {"a.wav", "b.wav"}
+    out.unlink()
+    assert not Manifest(tmp_path / "manifest.json").is_fresh(out, "k1")
+
+
+def test_edited_row_is_the_only_one_synthesized_again(run_tool, tmp_path):
+    rows = [f"词{i},cí,word {i}" for i in range(10)]
+    csv_path = tmp_path / "w.csv"
+    csv_path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    srv = serve()
+    args = ("make_tts_from_csv.py", csv_path, "--out", "out", "--url", srv.url, "--rate", "0")
+    env = {"OPENAI_API_KEY": "dummy"}
+    try:
+        assert run_tool(*args, env=env).returncode == 0
+        assert srv.requests == 10
+        rows[3] = "新词,xīn cí,new word"
+        csv_path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+        r = run_tool(*args, env=env)
+        assert srv.requests == 11
+        assert "Up to date: 9" in r.stdout
+        # a second output directory sharing the cache is filled without requests
+        r = run_tool(*args[:3], "out2", *args[4:], "--cache-dir", "out/.tts_cache", env=env)
+        assert srv.requests == 11
+        assert "From cache: 10" in r.stdout
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+def test_batch_clips_do_not_stand_in_for_single_takes(run_tool, tmp_path):
+    csv_path = tmp_path / "w.csv"
+    csv_path.write_text("".join(f"词{i},cí,word {i}\n" for i in range(8)), encoding="utf-8")
+    srv = serve()
+    args = ("make_tts_from_csv.py", csv_path, "--url", srv.url, "--rate", "0", "--cache-dir", "cache")
+    env = {"OPENAI_API_KEY": "dummy"}
+    try:
+        r = run_tool(*args, "--out", "batched", "--batch", "4", env=env)
+        assert r.returncode == 0 and srv.requests == 2, r.stdout
+        r = run_tool(*args, "--out", "single", env=env)
+        assert "From cache: 0" in r.stdout and srv.requests == 10
+        r = run_tool(*args, "--out", "batched2", "--batch", "4", env=env)
+        assert "From cache: 8" in r.stdout and srv.requests == 10
+    finally:
+        srv.shutdown()
+        srv.server_close()
@@ -0,0 +1,117 @@
+"""make_tts_from_csv.py against fake_tts_server.py: retries, failure accounting, bounded concurrency, reruns."""
+import json, threading, time
+
+import pytest
+import requests
+
+from fake_tts_server import serve
+from tts_engine import TokenBucket, run_bounded
+
+N_WORDS = 20
+
+
+@pytest.fixture
+def words_csv(tmp_path):
+    p = tmp_path / "words.csv"
+    p.write_text("hanzi,pinyin,english\n" + "".join(f"词{i},cí,word {i}\n" for i in range(N_WORDS)), encoding="utf-8")
+    return p
+
+def tts(run_tool, srv, csv_path, *args):
+    r = run_tool("make_tts_from_csv.py", csv_path, "--out", "out", "--url", srv.url, "--rate", "0", *args,
+                 env={"OPENAI_API_KEY": "dummy"})
+    assert r.returncode == 0, r.stderr
+    return r, json.loads((csv_path.parent / "out" / "metrics.json").read_text(encoding="utf-8"))
+
+def stop(srv):
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_failures_without_retries_are_counted(run_tool, words_csv):
+    srv = serve(fail_rate=0.3, retry_after=0.01, seed=1)
+    try:
+        _, m = tts(run_tool, srv, words_csv, "--workers", "3", "--retries", "0")
+    finally:
+        stop(srv)
+    assert srv.failures > 0
+    assert m["rows"]["failed"] == srv.failures
+    assert m["rows"]["ok"] == N_WORDS - srv.failures
+    assert sum(m["errors"].values()) == srv.failures
+    assert m["requests"]["attempts"] == srv.requests == N_WORDS
+    assert m["requests"]["retries"] == 0
+
+def test_retries_recover_injected_failures(run_tool, words_csv):
+    srv = serve(fail_rate=0.3, retry_after=0.01, seed=2)
+    try:
+        _, m = tts(run_tool, srv, words_csv, "--workers", "3", "--retries", "8")
+    finally:
+        stop(srv)
+    assert srv.failures > 0
+    assert m["rows"]["failed"] == 0 and m["rows"]["ok"] == N_WORDS
+    assert m["requests"]["retries"] == srv.failures
+    assert m["requests"]["attempts"] == srv.requests == N_WORDS + srv.failures
+    assert len(list((words_csv.parent / "out").glob("*.wav"))) == N_WORDS
+
+def test_in_flight_requests_never_exceed_workers(run_tool, words_csv):
+    srv = serve(latency=0.05)
+    try:
+        tts(run_tool, srv, words_csv, "--workers", "3")
+    finally:
+        stop(srv)
+    assert 1 < srv.max_in_flight <= 3
+
+def test_rerun_is_a_no_op(run_tool, words_csv):
+    srv = serve()
+    try:
+        tts(run_tool, srv, words_csv, "--workers", "4")
+        first = srv.requests
+        r, _ = tts(run_tool, srv, words_csv, "--workers", "4")
+    finally:
+        stop(srv)
+    assert first == N_WORDS
+    assert srv.requests == first
+    assert f"Up to date: {N_WORDS}" in r.stdout
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+    t = time.monotonic()
+    for _ in range(11):
+        bucket.acquire()
+    assert time.monotonic() - t >= 10 / 50 * 0.9
+
+def test_token_bucket_disabled():
+    bucket = TokenBucket(rate=0)
+    assert all(bucket.acquire() == 0.0 for _ in range(1000))
+
+def test_run_bounded_keeps_at_most_n_in_flight():
+    lock, state = threading.Lock(), {"now": 0, "max": 0}
+
+    def work(x):
+        with lock:
+            state["now"] += 1
+            state["max"] = max(state["max"], state["now"])
+        time.sleep(0.01)
+        with lock:
+            state["now"] -= 1
+        if x == 7:
+            raise ValueError("boom")
+        return x * 2
+
+    out = {item: (res, err) for item, res, err in run_bounded(range(30), work, workers=4)}
+    assert state["max"] <= 4
+    assert len(out) == 30
+    assert isinstance(out[7][1], ValueError)
+    assert all(out[i] == (i * 2, None) for i in out if i != 7)
+
+def test_every_request_asks_for_wav(run_tool, words_csv):
+    """The API answers MP3 unless response_format is sent; the stand-in rejects such requests."""
+    srv = serve()
+    try:
+        r = requests.post(srv.url, json={"input": "x", "model": "m", "voice": "v"}, headers={"Authorization": "Bearer x"})
+        assert r.status_code == 400
+        _, m = tts(run_tool, srv, words_csv, "--batch", "4", "--limit", "8")
+    finally:
+        stop(srv)
+    assert m["rows"]["ok"] == 8 and m["rows"]["failed"] == 0
+    assert all(p.read_bytes()[:4] == b"RIFF" for p in (words_csv.parent / "out").glob("*.wav"))
@@ -0,0 +1,55 @@
+"""tts_journal.py: journal records, sharding, and --resume of an interrupted make_tts_from_csv.py run."""
+import json
+
+import pytest
+
+from fake_tts_server import serve
+from tts_journal import Journal, completed, in_shard, journal_name, parse_shard
+
+
+def test_completed_keeps_ok_rows_and_skips_torn_lines(tmp_path):
+    p = tmp_path / journal_name(None)
+    with Journal(p) as j:
+        j.write(row="a:1", out="a.wav", key="k1", status="ok")
+        j.write(row="a:2", out="b.wav", key="k2", status="fail", error="500")
+    with open(p, "a", encoding="utf-8") as f:
+        f.write('{"row":"a:3","out":"c.wav","key":"k3","sta')  # crash mid-write
+    done = completed([p, tmp_path / "missing.jsonl"])
+    assert set(done) == {("a.wav", "k1")}
+    assert "ts" in done[("a.wav", "k1")]
+
+@pytest.mark.parametrize("spec,expected", [(None, None), ("0/1", (0, 1)), ("2/3", (2, 3))])
+def test_parse_shard(spec, expected):
+    assert parse_shard(spec) == expected
+
+@pytest.mark.parametrize("spec", ["1", "a/b", "3/3", "-1/2", "0/0"])
+def test_parse_shard_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_shard(spec)
+
+def test_shards_partition_the_keys():
+    keys = [f"{i:064x}" for i in range(0, 10 ** 6, 7919)]
+    for n in (1, 2, 5):
+        owners = [[i for i in range(n) if in_shard(k, (i, n))] for k in keys]
+        assert all(len(o) == 1 for o in owners)
+    assert journal_name((1, 4)) == "journal.shard-1-of-4.jsonl"
+
+
+def test_resume_skips_journaled_rows(run_tool, tmp_path):
+    csv_path = tmp_path / "w.csv"
+    csv_path.write_text("".join(f"词{i},cí,word {i}\n" for i in range(8)), encoding="utf-8")
+    srv = serve()
+    env = {"OPENAI_API_KEY": "dummy"}
+    args = ("make_tts_from_csv.py", csv_path, "--out", "out", "--url", srv.url, "--rate", "0")
+    try:
+        assert run_tool(*args, env=env).returncode == 0
+        lines = (tmp_path / "out" / "journal.jsonl").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 8 and all(json.loads(l)["status"] == "ok" for l in lines)
+        # simulate a run killed before the manifest was saved and the cache was kept
+        (tmp_path / "out" / "manifest.json").unlink()
+        r = run_tool(*args, "--resume", "--cache-dir", "elsewhere", env=env)
+        assert srv.requests == 8
+        assert "Resume: 8 completed" in r.stdout and "Up to date: 8" in r.stdout
+    finally:
+        srv.shutdown()
+        srv.server_close()
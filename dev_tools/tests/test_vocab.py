@@ -0,0 +1,97 @@
+"""vocab.py and build_vocab_bundle.py must build exactly the cards js/data.js builds from the same CSV."""
+import json, os, shutil, subprocess
+from pathlib import Path
+
+import pytest
+
+from build_vocab_bundle import build_bundle
+from conftest import REPO
+from vocab import VOCAB_INDEX, iter_cards, load_index, update_index
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+# parseCsv() + rowsToCards() on each file, read the way fetch().text() does (UTF-8, BOM dropped)
+JS = """
+import { readFileSync } from 'node:fs';
+import { parseCsv, rowsToCards } from %s;
+const out = {};
+for (const p of JSON.parse(process.argv[1])) {
+  const text = readFileSync(p, 'utf8').replace(/^\\uFEFF/, '');
+  out[p] = rowsToCards(parseCsv(text)).map(c => [c.id, c.hanzi, c.pinyin, c.english, c.locale]);
+}
+console.log(JSON.stringify(out));
+"""
+
+def js_cards(paths):
+    if not shutil.which("node"):
+        pytest.skip("node is not installed")
+    script = JS % json.dumps((REPO / "js" / "data.js").as_uri())
+    r = subprocess.run(["node", "--input-type=module", "-e", script, json.dumps([str(p) for p in paths])],
+                       cwd=REPO, capture_output=True, text=True, timeout=60)
+    assert r.returncode == 0, r.stderr
+    return json.loads(r.stdout)
+
+
+def test_fixture_bundle_matches_js(tmp_path):
+    bundle = build_bundle(FIXTURES / "vocab.csv", tmp_path)
+    decks = {d["filename"]: [c[:5] for c in d["cards"]] for d in bundle["decks"]}
+    expected = js_cards([FIXTURES / name for name in decks])
+    assert len(decks) == 2 and all(decks.values())
+    for name, cards in decks.items():
+        assert cards == expected[str(FIXTURES / name)], name
+
+def test_only_a_hanzi_header_is_skipped():
+    chinese = [c.hanzi for c in iter_cards(FIXTURES / "chinese_header.csv", use_cache=False)]
+    hanzi = [c.hanzi for c in iter_cards(FIXTURES / "hanzi_header.csv", use_cache=False)]
+    assert chinese[0] == "Chinese" and "Hanzi" not in hanzi
+
+def test_repository_decks_match_js():
+    decks = [d for d in load_index(REPO / VOCAB_INDEX) if d.path.exists()]
+    expected = js_cards([d.path for d in decks])
+    for d in decks:
+        got = [[c.id, c.hanzi, c.pinyin, c.english, c.locale] for c in iter_cards(d.path, use_cache=False)]
+        assert got == expected[str(d.path)], d.filename
+
+
+def test_bundle_check_flags_csv_and_recording_changes(tmp_path, run_tool):
+    data = tmp_path / "data"
+    shutil.copytree(FIXTURES, data, ignore=shutil.ignore_patterns("*.json"))
+    (data / "recordings" / "zh-CN").mkdir(parents=True)
+    assert run_tool("build_vocab_bundle.py", "--check").returncode == 1  # missing
+    assert run_tool("build_vocab_bundle.py").returncode == 0
+    assert run_tool("build_vocab_bundle.py", "--check").returncode == 0
+    (data / "recordings" / "zh-CN" / "你好.wav").write_bytes(b"RIFF")
+    assert run_tool("build_vocab_bundle.py", "--check").returncode == 1
+    run_tool("build_vocab_bundle.py")
+    with open(data / "hanzi_header.csv", "a", encoding="utf-8") as f:
+        f.write("\n新词,xīn cí,new word\n")
+    r = run_tool("build_vocab_bundle.py", "--check")
+    assert r.returncode == 1 and "STALE" in r.stdout
+
+def test_update_index_keeps_bom_and_line_endings(tmp_path):
+    index = tmp_path / "vocab.csv"
+    original = "﻿filename,display_name,description,locale\r\n\"a.csv\",A,\"x, y\",zh-CN\r\nb.csv,B,,zh-TW"
+    index.write_bytes(original.encode("utf-8"))
+    assert update_index(index, [["c.csv", "C", "", "en-US"]])
+    text = index.read_bytes().decode("utf-8")
+    assert text == original + "\r\nc.csv,C,,en-US\r\n"
+    assert not update_index(index, [["a.csv", "A", "x, y", "zh-CN"]])  # same row, quoted differently
+    assert update_index(index, [["b.csv", "B2", "", "zh-TW"]])
+    assert index.read_bytes().decode("utf-8") == text.replace("b.csv,B,,zh-TW", "b.csv,B2,,zh-TW")
+    assert [d.display_name for d in load_index(index)] == ["A", "B2", "C"]
+
+def test_update_index_creates_the_file(tmp_path):
+    index = tmp_path / "vocab.csv"
+    assert update_index(index, [["a.csv", "A", "", "zh-CN"]])
+    assert index.read_text(encoding="utf-8") == "filename,display_name,description,locale\na.csv,A,,zh-CN\n"
+
+def test_unchanged_rebuild_marks_the_bundle_newer_than_its_csvs(tmp_path, run_tool):
+    """The app reads the CSVs when one is newer than the bundle, so a no-op rebuild must still bump its mtime."""
+    data = tmp_path / "data"
+    shutil.copytree(FIXTURES, data, ignore=shutil.ignore_patterns("*.json"))
+    run_tool("build_vocab_bundle.py")
+    bundle = data / "vocab.bundle.json"
+    os.utime(bundle, (1_000_000, 1_000_000))
+    r = run_tool("build_vocab_bundle.py")
+    assert "up to date" in r.stdout
+    assert bundle.stat().st_mtime >= (data / "vocab.csv").stat().st_mtime
@@ -0,0 +1,35 @@
+"""watch_assets.py end to end against the fake TTS endpoint: what gets queued, and how data/vocab.csv is rewritten."""
+import numpy as np
+
+from audio_io import write_wav_pcm16
+from fake_tts_server import serve
+
+INDEX = "﻿filename,display_name,description,locale\r\nwords.csv,Words,,zh-CN\r\n"
+
+
+def test_broken_row_locale_is_not_synthesized_and_index_keeps_bom(tmp_path, run_tool):
+    data = tmp_path / "data"
+    (data / "recordings" / "zh-CN").mkdir(parents=True)
+    (data / "vocab.csv").write_text(INDEX, encoding="utf-8", newline="")
+    (data / "words.csv").write_text("hanzi,pinyin,english\n你好,nǐ hǎo,hello\n", encoding="utf-8")
+    write_wav_pcm16(data / "recordings" / "zh-CN" / "你好.wav", np.zeros(2400, dtype=np.float32), 24000)
+    srv = serve(latency=0.0)
+    try:
+        args = ["--once", "--settle", "0", "--register", "--state", tmp_path / "state.json", "--tts-out", tmp_path / "tts",
+                f"--tts-arg=--url={srv.url}", "--tts-arg=--rate=0"]
+        env = {"OPENAI_API_KEY": "test"}
+        assert run_tool("watch_assets.py", *args, env=env).returncode == 0  # baseline
+        # the last row lost its newline and the next edit ran into it: the pinyin lands in the locale column
+        (data / "words.csv").write_text("hanzi,pinyin,english\n你好,nǐ hǎo,hello\n谢谢,xiè xie,thanks\n"
+                                        "测试词,cè shì cí,test word,cè shì cí\n", encoding="utf-8")
+        (data / "extra.csv").write_text("hanzi,pinyin,english\n再见,zài jiàn,goodbye\n", encoding="utf-8")
+        edited = run_tool("watch_assets.py", *args, env=env)
+        assert edited.returncode == 0, edited.stdout + edited.stderr
+        assert "1 row(s) with unknown locale 'cè shì cí'" in edited.stdout
+        assert srv.requests == 2  # 谢谢 and 再见, not 测试词
+    finally:
+        srv.shutdown()
+    assert sorted(p.name for p in (data / "recordings").iterdir() if p.is_dir()) == ["zh-CN"]
+    assert {p.name for p in (data / "recordings" / "zh-CN").iterdir()} == {"你好.wav", "谢谢.wav", "再见.wav"}
+    assert not any("cè shì cí" in p.name for p in (tmp_path / "tts").rglob("*"))
+    assert (data / "vocab.csv").read_bytes().decode("utf-8") == INDEX + "extra.csv,Extra,,zh-CN\r\n"
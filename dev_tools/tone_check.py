@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Check generated Mandarin audio against the tones written in the CSV pinyin, so wrong-tone TTS takes can be
+found without listening to every clip in the Tone Lab.
+
+For each card of a deck:
+1. expected tones from the pinyin (`ài hù` → 4 4; tone numbers like `ai4` work too; no mark = neutral),
+   with the usual sandhi applied (3-3 → 2-3, 不 before tone 4 → 2, 一 before tone 4 → 2, before 1/2/3 → 4)
+2. F0 contour of the clip (pitch.yin), octave jumps folded, in semitones around the clip's median
+3. syllable segmentation: voiced runs, merged across the shortest gaps or split at energy valleys until
+   there is one per syllable
+4. shape of each syllable: flat / rise / dip / fall, compared with the expected tone
+
+Clips are scored by mismatch per syllable (plus penalties for a forced segmentation or little voicing) and
+the suspects are listed worst first. Thresholds are calibrated on the sinoid-t1…t4 contours of
+generate_sinoid.py; dev_tools/tests/test_tone_check.py checks them (also on two-syllable words built from
+those contours).
+
+    python dev_tools/tone_check.py hsk1.csv                                  # data/recordings/zh-CN/<hanzi>.wav
+    python dev_tools/tone_check.py hsk1.csv --tts-dir dev_tools/audio_chinese_hsk1 --voice alloy --model gpt-4o-mini-tts
+"""
+import argparse, csv, os, re, sys, time, unicodedata, warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+from audio_io import AudioDecodeError, read_audio
+from pitch import yin
+from vocab import VOCAB_INDEX, iter_cards, load_index, safe_filename
+
+FLAT_ST = 1.5         # total movement below this (semitones) is flat
+DIP_ST = 1.0          # a dip must fall and rise again by at least this much
+MIN_RUN = 4           # voiced runs shorter than this (frames) are ignored
+MIN_VOICED = 0.25     # below this share of voiced frames a clip is unreliable
+SUSPECT_SCORE = 0.5   # clips at or above this score are listed
+
+# Mismatch cost: expected tone → observed shape. 3 is a final third tone (dip), 6 a half third before another
+# syllable (low, falling), 5 neutral (not scored).
+COST = {
+    1: {"flat": 0.0, "rise": 1.0, "dip": 1.0, "fall": 1.0},
+    2: {"flat": 1.0, "rise": 0.0, "dip": 0.5, "fall": 1.0},
+    3: {"flat": 1.0, "rise": 0.5, "dip": 0.0, "fall": 0.5},
+    6: {"flat": 0.5, "rise": 1.0, "dip": 0.5, "fall": 0.0},
+    4: {"flat": 1.0, "rise": 1.0, "dip": 1.0, "fall": 0.0},
+}
+
+# ---------- expected tones ----------
+
+_MARKS = {"̄": 1, "́": 2, "̌": 3, "̀": 4}  # combining macron, acute, caron, grave
+
+def syllable_tone(syl: str) -> int:
+    """Tone of one pinyin syllable: tone mark or trailing digit, else 5 (neutral)."""
+    if syl and syl[-1] in "12345":
+        return int(syl[-1])
+    for ch in unicodedata.normalize("NFD", syl):
+        if ch in _MARKS:
+            return _MARKS[ch]
+    return 5
+
+_INITIALS = ("", "b", "p", "m", "f", "d", "t", "n", "l", "g", "k", "h", "j", "q", "x", "zh", "ch", "sh", "r",
+             "z", "c", "s", "y", "w")
+_FINALS = ("a", "o", "e", "ai", "ei", "ao", "ou", "an", "en", "ang", "eng", "ong", "er", "i", "ia", "ie", "iao",
+           "iu", "ian", "in", "iang", "ing", "iong", "u", "ua", "uo", "uai", "ui", "uan", "un", "uang", "v", "ve",
+           "ue", "van")
+# a superset of the Mandarin syllables (ü written v), enough to split joined pinyin such as "māma" or "dōngxi"
+_SYLLABLES = {i + f for i in _INITIALS for f in _FINALS} - {"", "r"}
+
+def _split_joined(tok: str) -> List[Tuple[int, int]]:
+    """Spans of the syllables in a lowercase toneless token (fewest syllables; erhua "r" stays with its syllable),
+    or [] when it is not pinyin."""
+    best: List[List[Tuple[int, int]]] = [[]] + [None] * len(tok)
+    for end in range(1, len(tok) + 1):
+        for start in range(max(0, end - 7), end):
+            syl = tok[start:end]
+            if best[start] is None or not (syl in _SYLLABLES or (syl.endswith("r") and syl[:-1] in _SYLLABLES)):
+                continue
+            if best[end] is None or len(best[start]) + 1 < len(best[end]):
+                best[end] = best[start] + [(start, end)]
+    return best[-1] or []
+
+def pinyin_tones(pinyin: str) -> List[int]:
+    """Citation tones per syllable; syllables are whitespace/apostrophe separated as in the decks, or joined."""
+    out = []
+    for tok in pinyin.replace("'", " ").replace("’", " ").replace("-", " ").split():
+        tok = "".join(ch for ch in tok if ch.isalnum())
+        if not tok:
+            continue
+        if re.search(r"[1-5]\D", tok):  # joined numbered syllables ("ni3hao3")
+            out.extend(int(d) for d in re.findall(r"[1-5]", tok))
+            continue
+        base, tones = "", []  # letters without tone marks (ü as v), and the mark on each letter
+        for ch in unicodedata.normalize("NFD", tok.lower()):
+            if ch in _MARKS:
+                tones[-1] = _MARKS[ch]
+            elif ch == "̈":  # diaeresis: ü
+                base = base[:-1] + "v"
+            else:
+                base += ch
+                tones.append(5)
+        spans = _split_joined(base) if len(base) > 1 else []
+        if len(spans) > 1:  # joined syllables ("nǐhǎo", "māma"): unmarked ones are neutral
+            out.extend(max((t for t in tones[a:b] if t != 5), default=5) for a, b in spans)
+        else:
+            marks = [t for t in tones if t != 5]
+            out.extend(marks if len(marks) > 1 else [syllable_tone(tok)])
+    return out
+
+def sandhi(tones: List[int], hanzi: str = "") -> List[int]:
+    """Surface tones: 不/一 sandhi (when the characters line up with the syllables), 3-3 → 2-3, half third."""
+    t = list(tones)
+    chars = [c for c in hanzi if "一" <= c <= "鿿"]
+    if len(chars) == len(t):
+        for i in range(len(t) - 1):
+            if chars[i] == "不" and t[i] == 4 and t[i + 1] == 4:
+                t[i] = 2
+            elif chars[i] == "一" and t[i] == 1 and t[i + 1] in (1, 2, 3, 4):
+                t[i] = 2 if t[i + 1] == 4 else 4
+    for i in range(len(t) - 2, -1, -1):
+        if t[i] == 3 and t[i + 1] == 3:
+            t[i] = 2
+    return [6 if x == 3 and i < len(t) - 1 and t[i + 1] != 5 else x for i, x in enumerate(t)]
+
+# ---------- contour + segmentation ----------
+
+def contour(x: np.ndarray, sr: int) -> Tuple[np.ndarray, np.ndarray]:
+    """→ (semitones around the clip median, NaN where unvoiced; energy dB) per 10 ms frame."""
+    r = yin(x, sr, fmin=60.0, fmax=500.0)
+    f0, energy = r["f0"], r["energy_db"]
+    v = f0 > 0
+    st = np.full(len(f0), np.nan)
+    if v.any():
+        st[v] = 12 * np.log2(f0[v] / np.median(f0[v]))
+        st[v] = np.where(st[v] > 7, st[v] - 12, np.where(st[v] < -9, st[v] + 12, st[v]))  # octave errors
+        # 5-frame median over voiced frames removes single-frame glitches
+        w = np.lib.stride_tricks.sliding_window_view(np.pad(st, 2, constant_values=np.nan), 5)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN windows (unvoiced) stay NaN
+            st = np.where(v, np.nanmedian(w, axis=1), np.nan)
+    return st, energy
+
+def _runs(mask: np.ndarray) -> List[List[int]]:
+    d = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return [[a, b] for a, b in zip(np.flatnonzero(d == 1), np.flatnonzero(d == -1)) if b - a >= MIN_RUN]
+
+def segment(st: np.ndarray, energy: np.ndarray, n: int) -> Tuple[List[Tuple[int, int]], bool]:
+    """n syllable frame ranges from the voiced runs → (ranges, forced); forced means runs had to be split evenly."""
+    runs = _runs(~np.isnan(st))
+    if not runs or n < 1:
+        return [], True
+    while len(runs) > n:  # merge across the shortest gap
+        i = min(range(len(runs) - 1), key=lambda k: runs[k + 1][0] - runs[k][1])
+        runs[i:i + 2] = [[runs[i][0], runs[i + 1][1]]]
+    forced = False
+    sm = np.convolve(energy, np.ones(5) / 5, mode="same")
+    while len(runs) < n:  # split the longest run at its deepest inner energy valley
+        i = max(range(len(runs)), key=lambda k: runs[k][1] - runs[k][0])
+        a, b = runs[i]
+        if b - a < 2 * MIN_RUN:
+            return [tuple(r) for r in runs], True
+        lo, hi = a + (b - a) // 5, b - (b - a) // 5
+        inner = sm[lo:hi]
+        cut = lo + int(np.argmin(inner))
+        if sm[lo:hi].max() - inner.min() < 3.0:  # no real valley: even split
+            cut, forced = (a + b) // 2, True
+        runs[i:i + 1] = [[a, cut], [cut, b]]
+    return [tuple(r) for r in runs], forced
+
+def classify(seg: np.ndarray) -> Tuple[str, dict]:
+    """Shape of one syllable's semitone contour, from the smoothed start/end/minimum."""
+    y = seg[~np.isnan(seg)]
+    if len(y) < MIN_RUN:
+        return "flat", {"range": 0.0}
+    k = max(1, len(y) // 10)
+    y = y[k: len(y) - k] if len(y) > 2 * k + MIN_RUN else y  # onset/coda perturbations
+    y = np.convolve(y, np.ones(3) / 3, mode="valid") if len(y) >= 3 else y
+    q = max(1, len(y) // 4)
+    start, end = float(y[:q].mean()), float(y[-q:].mean())
+    i_min = int(np.argmin(y))
+    lo = float(y[i_min])
+    feats = {"start": round(start, 2), "end": round(end, 2), "min": round(lo, 2),
+             "range": round(float(y.max() - lo), 2)}
+    if feats["range"] < FLAT_ST:
+        return "flat", feats
+    if 0.15 * len(y) < i_min < 0.85 * len(y) and start - lo >= DIP_ST and end - lo >= DIP_ST:
+        return "dip", feats
+    return ("rise" if end > start else "fall"), feats
+
+def check_samples(x: np.ndarray, sr: int, expected: List[int]) -> dict:
+    """Compare one clip with its expected surface tones → {"shapes", "score", "notes", ...}."""
+    st, energy = contour(x, sr)
+    voiced = float(np.mean(~np.isnan(st))) if len(st) else 0.0
+    ranges, forced = segment(st, energy, len(expected))
+    shapes, costs, notes = [], [], []
+    if len(ranges) != len(expected):
+        notes.append(f"found {len(ranges)} of {len(expected)} syllables")
+    for (a, b), tone in zip(ranges, expected):
+        shape, _ = classify(st[a:b])
+        shapes.append(shape)
+        if tone != 5:
+            costs.append(COST[tone][shape])
+    score = float(np.mean(costs)) if costs else 0.0
+    if len(ranges) != len(expected):
+        score += 1.0
+    if forced:
+        score += 0.25
+        notes.append("forced segmentation")
+    if voiced < MIN_VOICED:
+        score += 0.5
+        notes.append(f"{voiced:.0%} voiced")
+    return {"shapes": shapes, "score": round(score, 3), "voiced": round(voiced, 3), "notes": notes}
+
+# ---------- per-clip worker ----------
+
+def check_clip(job) -> dict:
+    path, hanzi, pinyin = job
+    tones = pinyin_tones(pinyin)
+    row = {"file": str(path), "hanzi": hanzi, "pinyin": pinyin, "expected": sandhi(tones, hanzi)}
+    try:
+        x, sr = read_audio(path)
+    except (AudioDecodeError, OSError, ValueError, EOFError) as e:
+        return dict(row, error=str(e)[:200])
+    return dict(row, **check_samples(x, sr, row["expected"]))
+
+# ---------- main ----------
+
+def main():
+    ap = argparse.ArgumentParser(description="Rank clips whose pitch contour does not match the pinyin tones.")
+    ap.add_argument("decks", nargs="+", help="Deck file names from the index, e.g. hsk1.csv, or CSV paths")
+    ap.add_argument("--index", default=str(VOCAB_INDEX), help="Deck index (default: data/vocab.csv)")
+    ap.add_argument("--recordings", default=os.path.join("data", "recordings"), help="Recordings root (<locale>/<hanzi>.wav)")
+    ap.add_argument("--tts-dir", help="Check make_tts_from_csv.py output instead ({base}__{voice}__{model}.wav)")
+    ap.add_argument("--voice", default="alloy", help="Voice part of the --tts-dir file names")
+    ap.add_argument("--model", default="gpt-4o-mini-tts", help="Model part of the --tts-dir file names")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes (default: all cores)")
+    ap.add_argument("--top", type=int, default=30, help="Show at most N suspects (default 30)")
+    ap.add_argument("--min-score", type=float, default=SUSPECT_SCORE, help=f"Suspect threshold (default {SUSPECT_SCORE})")
+    ap.add_argument("--report", help="Write every checked clip to this CSV")
+    args = ap.parse_args()
+
+    decks = {d.filename: d for d in load_index(args.index)}
+    jobs, missing = [], 0
+    for name in args.decks:
+        deck = decks.get(name) or decks.get(Path(name).name)
+        path, locale = (deck.path, deck.locale) if deck else (Path(name), "zh-CN")
+        if not path.exists():
+            sys.exit(f"ERROR: deck not found: {name}")
+        for c in iter_cards(path):
+            if not c.pinyin:
+                continue
+            if args.tts_dir:
+                clip = Path(args.tts_dir) / f"{safe_filename(c.hanzi or c.pinyin)}__{args.voice}__{args.model}.wav"
+            else:
+                clip = Path(args.recordings) / (c.locale or locale) / f"{c.hanzi}.wav"
+            if clip.exists():
+                jobs.append((clip, c.hanzi, c.pinyin))
+            else:
+                missing += 1
+    if not jobs:
+        sys.exit("No clips to check.")
+
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(jobs)))) as pool:
+        rows = list(pool.map(check_clip, jobs, chunksize=8))
+    failed = [r for r in rows if "error" in r]
+    checked = [r for r in rows if "error" not in r]
+    checked.sort(key=lambda r: r["score"], reverse=True)
+    suspects = [r for r in checked if r["score"] >= args.min_score]
+    print(f"[TONE] Checked {len(checked)} clips in {time.perf_counter() - t0:.1f}s   "
+          f"Suspects: {len(suspects)}   Undecodable: {len(failed)}   Without audio: {missing}")
+    for r in suspects[: args.top]:
+        notes = f"  ({'; '.join(r['notes'])})" if r["notes"] else ""
+        print(f"  {r['score']:5.2f}  {r['hanzi']:<8} {r['pinyin']:<16} expected {' '.join(map(str, r['expected'])):<10} "
+              f"heard {' '.join(r['shapes']):<16}{notes}")
+    if len(suspects) > args.top:
+        print(f"  ... and {len(suspects) - args.top} more (see --report)")
+    if failed:
+        print(f"[TONE] First decode error: {failed[0]['error']}")
+    if args.report:
+        with open(args.report, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["score", "file", "hanzi", "pinyin", "expected", "shapes", "voiced", "notes"])
+            for r in checked:
+                w.writerow([r["score"], r["file"], r["hanzi"], r["pinyin"], " ".join(map(str, r["expected"])),
+                            " ".join(r["shapes"]), r["voiced"], "; ".join(r["notes"])])
+            for r in failed:
+                w.writerow(["", r["file"], r["hanzi"], r["pinyin"], " ".join(map(str, r["expected"])), "", "", r["error"]])
+        print(f"[TONE] Report: {args.report}")
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,146 @@
 #!/usr/bin/env python3
 import argparse
-import csv
-import shutil
+import json
+import os
+import time
 from pathlib import Path
 
+from audio_io import AUDIO_EXTS, probe
+from fsutil import atomic_write_bytes, link_or_copy
+from vocab import iter_rows, safe_filename
+
+RECORDINGS_MANIFEST = "manifest.json"
+
 def read_chinese_chars(csv_path):
-    chars = []
-    with open(csv_path, newline='', encoding='utf-8-sig') as f:
-        reader = csv.reader(f)
-        # Skip header if it looks like one
-        rows = list(reader)
-        if rows and "chinese" in rows[0][0].lower():
-            rows = rows[1:]
-        for row in rows:
-            if row and row[0].strip():
-                chars.append(row[0].strip())
-    return chars
+    return [r.hanzi for r in iter_rows(csv_path) if r.hanzi]
+
+def parse_tts_name(filename: str):
+    """'{base}__{voice}__{model}.wav' (make_tts_from_csv.py naming) -> (base, voice, model); plain names -> (stem, None, None)."""
+    stem = filename.rsplit(".", 1)[0]
+    parts = stem.split("__")
+    if len(parts) >= 3:
+        return "__".join(parts[:-2]), parts[-2], parts[-1]
+    return stem, None, None
+
+def index_dir(indir: Path):
+    """One directory scan: base -> [(voice, model, path), ...]."""
+    index = {}
+    with os.scandir(indir) as it:
+        for entry in it:
+            if entry.name.startswith(".") or not entry.name.lower().endswith(".wav") or not entry.is_file():
+                continue
+            base, voice, model = parse_tts_name(entry.name)
+            index.setdefault(base, []).append((voice, model, Path(entry.path)))
+    return index
+
+def pick(candidates, voices, models):
+    """Best candidate by --voice/--model preference order (unlisted values rank last, ties by name)."""
+    def rank(c):
+        voice, model, path = c
+        rv = voices.index(voice) if voice in voices else len(voices)
+        rm = models.index(model) if model in models else len(models)
+        return (rv, rm, path.name)
+    return min(candidates, key=rank)
+
+def place(chars, index, outdir: Path, voices, models, mode: str = "auto", verbose: bool = True) -> dict:
+    """
+    Put the preferred take of each word at outdir/<word>.wav (the name speech.js requests).
+    → {"link" | "reflink" | "copy" | "same" | "missing": count}; "same" means the file was already in place.
+    """
+    counts = {}
+    for char in chars:
+        candidates = index.get(safe_filename(char))
+        if candidates:
+            src = pick(candidates, voices, models)[2]
+            dst = outdir / f"{char}.wav"
+            if dst.exists() and os.path.samefile(src, dst):
+                counts["same"] = counts.get("same", 0) + 1
+                continue
+            how = link_or_copy(src, dst, mode)
+            counts[how] = counts.get(how, 0) + 1
+            if verbose:
+                print(f"Placed ({how}): {src.name} -> {dst.name}")
+        else:
+            counts["missing"] = counts.get("missing", 0) + 1
+            if verbose:
+                print(f"Missing: {char}")
+    return counts
+
+# ---------- recordings manifest ----------
+
+def build_recordings_manifest(root: Path, previous: dict | None = None) -> dict:
+    """
+    locale -> word -> {file, size, duration} for every clip under root/<locale>/.
+    Entries of unchanged files (same size and mtime) are reused from `previous` instead of re-probed.
+    When a word has several files (e.g. .wav and a compacted .mp3) the smallest wins.
+    """
+    old = (previous or {}).get("locales", {})
+    locales = {}
+    for loc in sorted(p for p in root.iterdir() if p.is_dir() and not p.name.startswith(".")):
+        best = {}  # word -> (size, name, mtime, path); picked before probing, so losing files are never read
+        with os.scandir(loc) as it:
+            for entry in it:
+                if entry.name.startswith(".") or Path(entry.name).suffix.lower() not in AUDIO_EXTS or not entry.is_file():
+                    continue
+                st = entry.stat()
+                word = entry.name.rsplit(".", 1)[0]
+                cand = (st.st_size, entry.name, int(st.st_mtime), entry.path)
+                if word not in best or cand[:2] < best[word][:2]:
+                    best[word] = cand
+        words = {}
+        for word, (size, name, mtime, path) in sorted(best.items()):
+            prev = old.get(loc.name, {}).get(word)
+            if prev and prev.get("file") == name and prev.get("size") == size and prev.get("mtime") == mtime:
+                words[word] = prev
+            else:
+                info = probe(path)
+                words[word] = {"file": name, "size": size, "mtime": mtime,
+                               "duration": round(info.get("duration", 0.0), 3), "container": info["container"]}
+        locales[loc.name] = words
+    return {"version": 1, "generated": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "locales": locales}
+
+def write_recordings_manifest(root: Path, path: Path | None = None) -> dict:
+    path = path or root / RECORDINGS_MANIFEST
+    previous = None
+    if path.exists():
+        try:
+            previous = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            pass
+    manifest = build_recordings_manifest(root, previous)
+    atomic_write_bytes(path, json.dumps(manifest, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    return manifest
 
 def main():
     parser = argparse.ArgumentParser(description="Transfer WAV files with stripped names.")
     parser.add_argument("csv", help="Path to HSK CSV file")
     parser.add_argument("indir", help="Directory containing WAV files")
     parser.add_argument("outdir", help="Directory to copy renamed WAV files into")
+    parser.add_argument("--voice", default="", help="Preferred voice(s), comma separated, e.g. 'alloy,verse'")
+    parser.add_argument("--model", default="", help="Preferred model(s), comma separated, e.g. 'gpt-4o-mini-tts,tts-1'")
+    parser.add_argument("--mode", choices=["auto", "link", "reflink", "copy"], default="auto",
+                        help="auto: hardlink, else reflink, else copy (default)")
+    parser.add_argument("--manifest", help="Recordings manifest to refresh; it indexes the directory it lives in (default: <outdir>/../manifest.json when outdir is data/recordings/<locale>)")
+    parser.add_argument("--no-manifest", action="store_true", help="Do not write the recordings manifest")
     args = parser.parse_args()
 
     indir = Path(args.indir)
     outdir = Path(args.outdir)
     outdir.mkdir(parents=True, exist_ok=True)
+    voices = [v for v in args.voice.split(",") if v]
+    models = [m for m in args.model.split(",") if m]
 
-    chars = read_chinese_chars(Path(args.csv))
+    counts = place(read_chinese_chars(Path(args.csv)), index_dir(indir), outdir, voices, models, args.mode)
+    print("Summary: " + ", ".join(f"{k}={v}" for k, v in sorted(counts.items())))
 
-    for char in chars:
-        matches = list(indir.glob(f"{char}*.wav"))
-        if matches:
-            src = matches[0]
-            dst = outdir / f"{char}.wav"
-            shutil.copy(src, dst)
-            print(f"Copied: {src.name} -> {dst.name}")
-        else:
-            print(f"Missing: {char}")
+    manifest_path = Path(args.manifest) if args.manifest else (
+        outdir.parent / RECORDINGS_MANIFEST if outdir.parent.name == "recordings" else None)
+    if manifest_path and not args.no_manifest:
+        manifest = write_recordings_manifest(manifest_path.parent, manifest_path)
+        n = sum(len(w) for w in manifest["locales"].values())
+        print(f"Manifest: {manifest_path} ({n} clips in {len(manifest['locales'])} locales)")
 
 ## python dev_tools/transfer.py data/eng_oliver.csv dev_tools/audio_eng_oliver data/recordings
+## python dev_tools/transfer.py data/hsk6.csv dev_tools/audio_chinese_hsk6 data/recordings/zh-CN --voice alloy --model gpt-4o-mini-tts
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
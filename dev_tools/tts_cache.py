@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Content-addressed synthesis cache + rebuild manifest for make_tts_from_csv.py.
+
+A clip is identified by the hash of everything that influences the audio:
+(text sent to the API, model, voice, final instructions, audio format, and for --batch clips the batch
+instructions they were read with).
+Cached audio lives in `<cache>/<k[:2]>/<key>.<fmt>`; the manifest (`manifest.json` in the output dir)
+records which key each output file was built from, so a rerun only synthesizes rows whose inputs changed.
+"""
+import hashlib, json, time
+from pathlib import Path
+
+from fsutil import atomic_write_bytes, link_or_copy
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def cache_key(text: str, model: str, voice: str, instructions: str, fmt: str = "wav", batch: str = "") -> str:
+    """`batch` is the batch instruction text for clips cut from a --batch request (their own namespace)."""
+    fields = {"text": text, "model": model, "voice": voice, "instructions": instructions, "response_format": fmt}
+    if batch:
+        fields["batch"] = batch  # read as one item of a list: not interchangeable with a single-word take
+    blob = json.dumps(fields, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class SynthesisCache:
+    """Key → audio blob store on disk."""
+    def __init__(self, root: Path, fmt: str = "wav"):
+        self.root = Path(root)
+        self.fmt = fmt
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.{self.fmt}"
+
+    def has(self, key: str) -> bool:
+        return self.path_for(key).exists()
+
+    def put(self, key: str, data: bytes) -> Path:
+        p = self.path_for(key)
+        atomic_write_bytes(p, data)
+        return p
+
+    def materialize(self, key: str, dst: Path) -> str:
+        return link_or_copy(self.path_for(key), dst)
+
+    def sweep_partials(self, older_than: float = 3600.0) -> int:
+        """Remove temp files left by killed downloads (old enough not to belong to a running shard)."""
+        if not self.root.exists():
+            return 0
+        cutoff, removed = time.time() - older_than, 0
+        for p in self.root.glob("*/.*.part"):
+            try:
+                if p.stat().st_mtime < cutoff:
+                    p.unlink(); removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+
+class Manifest:
+    """
+    `{output filename: {"key", "text", "bytes"}}` for one output directory.
+    save() merges with what is on disk, so shards sharing an output dir do not drop each other's entries.
+    """
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: dict = self._load()
+        self.dirty: set = set()
+
+    def _load(self) -> dict:
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                if data.get("version") == MANIFEST_VERSION:
+                    return data.get("entries", {})
+            except (ValueError, AttributeError):
+                print(f"[TTS] WARN: ignoring unreadable manifest {self.path}")
+        return {}
+
+    def is_fresh(self, out_path: Path, key: str) -> bool:
+        e = self.entries.get(out_path.name)
+        return bool(e) and e.get("key") == key and out_path.exists()
+
+    def record(self, out_path: Path, key: str, text: str) -> None:
+        self.entries[out_path.name] = {"key": key, "text": text, "bytes": out_path.stat().st_size}
+        self.dirty.add(out_path.name)
+
+    def save(self) -> None:
+        merged = self._load()
+        merged.update({name: self.entries[name] for name in self.dirty})
+        self.entries = merged
+        blob = json.dumps({"version": MANIFEST_VERSION, "entries": self.entries},
+                          ensure_ascii=False, indent=1, sort_keys=True)
+        atomic_write_bytes(self.path, blob.encode("utf-8"))
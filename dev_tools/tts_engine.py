@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Concurrent request engine for the TTS tools.
+
+- one pooled `requests.Session` shared by all worker threads (keep-alive, no per-call TLS handshake)
+- a token-bucket rate limiter instead of a fixed sleep between calls
+- retry with `Retry-After` / exponential backoff for 429 and 5xx responses
+- a bounded thread pool that keeps at most N requests in flight
+- an optional `hook(event, **fields)` that reports attempts, retries and limiter waits (see tts_metrics.py)
+"""
+import random, threading, time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+_END = object()
+
+
+class TtsError(RuntimeError):
+    """Non-200 answer from the speech endpoint (after retries, if any)."""
+    def __init__(self, status: int, body: str, retry_after: Optional[float] = None):
+        super().__init__(f"TTS failed ({status}): {body[:300]}...")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens/s, bursts up to `capacity`. rate <= 0 disables limiting."""
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self.tokens = self.capacity
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a token is available; returns seconds spent waiting."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+                self.stamp = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return waited
+                delay = (1.0 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def penalize(self, seconds: float) -> None:
+        """Drain the bucket so every worker backs off (used when the server sends Retry-After)."""
+        if self.rate <= 0 or seconds <= 0:
+            return
+        with self.lock:
+            self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+def make_session(pool_size: int = 8) -> requests.Session:
+    """Session whose connection pool is large enough for `pool_size` concurrent workers."""
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def post_with_retry(session: requests.Session, url: str, *, headers: dict, data: str,
+                    timeout: float = 90, limiter: Optional[TokenBucket] = None,
+                    retries: int = 4, backoff: float = 1.0, max_backoff: float = 30.0,
+                    hook: Optional[Callable[..., None]] = None, **kwargs) -> requests.Response:
+    """
+    POST with rate limiting and retries. 429/5xx and connection errors are retried up to `retries` times,
+    sleeping for the server's Retry-After if given, else `backoff * 2**attempt` with jitter.
+    Returns the 200 response; raises TtsError (or the last connection error) otherwise.
+    `hook`, if given, is called as hook("throttle", seconds=), hook("response", status=, seconds=),
+    hook("error", error=, seconds=) and hook("retry", delay=) from the calling thread.
+    """
+    attempt = 0
+    while True:
+        if limiter:
+            waited = limiter.acquire()
+            if hook and waited:
+                hook("throttle", seconds=waited)
+        t = time.perf_counter()
+        try:
+            r = session.post(url, headers=headers, data=data, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if hook:
+                hook("error", error=e, seconds=time.perf_counter() - t)
+            if attempt >= retries:
+                raise
+            delay = min(max_backoff, backoff * (2 ** attempt)) * (0.5 + random.random() / 2)
+        else:
+            if hook:
+                hook("response", status=r.status_code, seconds=time.perf_counter() - t)
+            if r.status_code == 200:
+                return r
+            retry_after = parse_retry_after(r.headers.get("Retry-After"))
+            if r.status_code not in RETRY_STATUS or attempt >= retries:
+                raise TtsError(r.status_code, r.text, retry_after)
+            r.close()
+            if retry_after is not None:
+                delay = min(max_backoff, retry_after)
+                if limiter and limiter.rate > 0:
+                    # the shared bucket makes all workers wait; the retry itself waits in acquire()
+                    limiter.penalize(delay)
+                    delay = 0.0
+            else:
+                delay = min(max_backoff, backoff * (2 ** attempt)) * (0.5 + random.random() / 2)
+        attempt += 1
+        if hook:
+            hook("retry", delay=delay)
+        time.sleep(delay)
+
+
+def run_bounded(items: Iterable, fn: Callable, workers: int = 1) -> Iterator[Tuple[object, object, Optional[BaseException]]]:
+    """
+    Apply `fn` to each item with at most `workers` calls in flight.
+    Yields (item, result, error) in completion order; items are pulled lazily from the iterable.
+    """
+    workers = max(1, int(workers))
+    it = iter(items)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        for item in it:
+            pending[pool.submit(fn, item)] = item
+            if len(pending) >= workers:
+                break
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                item = pending.pop(fut)
+                err = fut.exception()
+                yield item, (None if err else fut.result()), err
+                nxt = next(it, _END)
+                if nxt is not _END:
+                    pending[pool.submit(fn, nxt)] = nxt
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Append-only JSONL job journal for make_tts_from_csv.py.
+
+Every finished row appends one line (status, latency, bytes, error) and is flushed immediately,
+so an interrupted run can be resumed with `--resume`: rows whose (output, cache key) pair was
+journaled as "ok" are not requested again, even if the manifest was never saved.
+"""
+import json, os, threading, time
+from pathlib import Path
+
+
+def journal_name(shard: tuple | None) -> str:
+    return "journal.jsonl" if not shard else f"journal.shard-{shard[0]}-of-{shard[1]}.jsonl"
+
+
+class Journal:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.f = open(self.path, "a", encoding="utf-8")
+
+    def write(self, **record) -> None:
+        record.setdefault("ts", round(time.time(), 3))
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self.lock:
+            self.f.write(line)
+            self.f.flush()
+            os.fsync(self.f.fileno())
+
+    def close(self) -> None:
+        with self.lock:
+            self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def completed(paths) -> dict:
+    """{(out filename, key): record} of rows journaled as ok, read from all given journal files."""
+    done = {}
+    for path in paths:
+        path = Path(path)
+        if not path.exists():
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn last line after a crash
+                if rec.get("status") == "ok" and "out" in rec and "key" in rec:
+                    done[(rec["out"], rec["key"])] = rec
+    return done
+
+
+def parse_shard(spec: str | None):
+    """'i/N' (0 <= i < N) -> (i, N); None -> None."""
+    if not spec:
+        return None
+    try:
+        i, n = (int(v) for v in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"--shard must look like i/N, got {spec!r}")
+    if n < 1 or not 0 <= i < n:
+        raise ValueError(f"--shard {spec}: need 0 <= i < N")
+    return i, n
+
+
+def in_shard(key: str, shard) -> bool:
+    """Shard by cache key, so duplicate rows always land in the same shard."""
+    return shard is None or int(key[:12], 16) % shard[1] == shard[0]
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Run-level metrics for TTS batch jobs (make_tts_from_csv.py).
+
+One thread-safe `RunMetrics` object collects everything a run does:
+- engine events from tts_engine.post_with_retry(hook=metrics): per-attempt latency to response headers,
+  HTTP status, retries and their back-off sleeps, rate-limiter waits, connection errors and timeouts
+- per-row results: end-to-end seconds (incl. retries and download), disk seconds (placing the output files),
+  bytes, audio seconds, cache hits and failures by error class
+
+At the end it writes a JSON summary (latency percentiles, throughput timeline, errors, cost estimate)
+and the same numbers in Prometheus text format, so a slow job can be attributed to API latency,
+retries/throttling or disk. `ProgressLine` renders a live one-line status with an ETA.
+"""
+import json, sys, threading, time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+
+from fsutil import atomic_write_bytes
+from tts_engine import TtsError
+
+METRICS_VERSION = 1
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
+TIMELINE_STEP = 5.0  # seconds per throughput sample
+
+# USD list prices used for the estimate: (unit, price per unit). Override with --price.
+# tts-1 / tts-1-hd bill input characters; gpt-4o-mini-tts is roughly $0.015 per minute of output audio.
+PRICING = {
+    "tts-1": ("chars", 15.0 / 1e6),
+    "tts-1-hd": ("chars", 30.0 / 1e6),
+    "gpt-4o-mini-tts": ("minutes", 0.015),
+}
+
+
+def error_class(err: BaseException) -> str:
+    if isinstance(err, TtsError):
+        if err.status == 429:
+            return "rate_limited"
+        return "server_error" if err.status >= 500 else "client_error"
+    if isinstance(err, requests.Timeout):
+        return "timeout"
+    if isinstance(err, requests.ConnectionError):
+        return "connection"
+    if isinstance(err, OSError):
+        return "disk"
+    return "other"
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0}
+    v = sorted(values)
+    pick = lambda q: v[min(len(v) - 1, max(0, int(round(q * (len(v) - 1)))))]
+    return {"count": len(v), "mean": round(sum(v) / len(v), 4), "p50": round(pick(0.50), 4),
+            "p95": round(pick(0.95), 4), "p99": round(pick(0.99), 4), "max": round(v[-1], 4)}
+
+
+class RunMetrics:
+    def __init__(self, model: str, voice: str, workers: int = 1, total_rows: int = 0, price: Optional[float] = None):
+        self.model, self.voice, self.workers = model, voice, workers
+        self.price = price
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.t0 = time.perf_counter()
+        self.total_rows = total_rows          # rows that need a request (misses)
+        self.rows = {"ok": 0, "failed": 0, "fresh": 0, "cached": 0, "dup": 0, "skipped": 0,
+                     "batched": 0, "fallback": 0}  # --batch: rows cut from a shared request / retried singly
+        self.status: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.attempts = self.retries = 0
+        self.retry_sleep = self.throttle = 0.0
+        self.request_s: List[float] = []      # per attempt, until response headers
+        self.row_s: List[float] = []          # per synthesized row, end to end
+        self.disk_s: List[float] = []         # placing output files
+        self.bytes = 0
+        self.audio_seconds = 0.0
+        self.chars = 0
+        self.timeline: List[list] = []        # [seconds since start, rows done, bytes done]
+        self.finished: Optional[float] = None
+
+    # ---------- engine hook ----------
+
+    def __call__(self, event: str, **kw) -> None:
+        """Hook for tts_engine.post_with_retry(); called from worker threads."""
+        with self.lock:
+            if event == "response":
+                self.attempts += 1
+                self.status[str(kw["status"])] = self.status.get(str(kw["status"]), 0) + 1
+                self.request_s.append(kw["seconds"])
+            elif event == "error":
+                self.attempts += 1
+                cls = error_class(kw["error"])
+                self.status[cls] = self.status.get(cls, 0) + 1
+                self.request_s.append(kw["seconds"])
+            elif event == "retry":
+                self.retries += 1
+                self.retry_sleep += kw.get("delay", 0.0)
+            elif event == "throttle":
+                self.throttle += kw["seconds"]
+
+    # ---------- row results ----------
+
+    def count(self, kind: str, n: int = 1) -> None:
+        with self.lock:
+            self.rows[kind] += n
+
+    def row_ok(self, seconds: float, disk_seconds: float, nbytes: int, audio_seconds: float, chars: int) -> None:
+        with self.lock:
+            self.rows["ok"] += 1
+            self.row_s.append(seconds)
+            self.disk_s.append(disk_seconds)
+            self.bytes += nbytes
+            self.audio_seconds += audio_seconds
+            self.chars += chars
+            self._sample()
+
+    def row_failed(self, err: BaseException) -> None:
+        with self.lock:
+            self.rows["failed"] += 1
+            cls = error_class(err)
+            self.errors[cls] = self.errors.get(cls, 0) + 1
+            self._sample()
+
+    def _sample(self) -> None:
+        t = time.perf_counter() - self.t0
+        done = self.rows["ok"] + self.rows["failed"]
+        if not self.timeline or t - self.timeline[-1][0] >= TIMELINE_STEP or done == self.total_rows:
+            self.timeline.append([round(t, 2), done, self.bytes])
+
+    # ---------- reporting ----------
+
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.t0
+
+    def cost(self) -> dict:
+        unit, per = PRICING.get(self.model, ("minutes", None))
+        if self.price is not None:
+            per = self.price
+        units = self.chars if unit == "chars" else self.audio_seconds / 60.0
+        return {"model": self.model, "unit": unit, "units": round(units, 3), "usd_per_unit": per,
+                "usd": round(units * per, 4) if per is not None else None}
+
+    def summary(self) -> dict:
+        with self.lock:
+            el = self.elapsed()
+            done = self.rows["ok"] + self.rows["failed"]
+            return {
+                "version": METRICS_VERSION,
+                "started": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started)),
+                "seconds": round(el, 3), "model": self.model, "voice": self.voice, "workers": self.workers,
+                "rows": dict(self.rows),
+                "requests": {"attempts": self.attempts, "by_status": dict(self.status), "retries": self.retries,
+                             "retry_sleep_seconds": round(self.retry_sleep, 3),
+                             "throttle_seconds": round(self.throttle, 3)},
+                "errors": dict(self.errors),
+                "latency": {"request": percentiles(self.request_s), "row": percentiles(self.row_s),
+                            "disk": percentiles(self.disk_s)},
+                "bytes": self.bytes, "audio_seconds": round(self.audio_seconds, 3), "chars": self.chars,
+                "throughput": {"rows_per_second": round(done / el, 3) if el else 0.0,
+                               "bytes_per_second": round(self.bytes / el, 1) if el else 0.0,
+                               "timeline": list(self.timeline)},
+                "cost_estimate": self.cost(),
+            }
+
+    def prometheus(self) -> str:
+        s = self.summary()
+        lines = []
+        def metric(name, kind, help_, samples):
+            lines.append(f"# HELP tts_{name} {help_}")
+            lines.append(f"# TYPE tts_{name} {kind}")
+            for labels, value in samples:
+                lab = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"tts_{name}{{{lab}}} {value}" if lab else f"tts_{name} {value}")
+        def histogram(name, help_, values):
+            with self.lock:
+                vals = list(values)
+            samples = [({"le": f"{b:g}"}, sum(1 for v in vals if v <= b)) for b in LATENCY_BUCKETS]
+            samples.append(({"le": "+Inf"}, len(vals)))
+            lines.append(f"# HELP tts_{name} {help_}")
+            lines.append(f"# TYPE tts_{name} histogram")
+            for labels, value in samples:
+                lines.append(f'tts_{name}_bucket{{le="{labels["le"]}"}} {value}')
+            lines.append(f"tts_{name}_sum {sum(vals):.6f}")
+            lines.append(f"tts_{name}_count {len(vals)}")
+
+        metric("rows_total", "counter", "Rows by outcome.", [({"result": k}, v) for k, v in s["rows"].items()])
+        metric("requests_total", "counter", "HTTP attempts by status or error class.",
+               [({"status": k}, v) for k, v in sorted(s["requests"]["by_status"].items())])
+        metric("retries_total", "counter", "Retried attempts.", [({}, s["requests"]["retries"])])
+        metric("retry_sleep_seconds_total", "counter", "Back-off sleep before retries.",
+               [({}, s["requests"]["retry_sleep_seconds"])])
+        metric("throttle_seconds_total", "counter", "Time spent waiting for the rate limiter.",
+               [({}, s["requests"]["throttle_seconds"])])
+        metric("row_errors_total", "counter", "Failed rows by error class.",
+               [({"class": k}, v) for k, v in sorted(s["errors"].items())])
+        histogram("request_duration_seconds", "Per attempt, until response headers.", self.request_s)
+        histogram("row_duration_seconds", "Per synthesized row, end to end.", self.row_s)
+        histogram("disk_duration_seconds", "Placing output files per row.", self.disk_s)
+        metric("bytes_total", "counter", "Audio bytes downloaded.", [({}, s["bytes"])])
+        metric("audio_seconds_total", "counter", "Seconds of audio produced.", [({}, s["audio_seconds"])])
+        metric("run_seconds", "gauge", "Wall time of the run.", [({}, s["seconds"])])
+        c = s["cost_estimate"]
+        if c["usd"] is not None:
+            metric("estimated_cost_usd", "gauge", "Estimated cost from list prices.", [({"model": c["model"]}, c["usd"])])
+        return "\n".join(lines) + "\n"
+
+    def write(self, json_path: Path, prom_path: Path) -> None:
+        self.finished = self.finished or time.perf_counter()
+        atomic_write_bytes(json_path, json.dumps(self.summary(), indent=1).encode("utf-8"))
+        atomic_write_bytes(prom_path, self.prometheus().encode("utf-8"))
+
+
+class ProgressLine:
+    """Single status line with rate and ETA, redrawn at most every `interval` seconds (stderr)."""
+    def __init__(self, metrics: RunMetrics, interval: float = 0.5, stream=sys.stderr):
+        self.m, self.interval, self.stream = metrics, interval, stream
+        self.tty = getattr(stream, "isatty", lambda: False)()
+        self.last = 0.0
+
+    def update(self, force: bool = False) -> None:
+        now = time.perf_counter()
+        if not force and now - self.last < (self.interval if self.tty else 10.0):
+            return
+        self.last = now
+        m = self.m
+        with m.lock:
+            done, total, el = m.rows["ok"] + m.rows["failed"], m.total_rows, m.elapsed()
+            p50 = percentiles(m.row_s).get("p50", 0.0)
+            fails, retries = m.rows["failed"], m.retries
+        rate = done / el if el > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else 0.0
+        line = (f"[TTS] {done}/{total} ({done / max(total, 1):.0%})  {rate:.1f} rows/s  p50 {p50:.2f}s  "
+                f"retries {retries}  failed {fails}  ETA {int(eta // 60)}m{int(eta % 60):02d}s")
+        if self.tty:
+            self.stream.write("\r" + line.ljust(100)[:100])
+        else:
+            self.stream.write(line + "\n")
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.update(force=True)
+        if self.tty:
+            self.stream.write("\n")
+            self.stream.flush()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Shared vocabulary loader for the dev tools, so every script agrees with the web app on what a row is.
+
+- Rows are streamed from the CSV (comma or tab, UTF-8 with optional BOM) with the quoting rules of
+  js/data.js parseCsv(); a first row whose first cell contains "hanzi" is a header (as in rowsToCards()).
+- Pinyin is normalized like js/data.js rowsToCards() (whitespace runs -> one space) and card ids are the same
+  fnv1a32("hanzi|pinyin|english") as js/util.js, so ids computed here match the browser's.
+- data/vocab.csv is the deck index (filename, display_name, description, locale); a row's own 4th column
+  overrides the deck locale.
+- Parsed files are kept in a pickle cache (dev_tools/.cache/vocab.pickle). An entry is reused while the file's
+  size and mtime are unchanged, or when they changed but the content hash did not (e.g. after a git checkout).
+
+    python dev_tools/vocab.py                 # summary of every deck in data/vocab.csv
+    python dev_tools/vocab.py data/hsk3.csv --dump > hsk3.jsonl
+"""
+import argparse, atexit, csv, hashlib, io, json, pickle, re, sys, time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from fsutil import atomic_write_bytes
+
+VOCAB_INDEX = Path("data") / "vocab.csv"
+DEFAULT_LOCALE = "zh-CN"
+CACHE_PATH = Path(__file__).resolve().parent / ".cache" / "vocab.pickle"
+CACHE_VERSION = 3
+INDEX_HEADER = ["filename", "display_name", "description", "locale"]
+HEADER_WORDS = ("hanzi",)  # rowsToCards() accepts only this; anything else would change card ids
+
+
+class Row(NamedTuple):
+    id: str         # card id (cached with the row, fnv1a32 in pure Python is the slow part)
+    line: int       # 1-based line number in the file
+    hanzi: str
+    pinyin: str     # normalized
+    english: str
+    locale: str     # the row's own locale column, "" when absent
+
+
+class Card(NamedTuple):
+    id: str
+    hanzi: str
+    pinyin: str
+    english: str
+    locale: str
+    deck: str       # CSV file name
+    line: int
+
+
+class Deck(NamedTuple):
+    filename: str
+    display_name: str
+    description: str
+    locale: str
+    path: Path
+
+
+# ---------- identity ----------
+
+def fnv1a32(s: str) -> str:
+    """js/util.js fnv1a32(): over UTF-16 code units, with the multiply done in doubles like the JS original."""
+    h = 0x811C9DC5
+    units = s.encode("utf-16-le")
+    for i in range(0, len(units), 2):
+        h = (int(h) & 0xFFFFFFFF) ^ (units[i] | units[i + 1] << 8)
+        h = float(h) * 16777619.0
+    return f"{int(h) & 0xFFFFFFFF:08x}"
+
+def card_id(hanzi: str, pinyin: str, english: str) -> str:
+    return fnv1a32(f"{hanzi}|{pinyin}|{english}")
+
+def normalize_pinyin(p: str) -> str:
+    return re.sub(r"\s+", " ", p.strip())
+
+def safe_filename(name: str) -> str:
+    name = name.strip()
+    name = re.sub(r"[\\/:*?\"<>|]", "_", name)
+    name = re.sub(r"\s+", " ", name).strip()
+    return name or "untitled"
+
+def is_header(row: List[str]) -> bool:
+    return len(row) >= 3 and any(w in row[0].lower() for w in HEADER_WORDS)
+
+# ---------- parsing ----------
+
+def split_csv(lines: Iterable[str], delim: str = ",") -> Iterator[Tuple[int, List[str]]]:
+    """
+    (line number, fields) per record, with the same rules as js/data.js parseCsv(): a quote toggles quoting
+    anywhere in a field, "" inside quotes is a literal quote, CR outside quotes is dropped.
+    """
+    field, row, in_quotes, start = [], [], False, 1
+    for no, line in enumerate(lines, 1):
+        if not in_quotes and '"' not in line:
+            yield no, line.replace("\r", "").rstrip("\n").split(delim)
+            start = no + 1
+            continue
+        i, n = 0, len(line)
+        while i < n:
+            c = line[i]
+            if in_quotes:
+                if c == '"':
+                    if i + 1 < n and line[i + 1] == '"':
+                        field.append('"'); i += 1
+                    else:
+                        in_quotes = False
+                else:
+                    field.append(c)
+            elif c == '"':
+                in_quotes = True
+            elif c == delim:
+                row.append("".join(field)); field = []
+            elif c == "\n":
+                row.append("".join(field))
+                yield start, row
+                field, row, start = [], [], no + 1
+            elif c != "\r":
+                field.append(c)
+            i += 1
+    if field or row:
+        row.append("".join(field))
+        yield start, row
+
+def _parse(path: Path) -> Iterator[Row]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        first = f.readline()
+        f.seek(0)
+        delim = "," if first.count(",") >= first.count("\t") else "\t"
+        for line, row in split_csv(f, delim):
+            if line == 1 and is_header(row):
+                continue
+            if not any(c.strip() for c in row):
+                continue
+            cells = [c.strip() for c in row[:4]] + [""] * (4 - min(len(row), 4))
+            pinyin = normalize_pinyin(cells[1])
+            yield Row(card_id(cells[0], pinyin, cells[2]), line, cells[0], pinyin, cells[2], cells[3])
+
+def _file_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class _Cache:
+    """abs path -> {"size", "mtime_ns", "sha256", "rows"}; loaded once per process, saved when changed."""
+    def __init__(self, path: Path = CACHE_PATH):
+        self.path = path
+        self.entries: Dict[str, dict] = {}
+        self.dirty = False
+        self.hits = self.misses = 0
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.entries = data["entries"]
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, KeyError, TypeError):
+            pass
+
+    def lookup(self, path: Path) -> Optional[List[tuple]]:
+        key, st = str(path.resolve()), path.stat()
+        e = self.entries.get(key)
+        if not e:
+            return None
+        if e["size"] == st.st_size and e["mtime_ns"] == st.st_mtime_ns:
+            return e["rows"]
+        if e["size"] == st.st_size and e["sha256"] == _file_hash(path):
+            e["mtime_ns"] = st.st_mtime_ns  # touched or checked out, content unchanged
+            self.dirty = True
+            return e["rows"]
+        return None
+
+    def store(self, path: Path, rows: List[tuple]) -> None:
+        st = path.stat()
+        self.entries[str(path.resolve())] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                                             "sha256": _file_hash(path), "rows": rows}
+        self.dirty = True
+
+    def save(self) -> None:
+        if self.dirty:
+            atomic_write_bytes(self.path, pickle.dumps({"version": CACHE_VERSION, "entries": self.entries},
+                                                       protocol=pickle.HIGHEST_PROTOCOL))
+            self.dirty = False
+
+
+_cache: Optional[_Cache] = None
+
+def _get_cache() -> _Cache:
+    global _cache
+    if _cache is None:
+        _cache = _Cache()
+        atexit.register(save_cache)
+    return _cache
+
+def save_cache() -> None:
+    if _cache is not None:
+        _cache.save()
+
+def iter_rows(path: Path, use_cache: bool = True) -> Iterator[Row]:
+    """
+    Non-empty data rows of a vocabulary CSV, lazily. Served from the cache when the file is unchanged;
+    otherwise parsed while iterating and cached once the file has been read to the end
+    (the cache file is written at exit, or by save_cache()).
+    """
+    path = Path(path)
+    if not use_cache:
+        yield from _parse(path)
+        return
+    cache = _get_cache()
+    rows = cache.lookup(path)
+    if rows is not None:
+        cache.hits += 1
+        for r in rows:
+            yield Row(*r)
+        return
+    cache.misses += 1
+    parsed = []
+    for r in _parse(path):
+        parsed.append(tuple(r))
+        yield r
+    cache.store(path, parsed)
+
+def iter_cards(path: Path, locale: str = "", use_cache: bool = True) -> Iterator[Card]:
+    """Cards exactly as rowsToCards() builds them: hanzi and english required, duplicate ids dropped (first wins)."""
+    path = Path(path)
+    seen = set()
+    for r in iter_rows(path, use_cache):
+        if not r.hanzi or not r.english:
+            continue
+        if r.id in seen:
+            continue
+        seen.add(r.id)
+        yield Card(r.id, r.hanzi, r.pinyin, r.english, r.locale or locale, path.name, r.line)
+
+# ---------- deck index ----------
+
+def load_index(index_path: Path = VOCAB_INDEX) -> List[Deck]:
+    """Decks listed in data/vocab.csv, in file order (blank lines skipped, as in discoverAvailableCsvFiles())."""
+    index_path = Path(index_path)
+    decks = []
+    with open(index_path, newline="", encoding="utf-8-sig") as f:
+        for i, row in enumerate(csv.reader(f)):
+            if i == 0 or len(row) < 2 or not row[0].strip():
+                continue
+            row = [c.strip() for c in row] + [""] * 2
+            decks.append(Deck(row[0], row[1], row[2], row[3] or DEFAULT_LOCALE, index_path.parent / row[0]))
+    return decks
+
+def deck_locale(csv_path: Path, index_path: Path = VOCAB_INDEX) -> str:
+    """Locale of a CSV according to the index ("" when it is not listed)."""
+    name = Path(csv_path).name
+    try:
+        return next((d.locale for d in load_index(index_path) if d.filename == name), "")
+    except OSError:
+        return ""
+
+def iter_index_cards(index_path: Path = VOCAB_INDEX, use_cache: bool = True) -> Iterator[Card]:
+    for deck in load_index(index_path):
+        if deck.path.exists():
+            yield from iter_cards(deck.path, deck.locale, use_cache)
+
+def update_index(index_path: Path, entries: List[List[str]]) -> bool:
+    """
+    Add [filename, display_name, description, locale] rows to the deck index, or replace the row that lists the
+    same file. The BOM, the line endings and every other line are kept as they are. True if the file changed.
+    """
+    index_path = Path(index_path)
+    text = index_path.read_bytes().decode("utf-8") if index_path.exists() else ""
+    bom = "\ufeff" if text.startswith("\ufeff") else ""
+    eol = "\r\n" if "\r\n" in text else "\n"
+
+    def line_of(row: List[str]) -> str:
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator=eol).writerow(row)
+        return buf.getvalue()
+
+    lines = text[len(bom):].splitlines(keepends=True)
+    while lines and not lines[-1].strip():
+        lines.pop()  # trailing blank lines
+    if not lines:
+        lines = [line_of(INDEX_HEADER)]
+    elif not lines[-1].endswith("\n"):
+        lines[-1] += eol
+    wanted = {e[0]: list(e) for e in entries}
+    changed = False
+    for i, line in enumerate(lines[1:], start=1):
+        row = next(csv.reader([line]), None) or [""]
+        entry = wanted.pop(row[0].strip(), None)
+        if entry is not None and row != entry:
+            lines[i] = line_of(entry)
+            changed = True
+    if not (changed or wanted):
+        return False
+    lines += [line_of(e) for e in wanted.values()]
+    atomic_write_bytes(index_path, (bom + "".join(lines)).encode("utf-8"))
+    return True
+
+# ---------- CLI ----------
+
+def main():
+    ap = argparse.ArgumentParser(description="Load vocabulary CSVs the way the web app does.")
+    ap.add_argument("csv", nargs="*", help="CSV files (default: every deck in data/vocab.csv)")
+    ap.add_argument("--index", default=str(VOCAB_INDEX), help="Deck index (default: data/vocab.csv)")
+    ap.add_argument("--dump", action="store_true", help="Print cards as JSON lines instead of a summary")
+    ap.add_argument("--no-cache", action="store_true", help="Parse every file, ignoring the cache")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    if args.csv:
+        decks = [Deck(Path(p).name, Path(p).stem, "", deck_locale(p, args.index), Path(p)) for p in args.csv]
+    else:
+        decks = load_index(args.index)
+    total = 0
+    for d in decks:
+        if not d.path.exists():
+            print(f"[VOCAB] WARN: {d.filename} is listed but missing", file=sys.stderr)
+            continue
+        cards = list(iter_cards(d.path, d.locale, not args.no_cache))
+        total += len(cards)
+        if args.dump:
+            for c in cards:
+                print(json.dumps(c._asdict(), ensure_ascii=False))
+        else:
+            print(f"[VOCAB] {d.filename:<32}{d.locale or '-':<8}{len(cards):>6} cards")
+    if not args.dump:
+        hits, misses = (_cache.hits, _cache.misses) if _cache else (0, 0)
+        print(f"[VOCAB] {total} cards in {len(decks)} decks in {(time.perf_counter() - t0) * 1000:.1f} ms "
+              f"(cache: {hits} hits, {misses} misses)")
+
+if __name__ == "__main__":
+    main()
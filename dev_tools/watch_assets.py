@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Watch mode for the vocabulary and audio assets: poll the decks and the recordings, and rebuild only what an edit affects.
+
+Every --interval seconds the decks listed in data/vocab.csv and the clips under data/recordings/<locale>/ are
+stat'ed. A deck whose size or mtime changed is re-read through vocab.py and diffed row by row (by card id) against
+the previous state. New words without a recording are queued for synthesis. The affected work then runs as a
+small dependency graph:
+
+    decks ──► tts ──► place ──┬──► manifest   data/recordings/manifest.json (if present, or after placing clips)
+    recordings ───────────────┼──► bundle     data/vocab.bundle.json (+ .gz)
+                              ├──► packs      data/packs/ (if present, or --packs): changed decks only
+                              └──► pitch      data/recordings/<locale>.f0pack (if present, or --pitch): changed locales only
+
+`tts` runs make_tts_from_csv.py on just the queued words, so its cache, batching and retries apply. `place` links
+the clips to data/recordings/<locale>/<hanzi>.wav like transfer.py does, but never overwrites an existing recording.
+Every step is incremental on its own; the daemon only decides which steps run and which decks and locales they get.
+A failing step is reported and retried later (synthesis after --retry seconds) without stopping the daemon.
+
+State (file stats, each deck's rows, the recordings listing, words still to synthesize) is kept in
+dev_tools/.cache/watch_state.json, so a restart picks up edits made while the daemon was not running. The first run
+records a baseline and only checks the derived files; --backfill also queues every card without audio.
+Files modified less than --settle seconds ago are left for the next poll, so half-saved edits are not picked up.
+
+    python dev_tools/watch_assets.py                        # watch until Ctrl-C
+    python dev_tools/watch_assets.py --once                 # one pass, e.g. before deploying
+    python dev_tools/watch_assets.py --register --tts-locale zh-CN --tts-arg=--batch=8 --tts-arg=--workers=4
+"""
+import argparse, csv, io, json, os, subprocess, sys, time
+from collections import Counter
+from graphlib import TopologicalSorter
+from pathlib import Path
+from typing import Dict, Set
+
+from build_vocab_bundle import BUNDLE_NAME, build_bundle, current_hash, encode, write_variants
+from fsutil import atomic_write_bytes, link_or_copy
+from make_tts_from_csv import DEFAULT_MODEL, DEFAULT_VOICE
+from pack_audio import CATALOG_NAME, update_packs
+from pitch import DEFAULTS
+from precompute_pitch import process_locale
+from transfer import RECORDINGS_MANIFEST, write_recordings_manifest
+from vocab import (DEFAULT_LOCALE, VOCAB_INDEX, iter_cards, iter_rows, load_index, safe_filename, save_cache,
+                   update_index)
+
+STATE_PATH = Path(__file__).resolve().parent / ".cache" / "watch_state.json"
+STATE_VERSION = 1
+TTS_SCRIPT = Path(__file__).resolve().parent / "make_tts_from_csv.py"
+TTS_OUT = Path(__file__).resolve().parent / ".cache" / "watch_tts"
+
+# step -> steps it runs after; a step runs when one of them changed something (or when forced)
+GRAPH = {
+    "decks": set(),
+    "recordings": set(),
+    "tts": {"decks"},
+    "place": {"tts"},
+    "manifest": {"place", "recordings"},
+    "bundle": {"decks", "place", "recordings"},
+    "packs": {"decks", "place", "recordings"},
+    "pitch": {"place", "recordings"},
+}
+ORDER = list(TopologicalSorter(GRAPH).static_order())
+
+
+def stat_key(path: Path) -> list:
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns]
+
+def listing(d: Path) -> Dict[str, list]:
+    """{file name: [size, mtime_ns]} of the clips in one locale directory."""
+    out = {}
+    with os.scandir(d) as it:
+        for e in it:
+            if not e.name.startswith(".") and e.is_file():
+                st = e.stat()
+                out[e.name] = [st.st_size, st.st_mtime_ns]
+    return out
+
+
+class Build:
+    """Persistent state plus what the current cycle found changed."""
+    def __init__(self, args):
+        self.args = args
+        self.index = Path(args.index)
+        self.rec_root = Path(args.recordings)
+        self.tts_out = Path(args.tts_out)
+        self.packs_dir = Path(args.packs_out) if args.packs_out else self.index.parent / "packs"
+        self.state = self._load()
+        self.first = not self.state["decks"]
+        self.saved = b""
+        self.backfilled = False
+        self.valid_locales: Set[str] = set()
+        self.rejected: Counter = Counter()
+
+    def _load(self) -> dict:
+        empty = {"version": STATE_VERSION, "index": None, "decks": {}, "recordings": {}, "unlisted": [],
+                 "pending": {}, "retry_at": 0.0}
+        try:
+            data = json.loads(Path(self.args.state).read_text(encoding="utf-8"))
+            if data.get("version") == STATE_VERSION and data.get("root") == [str(self.index.resolve()), str(self.rec_root.resolve())]:
+                return dict(empty, **data)
+        except (OSError, ValueError):
+            pass
+        return empty
+
+    def save(self) -> None:
+        self.state["root"] = [str(self.index.resolve()), str(self.rec_root.resolve())]
+        data = json.dumps(self.state, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if data != self.saved:
+            atomic_write_bytes(Path(self.args.state), data)
+            self.saved = data
+
+    def settling(self, mtime_ns: int) -> bool:
+        return time.time() - mtime_ns / 1e9 < self.args.settle
+
+    def has_recording(self, locale: str, hanzi: str) -> bool:
+        return (self.rec_root / locale / f"{hanzi}.wav").exists()
+
+    def known_locales(self) -> Set[str]:
+        """Deck locales from the index plus the locale directories that already hold recordings."""
+        found = {d.locale for d in load_index(self.index) if d.locale}
+        if self.rec_root.is_dir():
+            found |= {p.name for p in self.rec_root.iterdir() if p.is_dir() and not p.name.startswith(".")}
+        return found
+
+    def queue(self, locale: str, hanzi: str, pinyin: str, english: str) -> bool:
+        if self.args.no_tts or (self.args.tts_locale and locale not in self.args.tts_locale):
+            return False
+        if locale not in self.valid_locales:  # e.g. a pinyin cell shifted into the 4th column by a broken row
+            self.rejected[locale] += 1
+            return False
+        if self.has_recording(locale, hanzi):
+            return False
+        self.state["pending"].setdefault(locale, {})[hanzi] = [pinyin, english]
+        return True
+
+    def n_pending(self) -> int:
+        return sum(len(w) for w in self.state["pending"].values())
+
+    # ---------- one pass ----------
+
+    def cycle(self) -> Dict[str, str]:
+        self.decks: Set[str] = set()       # deck file names whose rows changed
+        self.locales: Set[str] = set()     # locales whose clips changed
+        self.index_changed = False
+        self.synthesized: Dict[str, list] = {}
+        self.placed = 0
+        forced = set(ORDER) if self.first else set()
+        if self.state["pending"] and time.time() >= self.state["retry_at"]:
+            forced.add("tts")
+        # --packs / --pitch on a tree that has none yet: build them all once
+        if self.args.packs and not (self.packs_dir / CATALOG_NAME).exists():
+            forced.add("packs")
+        if self.args.pitch and any(not (self.rec_root / f"{loc}.f0pack").exists() for loc in self.state["recordings"]):
+            forced.add("pitch")
+        status, timings = {}, {}
+        for name in ORDER:
+            deps = GRAPH[name]
+            if deps and name not in forced and not any(status[d] == "changed" for d in deps):
+                status[name] = "skipped"
+                continue
+            t = time.perf_counter()
+            try:
+                status[name] = "changed" if STEPS[name](self, name in forced) else "unchanged"
+            except Exception as e:  # one broken step must not stop the daemon; its dependents run on what is on disk
+                status[name] = "failed"
+                print(f"[WATCH] {name}: FAILED ({type(e).__name__}: {e})")
+            timings[name] = time.perf_counter() - t
+        save_cache()
+        self.save()
+        if self.first or any(s in ("changed", "failed") for s in status.values()):
+            ran = ", ".join(f"{k} {v:.2f}s" for k, v in timings.items() if status[k] != "unchanged" or v >= 0.05)
+            print(f"[WATCH] Pass done in {sum(timings.values()):.2f}s ({ran})   Pending words: {self.n_pending()}")
+        self.first = False
+        return status
+
+# ---------- steps ----------
+
+def step_decks(b: Build, forced: bool) -> bool:
+    if not b.index.exists() or b.settling(stat_key(b.index)[1]):
+        return False
+    b.valid_locales = b.known_locales()
+    if b.args.register:
+        register_new(b)
+        b.valid_locales = b.known_locales()
+    index_key = stat_key(b.index)
+    if index_key != b.state["index"]:
+        b.index_changed = not b.first
+        b.state["index"] = index_key
+    old, new = b.state["decks"], {}
+    for d in load_index(b.index):
+        if not d.path.exists():
+            continue
+        key = stat_key(d.path)
+        prev = old.get(d.filename)
+        if prev and prev["stat"] == key and prev["locale"] == d.locale:
+            new[d.filename] = prev
+            continue
+        if b.settling(key[1]):
+            if prev:
+                new[d.filename] = prev
+            continue
+        rows = {c.id: [c.hanzi, c.pinyin, c.english, c.locale or d.locale] for c in iter_cards(d.path, d.locale)}
+        new[d.filename] = {"stat": key, "locale": d.locale, "rows": rows}
+        if b.first:
+            continue
+        prev_rows = prev["rows"] if prev else {}
+        added = [r for cid, r in rows.items() if cid not in prev_rows]
+        removed = sum(1 for cid in prev_rows if cid not in rows)
+        if prev and not added and not removed and prev["locale"] == d.locale:
+            continue  # touched, not edited
+        b.rejected.clear()
+        queued = sum(b.queue(loc, hanzi, pinyin, english) for hanzi, pinyin, english, loc in added)
+        b.decks.add(d.filename)
+        print(f"[WATCH] {d.filename}: {'new deck, ' if prev is None else ''}+{len(added)} -{removed} rows"
+              f"{f', {queued} word(s) to synthesize' if queued else ''}")
+        warn_rejected(b, d.filename)
+    for name in sorted(old.keys() - new.keys()):
+        b.decks.add(name)
+        print(f"[WATCH] {name}: removed")
+    b.state["decks"] = new
+    if b.args.backfill and not b.backfilled:
+        b.backfilled = True
+        b.rejected.clear()
+        queued = sum(b.queue(loc, hanzi, pinyin, english)
+                     for deck in new.values() for hanzi, pinyin, english, loc in deck["rows"].values())
+        print(f"[WATCH] Backfill: {queued} word(s) without a recording queued")
+        warn_rejected(b, "backfill")
+    if b.decks:
+        # drop queued words no deck uses any more, or whose locale is not one we know
+        wanted = {(r[3], r[0]) for deck in new.values() for r in deck["rows"].values() if r[3] in b.valid_locales}
+        for loc, words in b.state["pending"].items():
+            for hanzi in [h for h in words if (loc, h) not in wanted]:
+                del words[hanzi]
+    if b.first:
+        print(f"[WATCH] Baseline: {len(new)} decks, {sum(len(d['rows']) for d in new.values())} cards")
+    return bool(b.decks or b.index_changed or forced)
+
+def warn_rejected(b: Build, where: str) -> None:
+    for loc, n in sorted(b.rejected.items()):
+        print(f"[WATCH] WARN: {where}: {n} row(s) with unknown locale '{loc}' not synthesized "
+              f"(known: {', '.join(sorted(b.valid_locales)) or 'none'}); check the CSV for a broken row")
+
+def register_new(b: Build) -> None:
+    """Add CSVs that appeared next to the index since the last pass to data/vocab.csv."""
+    listed = {d.filename for d in load_index(b.index)}
+    found = sorted(p for p in b.index.parent.glob("*.csv") if p.name != b.index.name and p.name not in listed)
+    known = set(b.state["unlisted"])
+    b.state["unlisted"] = [p.name for p in found]
+    if b.first:
+        return
+    rows = []
+    for p in found:
+        if p.name in known or b.settling(stat_key(p)[1]):
+            continue
+        locales = Counter(r.locale for r in iter_rows(p) if r.locale in b.valid_locales)
+        locale = locales.most_common(1)[0][0] if locales else DEFAULT_LOCALE
+        rows.append([p.name, p.stem.replace("_", " ").title(), "", locale])
+        b.state["unlisted"].remove(p.name)
+        print(f"[WATCH] Registered {p.name} in {b.index} ({locale})")
+    if rows:
+        update_index(b.index, rows)
+
+def step_recordings(b: Build, forced: bool) -> bool:
+    if not b.rec_root.is_dir():
+        return False
+    old, new = b.state["recordings"], {}
+    for d in sorted(p for p in b.rec_root.iterdir() if p.is_dir() and not p.name.startswith(".")):
+        files, prev = listing(d), old.get(d.name)
+        if files == prev:
+            new[d.name] = prev
+            continue
+        if any(b.settling(m) for _, m in files.values()) and not b.first:
+            if prev is not None:
+                new[d.name] = prev
+            continue
+        new[d.name] = files
+        b.locales.add(d.name)
+        if prev is not None:
+            added = sum(1 for f in files if f not in prev)
+            removed = sum(1 for f in prev if f not in files)
+            modified = sum(1 for f, v in files.items() if f in prev and prev[f] != v)
+            print(f"[WATCH] recordings/{d.name}: +{added} -{removed} ~{modified} clips")
+        # a recording that appeared by other means satisfies a queued word
+        words = b.state["pending"].get(d.name, {})
+        for hanzi in [h for h in words if f"{h}.wav" in files]:
+            del words[hanzi]
+    for loc in old.keys() - new.keys():
+        if not (b.rec_root / loc).is_dir():
+            b.locales.add(loc)
+    b.state["recordings"] = new
+    return bool(b.locales or forced)
+
+def step_tts(b: Build, forced: bool) -> bool:
+    pending = {loc: words for loc, words in b.state["pending"].items() if words}
+    if b.args.no_tts or not pending or time.time() < b.state["retry_at"]:
+        return False
+    errors = []
+    for loc, words in sorted(pending.items()):
+        out = b.tts_out / loc
+        out.mkdir(parents=True, exist_ok=True)
+        rows_csv = out / "watch_rows.csv"
+        buf = io.StringIO()
+        w = csv.writer(buf, lineterminator="\n")
+        w.writerow(["hanzi", "pinyin", "english"])
+        w.writerows([hanzi, pinyin, english] for hanzi, (pinyin, english) in words.items())
+        atomic_write_bytes(rows_csv, buf.getvalue().encode("utf-8"))
+        cmd = [sys.executable, str(TTS_SCRIPT), str(rows_csv), "--out", str(out), "--voice", b.args.voice, "--model", b.args.model]
+        if loc in b.args.instructions:
+            cmd += ["--instructions-file", b.args.instructions[loc]]
+        cmd += b.args.tts_arg
+        names = list(words)
+        print(f"[WATCH] tts: {len(names)} {loc} word(s): {' '.join(names[:8])}{' ...' if len(names) > 8 else ''}")
+        r = subprocess.run(cmd, capture_output=True, text=True)
+        for line in r.stdout.splitlines():
+            if line.startswith("[TTS] Done") or "FAIL" in line:
+                print(f"  {line.strip()}")
+        done = [h for h in names if tts_clip(b, loc, h).exists()]
+        if done:
+            b.synthesized[loc] = done
+        if r.returncode or len(done) < len(names):
+            errors.append(f"{loc}: {len(names) - len(done)} word(s) not synthesized"
+                          + (f" ({(r.stderr.strip().splitlines() or ['exit ' + str(r.returncode)])[-1]})" if r.returncode else ""))
+    b.state["retry_at"] = time.time() + b.args.retry if errors else 0.0
+    if errors and not b.synthesized:
+        raise RuntimeError(f"{'; '.join(errors)}; retrying in {b.args.retry:.0f}s")
+    for e in errors:
+        print(f"[WATCH] tts: {e}; retrying in {b.args.retry:.0f}s")
+    return bool(b.synthesized)
+
+def tts_clip(b: Build, locale: str, hanzi: str) -> Path:
+    """make_tts_from_csv.py's output name for a word."""
+    return b.tts_out / locale / f"{safe_filename(hanzi)}__{b.args.voice}__{b.args.model}.wav"
+
+def step_place(b: Build, forced: bool) -> bool:
+    for loc, words in b.synthesized.items():
+        (b.rec_root / loc).mkdir(parents=True, exist_ok=True)
+        queued = b.state["pending"].get(loc, {})
+        for hanzi in words:
+            queued.pop(hanzi, None)
+            dst = b.rec_root / loc / f"{hanzi}.wav"
+            if dst.exists():
+                continue  # a recording appeared meanwhile; never overwrite one
+            how = link_or_copy(tts_clip(b, loc, hanzi), dst, b.args.mode)
+            b.placed += 1
+            b.locales.add(loc)
+            print(f"[WATCH] place ({how}): {loc}/{dst.name}")
+    if b.placed:
+        # our own clips must not show up as external changes on the next poll
+        for loc in b.synthesized:
+            b.state["recordings"][loc] = listing(b.rec_root / loc)
+    return b.placed > 0
+
+def step_manifest(b: Build, forced: bool) -> bool:
+    path = b.rec_root / RECORDINGS_MANIFEST
+    if not (path.exists() or b.placed) or not (b.locales or forced):
+        return False
+    manifest = write_recordings_manifest(b.rec_root, path)
+    print(f"[WATCH] manifest: {path} ({sum(len(w) for w in manifest['locales'].values())} clips)")
+    return True
+
+def step_bundle(b: Build, forced: bool) -> bool:
+    out = b.index.parent / BUNDLE_NAME
+    bundle = build_bundle(b.index, b.rec_root)
+    if current_hash(out) == bundle["hash"]:
+        return False
+    write_variants(out, encode(bundle), compress=not b.args.no_compress)
+    print(f"[WATCH] bundle: {out} ({sum(len(d['cards']) for d in bundle['decks'])} cards, hash {bundle['hash']})")
+    return True
+
+def step_packs(b: Build, forced: bool) -> bool:
+    out = b.packs_dir
+    if not (b.args.packs or (out / CATALOG_NAME).exists()):
+        return False
+    rows = b.state["decks"]
+    decks = [d for d in load_index(b.index) if forced or b.index_changed or d.filename in b.decks
+             or ({d.locale} | {r[3] for r in rows.get(d.filename, {}).get("rows", {}).values()}) & b.locales]
+    if decks:
+        update_packs(decks, b.rec_root, out)
+    return bool(decks)
+
+def step_pitch(b: Build, forced: bool) -> bool:
+    opts = {k: DEFAULTS[k] for k in ("fmin", "fmax", "hop_ms", "threshold")}
+    ran = False
+    for loc in sorted(b.state["recordings"] if forced else b.locales):
+        pack = b.rec_root / f"{loc}.f0pack"
+        if not (b.rec_root / loc).is_dir() or not (b.args.pitch or pack.exists()):
+            continue
+        total, analysed, failed = process_locale(b.rec_root / loc, pack, opts, b.args.jobs, False)
+        print(f"[WATCH] pitch: {loc} {total} clips ({analysed} analysed, {len(failed)} failed)")
+        ran = True
+    return ran
+
+STEPS = {"decks": step_decks, "recordings": step_recordings, "tts": step_tts, "place": step_place,
+         "manifest": step_manifest, "bundle": step_bundle, "packs": step_packs, "pitch": step_pitch}
+
+def main():
+    ap = argparse.ArgumentParser(description="Watch the decks and recordings and rebuild only the affected assets.")
+    ap.add_argument("--index", default=str(VOCAB_INDEX), help="Deck index (default: data/vocab.csv)")
+    ap.add_argument("--recordings", default=os.path.join("data", "recordings"), help="Recordings root")
+    ap.add_argument("--state", default=str(STATE_PATH), help="State file (default: dev_tools/.cache/watch_state.json)")
+    ap.add_argument("--interval", type=float, default=2.0, help="Seconds between polls (default 2)")
+    ap.add_argument("--settle", type=float, default=1.0, help="Leave files modified less than this many seconds ago for the next poll")
+    ap.add_argument("--once", action="store_true", help="Run one pass and exit (exit 1 if a step failed)")
+    ap.add_argument("--register", action="store_true", help="Add new CSVs that appear next to the index to it")
+    ap.add_argument("--backfill", action="store_true", help="Also queue every existing card without a recording")
+    ap.add_argument("--no-tts", action="store_true", help="Never synthesize; only keep the derived files up to date")
+    ap.add_argument("--tts-locale", action="append", help="Only synthesize words of these locales (repeatable; default: all)")
+    ap.add_argument("--tts-out", default=str(TTS_OUT), help="make_tts_from_csv.py output directory (one subdirectory per locale)")
+    ap.add_argument("--tts-arg", action="append", default=[], help="Extra make_tts_from_csv.py argument, e.g. --tts-arg=--batch=8 (repeatable)")
+    ap.add_argument("--instructions", action="append", default=[], metavar="LOCALE=FILE", help="TTS instructions file for a locale (repeatable)")
+    ap.add_argument("--voice", default=DEFAULT_VOICE)
+    ap.add_argument("--model", default=DEFAULT_MODEL)
+    ap.add_argument("--mode", choices=["auto", "link", "reflink", "copy"], default="auto", help="How clips are placed (as in transfer.py)")
+    ap.add_argument("--retry", type=float, default=300.0, help="Seconds before retrying words that failed to synthesize (default 300)")
+    ap.add_argument("--no-compress", action="store_true", help="Do not write the bundle's .gz/.br sidecars")
+    ap.add_argument("--packs", action="store_true", help="Build audio packs even if none exist yet")
+    ap.add_argument("--packs-out", help="Audio pack directory (default: packs/ next to the index)")
+    ap.add_argument("--pitch", action="store_true", help="Build .f0pack pitch files even for locales that have none yet")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes for the pitch step")
+    args = ap.parse_args()
+    try:
+        args.instructions = dict(s.split("=", 1) for s in args.instructions)
+    except ValueError:
+        sys.exit("ERROR: --instructions expects LOCALE=FILE")
+
+    b = Build(args)
+    print(f"[WATCH] Watching {b.index.parent}/*.csv and {b.rec_root} every {args.interval:g}s   State: {args.state}"
+          f"{'' if b.first else f'   Pending words: {b.n_pending()}'}")
+    try:
+        while True:
+            status = b.cycle()
+            if args.once:
+                raise SystemExit(1 if "failed" in status.values() else 0)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        b.save()
+        print("\n[WATCH] Stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+// Packed per-deck audio (data/packs, built by dev_tools/pack_audio.py).
+// One index request per deck; then either the whole pack (small decks) or one byte-range request per clip.
+// Provides: openAudioPacks, getPackedClip
+
+const PACKS_DIR = './data/packs/';
+const PREFETCH_MAX_BYTES = 8 * 1024 * 1024; // decks up to this size are downloaded in one request
+
+/** @type {Promise<any>|null} */
+let catalogPromise = null;
+/** @type {Map<string, Promise<any>>} deck filename -> opened pack (or null) */
+const openPacks = new Map();
+
+function fetchJson(url) {
+  return fetch(url, { cache: 'no-cache' })
+    .then(res => (res.ok ? res.json() : null))
+    .catch(() => null);
+}
+
+async function openPack(filename) {
+  if (!catalogPromise) catalogPromise = fetchJson(PACKS_DIR + 'index.json');
+  const catalog = await catalogPromise;
+  const entry = catalog?.packs?.[filename];
+  if (!entry) return null;
+  const index = await fetchJson(PACKS_DIR + entry.index);
+  if (!index || index.version !== 1) return null;
+
+  const url = new URL(`${PACKS_DIR}${index.pack}?v=${index.hash}`, location.href).toString();
+  const byName = new Map(index.clips.map(([offset, length, name]) => [name, [offset, length]]));
+  const pack = { url, byName, whole: null };
+  if (index.size <= PREFETCH_MAX_BYTES) {
+    pack.whole = fetch(url).then(res => (res.ok ? res.arrayBuffer() : null)).catch(() => null);
+  }
+  console.info('[audio] pack opened', { deck: filename, clips: index.clips.length, bytes: index.size, prefetch: !!pack.whole });
+  return pack;
+}
+
+/**
+ * Open the packs of the given decks (no-op for decks without one). Safe to call repeatedly.
+ * @param {string[]} filenames
+ */
+export function openAudioPacks(filenames) {
+  for (const filename of filenames) {
+    if (!openPacks.has(filename)) openPacks.set(filename, openPack(filename));
+  }
+}
+
+async function readRange(pack, offset, length) {
+  if (pack.whole) {
+    const buf = await pack.whole;
+    if (buf) return buf.slice(offset, offset + length);
+  }
+  try {
+    const res = await fetch(pack.url, { headers: { Range: `bytes=${offset}-${offset + length - 1}` } });
+    if (res.status === 206) return await res.arrayBuffer();
+    if (res.ok) {
+      // Server ignored the Range header and sent the whole pack: keep it for the next clips
+      pack.whole = res.arrayBuffer();
+      const buf = await pack.whole;
+      return buf.slice(offset, offset + length);
+    }
+  } catch (e) {
+    console.warn('[audio] pack read failed', e);
+  }
+  return null;
+}
+
+/**
+ * Audio bytes for a word from any opened pack, or null.
+ * @param {string} hanzi
+ * @param {string|null} locale
+ * @returns {Promise<ArrayBuffer|null>}
+ */
+export async function getPackedClip(hanzi, locale) {
+  for (const pending of openPacks.values()) {
+    const pack = await pending;
+    if (!pack) continue;
+    const hit = locale ? pack.byName.get(`${locale}/${hanzi}`)
+      : [...pack.byName].find(([name]) => name.endsWith(`/${hanzi}`))?.[1];
+    if (hit) return readRange(pack, hit[0], hit[1]);
+  }
+  return null;
+}
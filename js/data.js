@@ -98,6 +98,105 @@ export function rowsToCards(rows) {
   return deduped;
 }
 
+/** @type {Promise<object|null>|null} */
+let bundlePromise = null;
+/** @type {{ hash: string, builtAt: number, decks: Map<string, any>, recorded: Map<string, Set<string>> }|null} */
+let loadedBundle = null;
+/** Hanzi per locale of the cards handed out by cardsFromBundle(); only these get an answer from hasRecording(). */
+const bundledWords = new Map();
+
+/**
+ * Fetch the precompiled vocabulary bundle (data/vocab.bundle.json, built by dev_tools/build_vocab_bundle.py).
+ * Fetched once per page; resolves to null when it is missing or unreadable, so callers fall back to the CSVs.
+ * `builtAt` is the bundle's Last-Modified time (NaN when the server does not send one), see isBundleStale().
+ * @returns {Promise<{ hash: string, builtAt: number, decks: Map<string, any>, recorded: Map<string, Set<string>> }|null>}
+ */
+export function fetchVocabBundle() {
+  if (!bundlePromise) {
+    bundlePromise = fetch('./data/vocab.bundle.json', { cache: 'no-cache' })
+      .then(res => (res.ok ? res.json().then(raw => ({ raw, lastModified: res.headers.get('last-modified') })) : null))
+      .then(got => {
+        const raw = got?.raw;
+        if (!raw || raw.version !== 1 || !Array.isArray(raw.decks)) return null;
+        const decks = new Map();
+        const recorded = new Map();
+        for (const deck of raw.decks) {
+          decks.set(deck.filename, deck);
+          for (const [, hanzi, , , locale, audio] of deck.cards) {
+            if (!audio) continue;
+            const loc = locale || deck.locale;
+            if (!recorded.has(loc)) recorded.set(loc, new Set());
+            recorded.get(loc).add(hanzi);
+          }
+        }
+        loadedBundle = { hash: raw.hash, builtAt: Date.parse(got.lastModified || ''), decks, recorded };
+        return loadedBundle;
+      })
+      .catch(() => null);
+  }
+  return bundlePromise;
+}
+
+/**
+ * Whether data/vocab.csv or one of the given deck files changed after the bundle was built, i.e. its
+ * Last-Modified is newer than the bundle's. A bundle built locally and never rebuilt would otherwise hide
+ * every later CSV edit. Unknown times (file://, no Last-Modified header) count as up to date.
+ * @param {{ hash: string, builtAt: number }} bundle
+ * @param {string[]} filenames
+ * @returns {Promise<boolean>}
+ */
+export async function isBundleStale(bundle, filenames) {
+  if (!Number.isFinite(bundle.builtAt)) return false;
+  const paths = ['./data/vocab.csv', ...filenames.map(f => `./data/${f}`)];
+  const times = await Promise.all(paths.map(path =>
+    fetch(path, { method: 'HEAD', cache: 'no-cache' })
+      .then(res => Date.parse(res.headers.get('last-modified') || ''))
+      .catch(() => NaN)));
+  const newer = paths.filter((_, i) => times[i] > bundle.builtAt);
+  if (newer.length) console.warn('[vocab] bundle is older than its sources; reading the CSVs', { hash: bundle.hash, newer });
+  return newer.length > 0;
+}
+
+/**
+ * Cards for the given deck files from the bundle, in file order, de-duped by id (first occurrence wins).
+ * Returns null if any file is not in the bundle.
+ * @param {{ decks: Map<string, any> }} bundle
+ * @param {string[]} filenames
+ */
+export function cardsFromBundle(bundle, filenames) {
+  const cards = [];
+  const words = [];
+  const seen = new Set();
+  for (const filename of filenames) {
+    const deck = bundle.decks.get(filename);
+    if (!deck) return null;
+    for (const [id, hanzi, pinyin, english, locale] of deck.cards) {
+      if (seen.has(id)) continue;
+      seen.add(id);
+      cards.push({ id, hanzi, pinyin, english, locale });
+      words.push([locale || deck.locale, hanzi]);
+    }
+  }
+  for (const [loc, hanzi] of words) {
+    if (!bundledWords.has(loc)) bundledWords.set(loc, new Set());
+    bundledWords.get(loc).add(hanzi);
+  }
+  return cards;
+}
+
+/**
+ * Whether data/recordings/<locale>/<hanzi>.wav exists according to the loaded bundle.
+ * Only a hint for words of cards that were loaded from the bundle; returns undefined (unknown) for anything
+ * else, e.g. decks read from their CSV or arbitrary text, so callers still try the request.
+ * @param {string} hanzi
+ * @param {string} locale
+ * @returns {boolean|undefined}
+ */
+export function hasRecording(hanzi, locale) {
+  if (!loadedBundle || !bundledWords.get(locale)?.has(hanzi)) return undefined;
+  return loadedBundle.recorded.get(locale)?.has(hanzi) ?? false;
+}
+
 /**
  * Discover available CSV files by reading a vocabulary index file.
  * This provides a clean, user-controlled way to manage available vocabulary files.
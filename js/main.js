@@ -640,6 +640,9 @@ async function speakGood() {
       if (result?.source === 'cache') {
         btnSpeak.textContent = '💾'; // Pre-recorded WAV (cache)
         btnSpeak.title = 'Speak (Pre-recorded cache)';
+      } else if (result?.source === 'pack') {
+        btnSpeak.textContent = '📦'; // Pre-recorded clip from the deck's audio pack
+        btnSpeak.title = 'Speak (Pre-recorded pack)';
       } else if (result?.source === 'remote') {
         btnSpeak.textContent = '🌐'; // Pre-recorded WAV (remote)
         btnSpeak.title = 'Speak (Pre-recorded remote)';
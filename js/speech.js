@@ -1,6 +1,9 @@
 // Speech synthesis module (4.20) + Audio source order & caching (4.70)
 // Provides: initSpeech, speak, stop, setSettings, getTtsCacheStats, clearTtsCache, clearAudioCache, getAudioCacheCount
 
+import { hasRecording } from './data.js';
+import { getPackedClip } from './audioPack.js';
+
 const KEY_SETTINGS = 'hsk.tts.settings';
 const KEY_OPENAI = 'hsk.tts.openai.key';
 
@@ -139,6 +142,19 @@ async function tryPlayCachedOrRemoteWav(hanzi, locale = null, preferredLevelLabe
       }
     }
     
+    const packed = await getPackedClip(hanzi, locale);
+    if (packed) {
+      console.info('[audio] source=pack', { url });
+      await playArrayBuffer(packed);
+      return 'pack';
+    }
+
+    // For cards loaded from the vocabulary bundle it knows which recordings exist; skip the request that would 404
+    if (locale && hasRecording(hanzi, locale) === false) {
+      console.info('[audio] no recording listed in bundle', { url });
+      return 'none';
+    }
+
     const resp = await fetch(url, { cache: settings.audioCache ? 'default' : 'reload' });
     if (resp.ok && (resp.headers.get('content-type')||'').includes('audio')) {
       const buf = await resp.arrayBuffer();
@@ -3,9 +3,10 @@
  * Extracts functionality from main.js for reusability
  */
 
-import { fetchCsvText, parseCsv, rowsToCards, discoverAvailableCsvFiles } from './data.js';
+import { fetchCsvText, parseCsv, rowsToCards, discoverAvailableCsvFiles, fetchVocabBundle, isBundleStale, cardsFromBundle } from './data.js';
 import { state, newRun, updateSessionMetadata, setLevelLabel } from './state.js';
 import { saveDeck, saveLastLevel } from './storage.js';
+import { openAudioPacks } from './audioPack.js';
 
 /**
  * Vocabulary Manager Class
@@ -59,26 +60,35 @@ export class VocabularyManager {
       const discoveredFiles = await discoverAvailableCsvFiles();
       const fileMap = new Map(discoveredFiles.map(f => [f.filename, f]));
       
-      // Fetch CSV texts from all specified files
-      const texts = await Promise.all(
-        filenames.map(filename => fetchCsvText(`./data/${filename}`).catch(() => ''))
-      );
-
-      // Parse and merge all CSV data
-      const mergedRows = [];
-      for (const text of texts) {
-        if (!text) continue;
-        const rows = parseCsv(text);
-        mergedRows.push(...rows);
-      }
+      // Prefer the precompiled bundle (one request, already parsed and hashed) unless a CSV changed since it was built
+      const bundle = await fetchVocabBundle();
+      let cards = bundle && !(await isBundleStale(bundle, filenames)) ? cardsFromBundle(bundle, filenames) : null;
+
+      if (!cards) {
+        // Fetch CSV texts from all specified files
+        const texts = await Promise.all(
+          filenames.map(filename => fetchCsvText(`./data/${filename}`).catch(() => ''))
+        );
+
+        // Parse and merge all CSV data
+        const mergedRows = [];
+        for (const text of texts) {
+          if (!text) continue;
+          const rows = parseCsv(text);
+          mergedRows.push(...rows);
+        }
 
-      // Convert to card objects
-      const cards = rowsToCards(mergedRows);
+        // Convert to card objects
+        cards = rowsToCards(mergedRows);
+      }
       
       if (cards.length === 0) {
         throw new Error('No vocabulary cards found in selected files');
       }
 
+      // Start loading the decks' audio packs (if built) in the background
+      openAudioPacks(filenames);
+
       // Determine locale from the files
       let locale = 'zh-CN'; // Default
       if (filenames.length === 1) {
@@ -0,0 +1,126 @@
+import { describe, it, expect, beforeEach, vi } from 'vitest'
+
+// Bundle in the shape dev_tools/build_vocab_bundle.py writes: cards are [id, hanzi, pinyin, english, locale, audio]
+const RAW = {
+  version: 1,
+  hash: '0123456789abcdef',
+  fields: ['id', 'hanzi', 'pinyin', 'english', 'locale', 'audio'],
+  decks: [
+    { filename: 'a.csv', displayName: 'A', description: '', locale: 'zh-CN', cards: [
+      ['id1', '你好', 'nǐ hǎo', 'hello', '', 1],
+      ['id2', '谢谢', 'xiè xie', 'thanks', '', 0],
+    ] },
+    { filename: 'b.csv', displayName: 'B', description: '', locale: 'zh-CN', cards: [
+      ['id1', '你好', 'nǐ hǎo', 'hello', '', 1],
+      ['id3', 'hello', 'həˈləʊ', 'hallo', 'en-GB', 1],
+    ] },
+  ],
+}
+
+const BUILT = 'Wed, 01 Jan 2025 12:00:00 GMT'
+const BEFORE = 'Wed, 01 Jan 2025 11:00:00 GMT'
+const AFTER = 'Wed, 01 Jan 2025 13:00:00 GMT'
+
+function response(body, lastModified) {
+  return { ok: true, json: async () => body, headers: { get: name => (name.toLowerCase() === 'last-modified' ? lastModified : null) } }
+}
+
+/** fetch stand-in: the bundle, plus HEAD answers for the CSVs from `modified` (path → Last-Modified). */
+function serve(modified = {}, bundleModified = BUILT) {
+  global.fetch = vi.fn(async (path, opts = {}) => {
+    if (path === './data/vocab.bundle.json') return response(RAW, bundleModified)
+    if (opts.method === 'HEAD') return response(null, path in modified ? modified[path] : BEFORE)
+    return { ok: false, status: 404 }
+  })
+}
+
+// data.js keeps the fetched bundle in module state; every test gets a fresh copy
+async function loadData() {
+  vi.resetModules()
+  return await import('../js/data.js')
+}
+
+describe('vocabulary bundle', () => {
+  beforeEach(() => {
+    vi.clearAllMocks()
+    vi.spyOn(console, 'warn').mockImplementation(() => {})
+  })
+
+  it('cardsFromBundle() returns the decks in order, de-duped by id', async () => {
+    serve()
+    const data = await loadData()
+    const bundle = await data.fetchVocabBundle()
+    expect(bundle.hash).toBe(RAW.hash)
+    const cards = data.cardsFromBundle(bundle, ['a.csv', 'b.csv'])
+    expect(cards.map(c => c.id)).toEqual(['id1', 'id2', 'id3'])
+    expect(cards[0]).toEqual({ id: 'id1', hanzi: '你好', pinyin: 'nǐ hǎo', english: 'hello', locale: '' })
+    expect(cards[2].locale).toBe('en-GB')
+  })
+
+  it('cardsFromBundle() returns null when a deck is not in the bundle', async () => {
+    serve()
+    const data = await loadData()
+    const bundle = await data.fetchVocabBundle()
+    expect(data.cardsFromBundle(bundle, ['a.csv', 'missing.csv'])).toBeNull()
+  })
+
+  it('hasRecording() answers only for words of bundle-loaded cards', async () => {
+    serve()
+    const data = await loadData()
+    const bundle = await data.fetchVocabBundle()
+    expect(data.hasRecording('你好', 'zh-CN')).toBeUndefined()  // nothing loaded yet
+    data.cardsFromBundle(bundle, ['a.csv'])
+    expect(data.hasRecording('你好', 'zh-CN')).toBe(true)
+    expect(data.hasRecording('谢谢', 'zh-CN')).toBe(false)
+    expect(data.hasRecording('hello', 'en-GB')).toBeUndefined()  // b.csv not loaded
+    expect(data.hasRecording('随便', 'zh-CN')).toBeUndefined()  // arbitrary text
+    data.cardsFromBundle(bundle, ['b.csv'])
+    expect(data.hasRecording('hello', 'en-GB')).toBe(true)  // the card's own locale column
+  })
+
+  it('fetchVocabBundle() resolves to null without a usable bundle', async () => {
+    global.fetch = vi.fn(async () => ({ ok: false, status: 404 }))
+    let data = await loadData()
+    expect(await data.fetchVocabBundle()).toBeNull()
+    global.fetch = vi.fn(async () => response({ ...RAW, version: 2 }, BUILT))
+    data = await loadData()
+    expect(await data.fetchVocabBundle()).toBeNull()
+    expect(data.hasRecording('你好', 'zh-CN')).toBeUndefined()
+  })
+
+  it('isBundleStale() is false when the index and decks are older than the bundle', async () => {
+    serve()
+    const data = await loadData()
+    const bundle = await data.fetchVocabBundle()
+    expect(await data.isBundleStale(bundle, ['a.csv'])).toBe(false)
+    const heads = global.fetch.mock.calls.filter(([, opts]) => opts?.method === 'HEAD').map(([path]) => path)
+    expect(heads).toEqual(['./data/vocab.csv', './data/a.csv'])
+  })
+
+  it('isBundleStale() is true when a selected deck or the index was edited after the build', async () => {
+    serve({ './data/a.csv': AFTER })
+    let data = await loadData()
+    let bundle = await data.fetchVocabBundle()
+    expect(await data.isBundleStale(bundle, ['a.csv'])).toBe(true)
+    expect(await data.isBundleStale(bundle, ['b.csv'])).toBe(false)
+    expect(console.warn).toHaveBeenCalledWith(expect.stringContaining('[vocab]'), expect.objectContaining({ hash: RAW.hash }))
+
+    serve({ './data/vocab.csv': AFTER })
+    data = await loadData()
+    bundle = await data.fetchVocabBundle()
+    expect(await data.isBundleStale(bundle, ['b.csv'])).toBe(true)
+  })
+
+  it('isBundleStale() trusts the bundle when times are unknown', async () => {
+    serve({ './data/a.csv': AFTER }, null)  // e.g. file:// or no Last-Modified header
+    let data = await loadData()
+    let bundle = await data.fetchVocabBundle()
+    expect(await data.isBundleStale(bundle, ['a.csv'])).toBe(false)
+    expect(global.fetch).toHaveBeenCalledTimes(1)  // no HEAD requests at all
+
+    serve({ './data/a.csv': null })
+    data = await loadData()
+    bundle = await data.fetchVocabBundle()
+    expect(await data.isBundleStale(bundle, ['a.csv'])).toBe(false)
+  })
+})